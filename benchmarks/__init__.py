@@ -0,0 +1,3 @@
+"""
+    Empty module 
+"""
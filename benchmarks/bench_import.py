@@ -0,0 +1,103 @@
+"""
+Benchmarks how long a fresh interpreter takes to import the PhiVM core.
+
+Short-lived workers pay this cost on every start, so each module is imported in a
+new subprocess and timed against an interpreter that imports nothing. Usage:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --module src.pvm.server --repeat 20
+
+The command exits with status 1 when any measured module pulls in NumPy.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import NamedTuple, Optional
+
+DEFAULT_MODULES = ("src.pvm.vm", "src.pvm.server")
+
+# Prints whether NumPy was loaded as a side effect of the import
+_PROBE = "import sys; import {module}; print('numpy' in sys.modules)"
+
+
+class ImportTiming(NamedTuple):
+    """
+    The measured cost of importing one module in a fresh interpreter.
+
+    Attributes:
+        module (str): The imported module.
+        seconds (float): The median wall time of the interpreter run.
+        loads_numpy (bool): Whether the import loaded NumPy.
+    """
+
+    module: str
+    seconds: float
+    loads_numpy: bool
+
+
+def _time_interpreter(code: str, repeat: int) -> tuple[float, str]:
+    """
+    Runs code in fresh interpreters and returns the median time and last output.
+    """
+    times = []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), output.strip()
+
+
+def measure_import(module: str, repeat: int = 10) -> ImportTiming:
+    """
+    Times importing a module in a fresh interpreter.
+
+    Args:
+        module (str): The dotted module name.
+        repeat (int): The number of interpreter runs; the median is reported.
+
+    Returns:
+        ImportTiming: The median time and whether NumPy was loaded.
+    """
+    seconds, output = _time_interpreter(_PROBE.format(module=module), repeat)
+    return ImportTiming(module, seconds, output == "True")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the import benchmark from the command line.
+
+    Returns:
+        int: The process exit status; 1 if a module loaded NumPy.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--module",
+        action="append",
+        help=f"module to import; repeatable (default: {', '.join(DEFAULT_MODULES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="interpreter runs")
+    args = parser.parse_args(argv)
+
+    baseline, _ = _time_interpreter("pass", args.repeat)
+    print(f"{'python -c pass':<28} {baseline * 1000:>8.1f} ms")
+    status = 0
+    for module in args.module or DEFAULT_MODULES:
+        timing = measure_import(module, args.repeat)
+        note = " (loads NumPy)" if timing.loads_numpy else ""
+        print(
+            f"{module:<28} {timing.seconds * 1000:>8.1f} ms "
+            f"(+{(timing.seconds - baseline) * 1000:.1f} ms){note}"
+        )
+        if timing.loads_numpy:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
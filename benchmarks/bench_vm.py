@@ -0,0 +1,319 @@
+"""
+Benchmarks PhiVM throughput and compares it against stored baselines.
+
+Every benchmark reports a rate (instructions per second for run benchmarks, VMs per
+second for construction benchmarks), so higher is always better. Usage:
+
+    python -m benchmarks.bench_vm --save baseline.json
+    python -m benchmarks.bench_vm --baseline baseline.json --threshold 10
+
+The second form exits with status 1 when any benchmark is more than threshold
+percent slower than its baseline.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from src.pvm.bytecode import CONTROL_INSTRUCTIONS, compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.instructions import Instruction
+from src.pvm.registers import translate
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+DEFAULT_THRESHOLD_PERCENT = 10.0
+
+PROGRAM_LENGTHS = (10, 100, 1000)
+LOOP_ITERATIONS = (10, 1000)
+BULK_SIZES = (16, 4096)
+BULK_INSTRUCTIONS = (Instruction.MEMCPY, Instruction.MEMSET, Instruction.MEMSUM)
+STACK_SIZES = (16, 256, 4096)
+MEMORY_SIZES = (1 << 10, 1 << 16, 1 << 20)
+
+
+class Benchmark(NamedTuple):
+    """
+    A named workload.
+
+    Attributes:
+        name (str): The benchmark name used in baselines.
+        units (int): The amount of work (instructions or VMs) per call of run.
+        run (Callable[[], None]): The workload.
+    """
+
+    name: str
+    units: int
+    run: Callable[[], None]
+
+
+class Regression(NamedTuple):
+    """
+    A benchmark that got slower than its baseline.
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def percent(self) -> float:
+        """
+        How much slower the current rate is, in percent of the baseline.
+        """
+        return (self.baseline - self.current) / self.baseline * 100
+
+
+def _config(stack_size: int = 256, memory_size: Optional[int] = None) -> Configuration:
+    memory_size = memory_size or 2 * stack_size
+    return Configuration(
+        memory_size=Word(memory_size),
+        stack_start=Word(memory_size - stack_size),
+        stack_size=Word(stack_size),
+    )
+
+
+def _opcode_program(instruction: Instruction, length: int) -> Program:
+    """
+    Builds a program dominated by one instruction, keeping the stack shallow.
+    """
+    if instruction == Instruction.PUSH:
+        return [(Instruction.PUSH, [Word(1)])] * length
+    if instruction == Instruction.LOAD:
+        return [(Instruction.LOAD, [Word(0)])] * length
+    if instruction == Instruction.STORE:
+        return [(Instruction.PUSH, [Word(1)]), (Instruction.STORE, [Word(0)])] * (
+            length // 2
+        )
+    program: ProgramList = [(Instruction.PUSH, [Word(3)])]
+    if instruction.name.startswith("PUSH_"):
+        return program + [(instruction, [Word(1)])] * (length - 1)
+    return program + [(Instruction.PUSH, [Word(1)]), (instruction, [])] * (length // 2)
+
+
+def _mixed_program(length: int) -> Program:
+    body: ProgramList = [
+        (Instruction.PUSH, [Word(7)]),
+        (Instruction.ADD, []),
+        (Instruction.PUSH, [Word(3)]),
+        (Instruction.MUL, []),
+        (Instruction.PUSH, [Word(5)]),
+        (Instruction.SUB, []),
+        (Instruction.PUSH, [Word(2)]),
+        (Instruction.DIV, []),
+    ]
+    return [(Instruction.PUSH, [Word(1)])] + (body * (length // len(body) + 1))[
+        : length - 1
+    ]
+
+
+def _loop_program(iterations: int) -> Program:
+    """
+    Builds a countdown loop that runs its two-instruction body iterations times.
+    """
+    return [
+        (Instruction.PUSH, [Word(iterations - 1)]),
+        (Instruction.PUSH_SUB, [Word(1)]),
+        (Instruction.JNS, [Word(1)]),
+    ]
+
+
+def _bulk_program(size: int) -> Program:
+    """
+    Builds a program filling, copying and summing two size-word arrays.
+    """
+    return [
+        (Instruction.PUSH, [Word(0)]),
+        (Instruction.PUSH, [Word(7)]),
+        (Instruction.PUSH, [Word(size)]),
+        (Instruction.MEMSET, []),
+        (Instruction.PUSH, [Word(size)]),
+        (Instruction.PUSH, [Word(0)]),
+        (Instruction.PUSH, [Word(size)]),
+        (Instruction.MEMCPY, []),
+        (Instruction.PUSH, [Word(size)]),
+        (Instruction.PUSH, [Word(size)]),
+        (Instruction.MEMSUM, []),
+    ]
+
+
+def _run_benchmark(
+    config: Configuration, program: Program, name: str, units: int = 0
+) -> Benchmark:
+    bytecode = compile_program(program)
+    vm = PhiVM(config)
+
+    def run() -> None:
+        # Only the stack pointer is rewound so that memory_size does not skew the
+        # rate through reset()
+        vm.stack_pointer = vm.stack_start
+        vm.run(bytecode)
+
+    return Benchmark(name, units or len(bytecode), run)
+
+
+def _register_benchmark(
+    config: Configuration, program: Program, name: str
+) -> Benchmark:
+    translated = translate(program)
+    vm = PhiVM(config)
+
+    def run() -> None:
+        vm.stack_pointer = vm.stack_start
+        translated(vm)
+
+    return Benchmark(name, len(translated.bytecode), run)
+
+
+def _construction_benchmark(memory_size: int) -> Benchmark:
+    config = _config(stack_size=256, memory_size=memory_size)
+
+    def run() -> None:
+        PhiVM(config)
+
+    return Benchmark(f"construct/memory={memory_size}", 1, run)
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """
+    Yields the benchmark suite.
+    """
+    config = _config()
+    for instruction in Instruction:
+        if instruction in CONTROL_INSTRUCTIONS or instruction in BULK_INSTRUCTIONS:
+            continue
+        yield _run_benchmark(
+            config, _opcode_program(instruction, 200), f"opcode/{instruction.value}"
+        )
+    for length in PROGRAM_LENGTHS:
+        yield _run_benchmark(config, _mixed_program(length), f"length/{length}")
+        yield _register_benchmark(config, _mixed_program(length), f"registers/{length}")
+    for iterations in LOOP_ITERATIONS:
+        yield _run_benchmark(
+            config,
+            _loop_program(iterations),
+            f"loop/{iterations}",
+            units=1 + 2 * iterations,
+        )
+    for size in BULK_SIZES:
+        # Rated in words processed per second
+        yield _run_benchmark(
+            _config(memory_size=2 * size + 256),
+            _bulk_program(size),
+            f"bulk/{size}",
+            3 * size,
+        )
+    for stack_size in STACK_SIZES:
+        yield _run_benchmark(
+            _config(stack_size=stack_size),
+            _opcode_program(Instruction.PUSH, stack_size),
+            f"stack/{stack_size}",
+        )
+    for memory_size in MEMORY_SIZES:
+        yield _run_benchmark(
+            _config(memory_size=memory_size),
+            _mixed_program(100),
+            f"memory/{memory_size}",
+        )
+        yield _construction_benchmark(memory_size)
+
+
+def measure(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.05) -> float:
+    """
+    Measures the rate of a benchmark.
+
+    Args:
+        benchmark (Benchmark): The benchmark to measure.
+        repeat (int): The number of timing rounds; the fastest one is reported.
+        min_time (float): The minimum duration of a round, in seconds.
+
+    Returns:
+        float: Units of work per second.
+    """
+    timer = timeit.Timer(benchmark.run)
+    # autorange picks a call count taking at least 0.2 seconds; scale it to min_time
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return benchmark.units * number / best
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold_percent: float = DEFAULT_THRESHOLD_PERCENT,
+) -> list[Regression]:
+    """
+    Finds benchmarks that regressed against a baseline.
+
+    Benchmarks missing from either side are ignored.
+
+    Args:
+        results (dict[str, float]): The current rates by benchmark name.
+        baseline (dict[str, float]): The baseline rates by benchmark name.
+        threshold_percent (float): The slowdown tolerated before a benchmark counts
+            as regressed.
+
+    Returns:
+        list[Regression]: The regressed benchmarks.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None or reference <= 0:
+            continue
+        regression = Regression(name, reference, current)
+        if regression.percent > threshold_percent:
+            regressions.append(regression)
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    Returns:
+        int: The process exit status; 1 if a benchmark regressed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--baseline", help="JSON file with baseline rates")
+    parser.add_argument("--save", help="write the measured rates to this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PERCENT,
+        help="tolerated slowdown in percent (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks containing this"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for benchmark in benchmarks():
+        if args.filter in benchmark.name:
+            results[benchmark.name] = measure(benchmark, repeat=args.repeat)
+            print(f"{benchmark.name:<28} {results[benchmark.name]:>16,.0f} /s")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name}: {regression.current:,.0f} /s vs "
+                f"{regression.baseline:,.0f} /s ({regression.percent:.1f}% slower)"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
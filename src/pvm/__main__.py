@@ -0,0 +1,9 @@
+"""
+Runs the PhiVM command line; see src.pvm.cli.
+"""
+
+import sys
+
+from src.pvm.cli import main
+
+sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Implements the word arithmetic shared by PhiVM's handlers and its program optimizer.
+
+Each operation takes two words as native Python ints and returns the result together
+with the sign and overflow flags it sets, so every consumer computes exactly the
+same values. Results wrap like two's-complement integers of the word width; working
+on native ints with precomputed bounds avoids the cost of NumPy scalar operations.
+
+Words are 64 bits wide by default, and the module-level operations implement that
+width. word_arithmetic returns the operations for any of the WORD_WIDTHS, built from
+the same code with that width's bounds.
+"""
+
+from typing import Callable, NamedTuple
+
+from src.pvm.errors import DivisionByZeroError
+
+# (result, sign_flag, overflow_flag)
+ArithmeticResult = tuple[int, int, int]
+Operation = Callable[[int, int], ArithmeticResult]
+
+# The supported word widths in bits
+WORD_WIDTHS = (8, 16, 32, 64)
+
+WORD_BITS = 64
+MAX_WORD = (1 << (WORD_BITS - 1)) - 1
+MIN_WORD = -(1 << (WORD_BITS - 1))
+WORD_MODULUS = 1 << WORD_BITS
+
+
+class WordArithmetic(NamedTuple):
+    """
+    The arithmetic of one word width.
+
+    Attributes:
+        bits (int): The word width.
+        min_word (int): The smallest word.
+        max_word (int): The largest word.
+        wrap (Callable[[int], int]): Wraps an integer into the word range.
+        add (Operation): Adds two words.
+        sub (Operation): Subtracts the second word from the first.
+        mul (Operation): Multiplies two words.
+        div (Operation): Floor-divides the first word by the second.
+    """
+
+    bits: int
+    min_word: int
+    max_word: int
+    wrap: Callable[[int], int]
+    add: Operation
+    sub: Operation
+    mul: Operation
+    div: Operation
+
+
+def _build(bits: int) -> WordArithmetic:
+    """
+    Builds the operations of a word width, with its bounds held in closures.
+    """
+    max_word = (1 << (bits - 1)) - 1
+    min_word = -(1 << (bits - 1))
+    modulus = 1 << bits
+
+    def wrap_word(value: int) -> int:
+        """
+        Wraps an integer into the word range, as two's-complement truncation does.
+
+        Args:
+            value (int): Any integer.
+
+        Returns:
+            int: The word congruent to value modulo 2**bits.
+        """
+        if min_word <= value <= max_word:
+            return value
+        return (value - min_word) % modulus + min_word
+
+    def add_words(operand1: int, operand2: int) -> ArithmeticResult:
+        """
+        Adds two words.
+
+        Args:
+            operand1 (int): The first addend.
+            operand2 (int): The second addend.
+
+        Returns:
+            ArithmeticResult: The wrapped sum and the flags it sets.
+        """
+        result = wrap_word(operand1 + operand2)
+        # The overflow flag is derived from the operand and result signs; note that
+        # MIN_WORD + MIN_WORD wraps to 0 and therefore does not set it.
+        overflow = (operand1 > 0 and operand2 > 0 > result) or (
+            operand1 < 0 and operand2 < 0 < result
+        )
+        return result, int(result < 0), int(overflow)
+
+    def sub_words(operand1: int, operand2: int) -> ArithmeticResult:
+        """
+        Subtracts the second word from the first.
+
+        Args:
+            operand1 (int): The minuend.
+            operand2 (int): The subtrahend.
+
+        Returns:
+            ArithmeticResult: The wrapped difference and the flags it sets.
+        """
+        result = wrap_word(operand1 - operand2)
+        overflow = (operand1 < 0 < result and operand2 > 0) or (
+            operand1 > 0 > result and operand2 < 0
+        )
+        return result, int(result < 0), int(overflow)
+
+    def mul_words(operand1: int, operand2: int) -> ArithmeticResult:
+        """
+        Multiplies two words.
+
+        Args:
+            operand1 (int): The multiplicand.
+            operand2 (int): The multiplier.
+
+        Returns:
+            ArithmeticResult: The wrapped product and the flags it sets.
+        """
+        exact = operand1 * operand2
+        if min_word <= exact <= max_word:
+            return exact, int(exact < 0), 0
+        result = wrap_word(exact)
+        return result, int(result < 0), 1
+
+    def div_words(dividend: int, divisor: int) -> ArithmeticResult:
+        """
+        Floor-divides the first word by the second.
+
+        Args:
+            dividend (int): The dividend.
+            divisor (int): The divisor.
+
+        Returns:
+            ArithmeticResult: The quotient and the flags it sets; division never sets
+            the overflow flag, even for MIN_WORD // -1, which wraps to MIN_WORD.
+
+        Raises:
+            DivisionByZeroError: If the divisor is zero.
+        """
+        if divisor == 0:
+            raise DivisionByZeroError("Attempted division by zero")
+        result = wrap_word(dividend // divisor)
+        return result, int(result < 0), 0
+
+    operations: tuple[Operation, ...] = (add_words, sub_words, mul_words, div_words)
+    if bits < WORD_BITS:
+        # Immediates and folded constants are 64-bit; narrower operations truncate
+        # them to a word first, so that e.g. PUSH_<OP> k computes the same as PUSH k
+        # followed by <OP>
+        operations = tuple(
+            _truncating(operation, wrap_word) for operation in operations
+        )
+    return WordArithmetic(bits, min_word, max_word, wrap_word, *operations)
+
+
+def _truncating(operation: Operation, truncate: Callable[[int], int]) -> Operation:
+    """
+    Wraps an operation to truncate its operands to the word width first.
+    """
+
+    def truncating(operand1: int, operand2: int) -> ArithmeticResult:
+        return operation(truncate(operand1), truncate(operand2))
+
+    return truncating
+
+
+_WIDTHS = {bits: _build(bits) for bits in WORD_WIDTHS}
+
+
+def word_arithmetic(bits: int) -> WordArithmetic:
+    """
+    Returns the arithmetic of a word width.
+
+    Args:
+        bits (int): The word width, one of WORD_WIDTHS.
+
+    Returns:
+        WordArithmetic: Its operations and bounds.
+
+    Raises:
+        KeyError: If the width is not supported.
+    """
+    return _WIDTHS[bits]
+
+
+wrap, add, sub, mul, div = _WIDTHS[WORD_BITS][3:]
@@ -0,0 +1,189 @@
+"""
+Implements the line-oriented text format of PhiVM programs.
+
+Every line holds at most one instruction, its mnemonic followed by its operand if it
+takes one:
+
+    ; comments run from ";" or "#" to the end of the line
+    PUSH 6
+    push_mul 0x7    ; mnemonics are case-insensitive, operands may be hex
+    STORE 16
+    ---             ; ends a program; the next one starts after it
+
+Jump and call operands are instruction indices, as in the list form. Blank lines and
+comments are ignored. read_programs consumes its lines one at a time and yields each
+program as Bytecode as soon as its last line has been read, so a stream of any number
+of programs is assembled holding only the current one.
+"""
+
+from array import array
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from src.pvm.arithmetic import MAX_WORD, MIN_WORD
+from src.pvm.bytecode import (
+    IMMEDIATE_INSTRUCTIONS,
+    INSTRUCTIONS,
+    Bytecode,
+    compile_program,
+    encode_instruction,
+)
+from src.pvm.errors import AssemblyError, InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.types import InstOperands, Program, Word
+
+SEPARATOR = "---"
+COMMENT_PREFIXES = (";", "#")
+
+
+class AssembledProgram(NamedTuple):
+    """
+    A program read from a stream of program text.
+
+    Attributes:
+        line (int): The 1-based number of the line the program starts on.
+        bytecode (Bytecode): The assembled program.
+    """
+
+    line: int
+    bytecode: Bytecode
+
+
+def parse_line(line: str) -> Optional[tuple[Instruction, InstOperands]]:
+    """
+    Parses one line of program text.
+
+    Args:
+        line (str): The line, with or without its line terminator.
+
+    Returns:
+        Optional[tuple[Instruction, InstOperands]]: The instruction and its operands,
+        or None for a blank or comment-only line.
+
+    Raises:
+        AssemblyError: If the mnemonic is unknown or an operand is not a word.
+    """
+    tokens = _strip_comment(line).split()
+    if not tokens:
+        return None
+    mnemonic, *arguments = tokens
+    try:
+        instruction = Instruction(mnemonic.upper())
+    except ValueError as error:
+        raise AssemblyError(f"Unknown instruction {mnemonic!r}") from error
+    operands = []
+    for argument in arguments:
+        try:
+            operand = int(argument, 0)
+        except ValueError as error:
+            raise AssemblyError(f"Invalid operand {argument!r}") from error
+        if not MIN_WORD <= operand <= MAX_WORD:
+            raise AssemblyError(f"Operand {argument} does not fit in a 64-bit word")
+        operands.append(Word(operand))
+    return instruction, operands
+
+
+def read_programs(
+    lines: Iterable[str], on_error: Optional[Callable[[AssemblyError], None]] = None
+) -> Iterator[AssembledProgram]:
+    """
+    Assembles a stream of programs separated by SEPARATOR lines.
+
+    Programs without instructions, e.g. after a trailing separator, are skipped.
+
+    Args:
+        lines (Iterable[str]): The program text, e.g. an open file or sys.stdin.
+        on_error (Optional[Callable[[AssemblyError], None]]): Called with the error
+            of a malformed line instead of raising it; the program holding the line
+            is then dropped and reading resumes after the next separator.
+
+    Yields:
+        AssembledProgram: Each program and the line it starts on.
+
+    Raises:
+        AssemblyError: If a line is malformed and no on_error is given; the message
+            names its line number.
+    """
+    opcodes = array("B")
+    immediates = array("q")
+    start = 1
+    # Whether the rest of the current program is dropped after an error
+    skipping = False
+    for number, line in enumerate(lines, 1):
+        line = _strip_comment(line)
+        if line.strip() == SEPARATOR:
+            if opcodes:
+                yield AssembledProgram(start, Bytecode(opcodes, immediates, False))
+                opcodes, immediates = array("B"), array("q")
+            start = number + 1
+            skipping = False
+            continue
+        if skipping:
+            continue
+        try:
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            opcode, immediate = encode_instruction(*parsed)
+        except (AssemblyError, InvalidInstructionError) as error:
+            failure = AssemblyError(f"Line {number}: {error}")
+            if on_error is None:
+                raise failure from error
+            on_error(failure)
+            opcodes, immediates = array("B"), array("q")
+            skipping = True
+            continue
+        if not opcodes:
+            start = number
+        opcodes.append(opcode)
+        immediates.append(immediate)
+    if opcodes:
+        yield AssembledProgram(start, Bytecode(opcodes, immediates, False))
+
+
+def assemble(text: Union[str, Iterable[str]]) -> Bytecode:
+    """
+    Assembles the text of a single program.
+
+    Args:
+        text (Union[str, Iterable[str]]): The program text, or its lines.
+
+    Returns:
+        Bytecode: The program; empty if the text holds no instructions.
+
+    Raises:
+        AssemblyError: If a line is malformed or the text holds several programs.
+    """
+    lines = text.splitlines() if isinstance(text, str) else text
+    programs = list(read_programs(lines))
+    if len(programs) > 1:
+        raise AssemblyError(f"Expected one program, found {len(programs)}")
+    return programs[0].bytecode if programs else compile_program([])
+
+
+def disassemble(program: Union[Program, Bytecode]) -> Iterator[str]:
+    """
+    Renders a program as text that assemble reads back into the same bytecode.
+
+    Args:
+        program (Union[Program, Bytecode]): The program.
+
+    Yields:
+        str: One line per instruction, without a line terminator.
+    """
+    if not isinstance(program, Bytecode):
+        program = compile_program(program)
+    for opcode, immediate in zip(program.opcodes, program.immediates):
+        instruction = INSTRUCTIONS[opcode]
+        if instruction in IMMEDIATE_INSTRUCTIONS:
+            yield f"{instruction.value} {immediate}"
+        else:
+            yield instruction.value
+
+
+def _strip_comment(line: str) -> str:
+    """
+    Returns a line of program text without its comment.
+    """
+    for prefix in COMMENT_PREFIXES:
+        line = line.split(prefix, 1)[0]
+    return line
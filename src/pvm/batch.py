@@ -0,0 +1,236 @@
+"""
+Implements BatchPhiVM, a lane-parallel engine that runs one program over many inputs.
+
+Every stack slot holds a NumPy vector with one element per lane, so a single pass over
+the program evaluates it for all lanes with vectorized arithmetic. Flags are kept per
+lane, and division by zero marks the affected lanes as faulted instead of raising.
+Lanes hold words of the configured width, so narrower words move proportionally less
+memory per instruction.
+"""
+
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from src.pvm.bytecode import Bytecode, build_dispatch_table, compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.errors import ConfigurationError, StackOverflowError, StackUnderflowError
+from src.pvm.types import Program
+
+Lanes = NDArray[np.signedinteger[Any]]
+Flags = NDArray[np.bool_]
+# The second operand is a broadcast scalar for the fused immediate instructions
+LaneOperand = Union[Lanes, np.signedinteger[Any]]
+LaneOperation = Callable[[Lanes, LaneOperand], tuple[Lanes, Flags]]
+
+
+class BatchPhiVM:
+    """
+    Represents a stack-based virtual machine evaluating N lanes in lockstep.
+
+    The stack is a (stack_size, lanes) array. Arithmetic matches PhiVM lane by lane:
+    results wrap at the word width and sign_flag/overflow_flag are boolean arrays. A lane
+    that divides by zero is flagged in fault_mask; its results and flags are
+    unspecified from then on.
+    """
+
+    def __init__(self, config: Configuration, lanes: int) -> None:
+        """
+        Initializes the batch VM.
+
+        Args:
+            config (Configuration): The configuration settings for the VM; only the
+                stack size and word width are used since lanes never address memory
+                outside the stack.
+            lanes (int): The number of lanes evaluated per run.
+
+        Raises:
+            ConfigurationError: If lanes is not a positive integer.
+        """
+        if lanes <= 0:
+            raise ConfigurationError("lanes must be a positive integer")
+        self.lanes = lanes
+        self.stack_size = int(config.stack_size)
+        self.stack: Lanes = np.zeros(
+            (self.stack_size, lanes), dtype=np.dtype(f"int{config.word_bits}")
+        )
+        self.depth = 0
+
+        self.sign_flag: Flags = np.zeros(lanes, dtype=np.bool_)
+        self.overflow_flag: Flags = np.zeros(lanes, dtype=np.bool_)
+        self.fault_mask: Flags = np.zeros(lanes, dtype=np.bool_)
+
+    def run(
+        self, program: Union[Program, Bytecode], inputs: Optional[ArrayLike] = None
+    ) -> Lanes:
+        """
+        Runs a program over every lane.
+
+        Args:
+            program (Union[Program, Bytecode]): The program to run.
+            inputs (Optional[ArrayLike]): A (lanes, k) array of per-lane values pushed
+                onto the stack, first column first, before the program starts.
+
+        Returns:
+            Lanes: The top of the stack for every lane.
+
+        Raises:
+            StackUnderflowError: If an instruction needs more elements than the stack holds.
+            StackOverflowError: If the inputs or a push exceed the stack size.
+        """
+        if inputs is not None:
+            self.push_inputs(inputs)
+        if not isinstance(program, Bytecode):
+            program = compile_program(program)
+        handlers = build_dispatch_table(self)
+        with np.errstate(over="ignore"):
+            for opcode, immediate in zip(program.opcodes, program.immediates):
+                handlers[opcode](immediate)
+        return self.top()
+
+    def push_inputs(self, inputs: ArrayLike) -> None:
+        """
+        Pushes per-lane input vectors onto the stack.
+
+        Args:
+            inputs (ArrayLike): A (lanes, k) array; column j is pushed as the j-th slot,
+                truncated to the word width.
+
+        Raises:
+            ValueError: If the array does not have one row per lane.
+            StackOverflowError: If the inputs do not fit on the stack.
+        """
+        columns = np.asarray(inputs, dtype=np.int64).astype(self.stack.dtype)
+        if columns.ndim == 1:
+            columns = columns[:, np.newaxis]
+        if columns.ndim != 2 or columns.shape[0] != self.lanes:
+            raise ValueError(f"inputs must have shape ({self.lanes}, k)")
+        count = columns.shape[1]
+        if self.depth + count > self.stack_size:
+            raise StackOverflowError("Stack overflow on input push")
+        self.stack[self.depth : self.depth + count] = columns.T
+        self.depth += count
+
+    def top(self) -> Lanes:
+        """
+        Returns the top of the stack for every lane.
+
+        Raises:
+            StackUnderflowError: If the stack is empty.
+        """
+        if self.depth == 0:
+            raise StackUnderflowError("Stack is empty")
+        return self.stack[self.depth - 1].copy()
+
+    def _push(self, operand: int) -> None:
+        if self.depth >= self.stack_size:
+            raise StackOverflowError("Stack overflow")
+        self.stack[self.depth] = self._word(operand)
+        self.depth += 1
+
+    def _pop_operands(self, operation: str) -> tuple[Lanes, Lanes]:
+        """
+        Pops the top two slots, leaving the stack pointing at the result slot.
+
+        The returned lanes are views into the stack, so handlers must compute their
+        flags before storing the result over the first operand.
+
+        Args:
+            operation (str): The operation name used in the underflow message.
+
+        Returns:
+            tuple[Lanes, Lanes]: The first and second operand lanes.
+        """
+        if self.depth < 2:
+            raise StackUnderflowError(
+                f"Not enough elements on the stack to perform {operation}"
+            )
+        self.depth -= 1
+        return self.stack[self.depth - 1], self.stack[self.depth]
+
+    def _top_operand(self, operation: str) -> Lanes:
+        if self.depth < 1:
+            raise StackUnderflowError(
+                f"Not enough elements on the stack to perform {operation}"
+            )
+        return self.stack[self.depth - 1]
+
+    def _apply(
+        self, operation: LaneOperation, operand1: Lanes, operand2: LaneOperand
+    ) -> None:
+        result, self.overflow_flag = operation(operand1, operand2)
+        self.sign_flag = result < 0
+        self.stack[self.depth - 1] = result
+
+    def _word(self, operand: int) -> np.signedinteger[Any]:
+        """
+        Truncates a 64-bit immediate to the word width.
+        """
+        word: np.signedinteger[Any] = np.int64(operand).astype(self.stack.dtype)
+        return word
+
+    def _add(self, _operand: int) -> None:
+        self._apply(_add_lanes, *self._pop_operands("add"))
+
+    def _sub(self, _operand: int) -> None:
+        self._apply(_sub_lanes, *self._pop_operands("subtract"))
+
+    def _mul(self, _operand: int) -> None:
+        self._apply(_mul_lanes, *self._pop_operands("multiply"))
+
+    def _div(self, _operand: int) -> None:
+        dividend, divisor = self._pop_operands("division")
+        self.fault_mask |= divisor == 0
+        self._apply(_div_lanes, dividend, divisor)
+
+    def _push_add(self, operand: int) -> None:
+        self._apply(_add_lanes, self._top_operand("add"), self._word(operand))
+
+    def _push_sub(self, operand: int) -> None:
+        self._apply(_sub_lanes, self._top_operand("subtract"), self._word(operand))
+
+    def _push_mul(self, operand: int) -> None:
+        self._apply(_mul_lanes, self._top_operand("multiply"), self._word(operand))
+
+    def _push_div(self, operand: int) -> None:
+        dividend = self._top_operand("division")
+        divisor = self._word(operand)
+        if divisor == 0:
+            self.fault_mask[:] = True
+        self._apply(_div_lanes, dividend, divisor)
+
+
+def _add_lanes(operand1: Lanes, operand2: LaneOperand) -> tuple[Lanes, Flags]:
+    result = operand1 + operand2
+    overflow = ((operand1 > 0) & (operand2 > 0) & (result < 0)) | (
+        (operand1 < 0) & (operand2 < 0) & (result > 0)
+    )
+    return result, overflow
+
+
+def _sub_lanes(operand1: Lanes, operand2: LaneOperand) -> tuple[Lanes, Flags]:
+    result = operand1 - operand2
+    overflow = ((operand1 < 0) & (result > 0) & (operand2 > 0)) | (
+        (operand1 > 0) & (result < 0) & (operand2 < 0)
+    )
+    return result, overflow
+
+
+def _mul_lanes(operand1: Lanes, operand2: LaneOperand) -> tuple[Lanes, Flags]:
+    result = operand1 * operand2
+    # A wrapped product never divides back to the other operand; MIN * -1 is the
+    # one case where that division itself wraps, so it is checked explicitly.
+    nonzero = operand1 != 0
+    quotient = result // np.where(nonzero, operand1, 1)
+    overflow = (nonzero & (quotient != operand2)) | (
+        (operand1 == -1) & (operand2 == np.iinfo(result.dtype).min)
+    )
+    return result, overflow
+
+
+def _div_lanes(dividend: Lanes, divisor: LaneOperand) -> tuple[Lanes, Flags]:
+    # Lanes dividing by zero get 0; callers record them in the fault mask
+    zero_divisor = divisor == 0
+    quotient = dividend // np.where(zero_divisor, 1, divisor)
+    return np.where(zero_divisor, 0, quotient), np.zeros(len(dividend), dtype=np.bool_)
@@ -0,0 +1,172 @@
+"""
+Decodes programs with control flow into basic blocks.
+
+A basic block is a run of straight-line instructions that is only entered at its first
+instruction and ends with a control flow instruction or right before the next block.
+Decoding resolves every jump target from an instruction index into a block index once,
+so the interpreter follows jumps without any lookup. The decoded form is kept on the
+Bytecode, so running it again costs nothing, and cached by digest for programs that
+are compiled afresh from a list on every run.
+"""
+
+from typing import NamedTuple
+
+from src.pvm.bytecode import CONTROL_OPCODES, INSTRUCTIONS, OPCODES, Bytecode
+from src.pvm.errors import InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.translation import ProgramCache
+
+# The deepest nesting of CALL instructions a program may reach
+MAX_CALL_DEPTH = 1024
+
+# The exit of a block that is not ended by a control flow instruction
+FALLTHROUGH = -1
+
+_RET = OPCODES[Instruction.RET]
+
+
+class BasicBlock(NamedTuple):
+    """
+    A decoded basic block.
+
+    Attributes:
+        opcodes (tuple[int, ...]): The opcodes of the straight-line body.
+        immediates (tuple[int, ...]): The immediates of the straight-line body.
+        exit (int): The opcode of the control flow instruction ending the block, or
+            FALLTHROUGH.
+        target (int): The index of the block a jump or call continues at.
+        following (int): The index of the next block; the number of blocks for the
+            last one, which ends the program.
+        start (int): The instruction index of the first instruction of the block.
+        length (int): The number of instructions of the block, its exit included.
+    """
+
+    opcodes: tuple[int, ...]
+    immediates: tuple[int, ...]
+    exit: int
+    target: int
+    following: int
+    start: int
+    length: int
+
+
+class BlockCursor:
+    """
+    Where a run of a decoded program stopped, so that a later run can resume there.
+
+    Attributes:
+        index (int): The block to continue in.
+        offset (int): The number of body instructions of that block already run.
+        calls (list[int]): The call stack of return block indices.
+        done (bool): Whether the program has ended.
+    """
+
+    def __init__(self) -> None:
+        self.index = 0
+        self.offset = 0
+        self.calls: list[int] = []
+        self.done = False
+
+
+class BlockProgram:
+    """
+    A program split into basic blocks with resolved jump targets.
+    """
+
+    def __init__(self, bytecode: Bytecode, blocks: tuple[BasicBlock, ...]) -> None:
+        """
+        Initializes the decoded program.
+
+        Args:
+            bytecode (Bytecode): The program the blocks were decoded from.
+            blocks (tuple[BasicBlock, ...]): Its basic blocks, in program order.
+        """
+        self.bytecode = bytecode
+        self.blocks = blocks
+
+
+def decode_blocks(program: Bytecode) -> BlockProgram:
+    """
+    Splits a program into basic blocks, reusing its or a cached decoding.
+
+    Args:
+        program (Bytecode): The program to decode.
+
+    Returns:
+        BlockProgram: The decoded program.
+
+    Raises:
+        InvalidInstructionError: If a jump target lies outside the program; the
+        index right after the last instruction is valid and ends the program.
+    """
+    decoded = program.blocks
+    if decoded is None:
+        decoded = program.blocks = _cache.get(program)
+    return decoded
+
+
+def clear_cache() -> None:
+    """
+    Drops every cached decoded program.
+    """
+    _cache.clear()
+
+
+def _decode(program: Bytecode) -> BlockProgram:
+    return BlockProgram(program, _split(program))
+
+
+_cache = ProgramCache(_decode)
+
+
+def _leaders(program: Bytecode) -> list[int]:
+    """
+    Returns the sorted indices at which blocks start, ending with the program length.
+    """
+    opcodes = program.opcodes
+    immediates = program.immediates
+    length = len(opcodes)
+    leaders = {0, length}
+    for index, opcode in enumerate(opcodes):
+        if opcode not in CONTROL_OPCODES:
+            continue
+        leaders.add(index + 1)
+        if opcode != _RET:
+            target = immediates[index]
+            if not 0 <= target <= length:
+                raise InvalidInstructionError(
+                    f"Jump target {target} out of range at instruction {index} "
+                    f"({INSTRUCTIONS[opcode].value})"
+                )
+            leaders.add(target)
+    return sorted(leaders)
+
+
+def _split(program: Bytecode) -> tuple[BasicBlock, ...]:
+    opcodes = program.opcodes
+    immediates = program.immediates
+    starts = _leaders(program)
+    # The jump table: the block starting at each leader, the end of the program
+    # mapping to one past the last block
+    block_at = {start: number for number, start in enumerate(starts)}
+    blocks = []
+    for number, (start, stop) in enumerate(zip(starts, starts[1:])):
+        last = opcodes[stop - 1]
+        if last in CONTROL_OPCODES:
+            target = number + 1 if last == _RET else block_at[immediates[stop - 1]]
+            body_stop, exit_opcode = stop - 1, last
+        else:
+            target = number + 1
+            body_stop, exit_opcode = stop, FALLTHROUGH
+        blocks.append(
+            BasicBlock(
+                tuple(opcodes[start:body_stop]),
+                tuple(immediates[start:body_stop]),
+                exit_opcode,
+                target,
+                number + 1,
+                start,
+                stop - start,
+            )
+        )
+    return tuple(blocks)
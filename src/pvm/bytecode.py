@@ -0,0 +1,260 @@
+"""
+Defines the pre-decoded bytecode form of PhiVM programs and the compiler producing it.
+
+A program given as a sequence of (Instruction, operands) tuples is lowered once into two
+parallel arrays: integer opcodes and 64-bit immediates. The VM dispatches on the
+opcode through a handler table instead of comparing Instruction members.
+"""
+
+import hashlib
+import re
+from array import array
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from src.pvm.errors import InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.types import InstOperands, Program
+
+if TYPE_CHECKING:
+    from src.pvm.blocks import BlockProgram
+
+INSTRUCTIONS: tuple[Instruction, ...] = tuple(Instruction)
+OPCODES: dict[Instruction, int] = {
+    instruction: opcode for opcode, instruction in enumerate(INSTRUCTIONS)
+}
+
+Handler = Callable[[int], None]
+
+# Instructions transferring control to the instruction index in their immediate
+JUMP_INSTRUCTIONS = frozenset(
+    {
+        Instruction.JMP,
+        Instruction.JZ,
+        Instruction.JNZ,
+        Instruction.JS,
+        Instruction.JNS,
+        Instruction.JO,
+        Instruction.JNO,
+        Instruction.CALL,
+    }
+)
+CONTROL_INSTRUCTIONS = JUMP_INSTRUCTIONS | {Instruction.RET}
+CONTROL_OPCODES = frozenset(
+    OPCODES[instruction] for instruction in CONTROL_INSTRUCTIONS
+)
+# Matches a byte that is not an opcode, so byte buffers are checked without a loop
+_UNKNOWN_OPCODE = re.compile(
+    b"[^\\x00-" + re.escape(bytes([len(INSTRUCTIONS) - 1])) + b"]"
+)
+
+# Instructions reading or writing memory outside the stack
+MEMORY_INSTRUCTIONS = frozenset(
+    {
+        Instruction.LOAD,
+        Instruction.STORE,
+        Instruction.MEMCPY,
+        Instruction.MEMSET,
+        Instruction.MEMSUM,
+    }
+)
+MEMORY_OPCODES = frozenset(OPCODES[instruction] for instruction in MEMORY_INSTRUCTIONS)
+
+# Instructions that carry an immediate operand; all others take none.
+IMMEDIATE_INSTRUCTIONS = (
+    frozenset(
+        {
+            Instruction.PUSH,
+            Instruction.PUSH_ADD,
+            Instruction.PUSH_SUB,
+            Instruction.PUSH_MUL,
+            Instruction.PUSH_DIV,
+            Instruction.LOAD,
+            Instruction.STORE,
+        }
+    )
+    | JUMP_INSTRUCTIONS
+)
+
+
+class Bytecode:
+    """
+    A program lowered into parallel opcode and immediate arrays.
+
+    The arrays may be any integer sequences (array.array, memoryview, ...), which lets
+    callers hand in buffers they already own without copying them. has_control_flow
+    tells whether the program contains jumps, calls or returns, and blocks holds the
+    program's basic blocks once decode_blocks has decoded it.
+    """
+
+    def __init__(
+        self,
+        opcodes: Sequence[int],
+        immediates: Sequence[int],
+        validate: bool = True,
+        has_control_flow: Optional[bool] = None,
+    ) -> None:
+        """
+        Initializes the bytecode from its opcode and immediate arrays.
+
+        Args:
+            opcodes (Sequence[int]): The opcode of each instruction.
+            immediates (Sequence[int]): The immediate operand of each instruction,
+                0 for instructions without one.
+            validate (bool): Whether to check the opcodes; callers that already
+                validated a larger buffer the arrays are sliced from can skip it.
+            has_control_flow (Optional[bool]): Whether the program contains control
+                flow instructions, if the caller already knows; None scans the
+                opcodes for them.
+
+        Raises:
+            InvalidInstructionError: If the arrays differ in length or hold an
+            unknown opcode.
+        """
+        if len(opcodes) != len(immediates):
+            raise InvalidInstructionError(
+                "Opcode and immediate arrays must have the same length"
+            )
+        if validate:
+            check_opcodes(opcodes)
+        self.opcodes = opcodes
+        self.immediates = immediates
+        if has_control_flow is None:
+            has_control_flow = not CONTROL_OPCODES.isdisjoint(opcodes)
+        self.has_control_flow = has_control_flow
+        self.blocks: Optional["BlockProgram"] = None
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __reduce__(self) -> tuple[type, tuple[array, array]]:
+        # Buffer views such as memoryview cannot be pickled; ship packed copies
+        return Bytecode, (
+            _as_array(self.opcodes, "B"),
+            _as_array(self.immediates, "q"),
+        )
+
+    def digest(self) -> bytes:
+        """
+        Computes a content hash of the program.
+
+        Two bytecodes with the same opcodes and immediates have the same digest,
+        whatever sequence types hold them.
+
+        Returns:
+            bytes: A 16-byte BLAKE2b digest of the opcode and immediate arrays.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(_as_array(self.opcodes, "B"))
+        digest.update(_as_array(self.immediates, "q"))
+        return digest.digest()
+
+
+def check_opcodes(opcodes: Sequence[int]) -> None:
+    """
+    Checks that every opcode names an instruction.
+
+    Args:
+        opcodes (Sequence[int]): The opcodes to check.
+
+    Raises:
+        InvalidInstructionError: If an opcode is unknown.
+    """
+    if isinstance(opcodes, (array, memoryview)) and memoryview(opcodes).format == "B":
+        unknown = _UNKNOWN_OPCODE.search(opcodes) is not None
+    else:
+        unknown = bool(len(opcodes)) and not (
+            0 <= min(opcodes) <= max(opcodes) < len(INSTRUCTIONS)
+        )
+    if unknown:
+        raise InvalidInstructionError("Bytecode contains an unknown opcode")
+
+
+def _as_array(values: Sequence[int], typecode: str) -> array:
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    packed = array(typecode)
+    if isinstance(values, memoryview) and values.format == typecode:
+        packed.frombytes(values.cast("B"))
+    else:
+        packed.extend(values)
+    return packed
+
+
+def _unsupported(_operand: int) -> None:
+    raise InvalidInstructionError("Instruction not supported")
+
+
+def build_dispatch_table(engine: object) -> tuple[Handler, ...]:
+    """
+    Builds an opcode-indexed handler table for an execution engine.
+
+    The handler for an instruction is the engine's method named after it, e.g. _push
+    for PUSH. Every handler takes the instruction's immediate operand so the run loop
+    can call them uniformly; handlers of instructions without one ignore it.
+    Instructions the engine has no method for raise InvalidInstructionError when
+    executed.
+
+    Args:
+        engine (object): The object whose handler methods are looked up.
+
+    Returns:
+        tuple[Handler, ...]: The handler for each opcode.
+    """
+    return tuple(
+        getattr(engine, f"_{instruction.name.lower()}", _unsupported)
+        for instruction in INSTRUCTIONS
+    )
+
+
+def compile_program(program: Program) -> Bytecode:
+    """
+    Lowers a program into its bytecode form.
+
+    Args:
+        program (Program): The program, as a sequence of instructions and operands.
+
+    Returns:
+        Bytecode: The pre-decoded program.
+
+    Raises:
+        InvalidInstructionError: If an instruction is not supported or has the wrong
+        number of operands.
+    """
+    opcodes = array("B")
+    immediates = array("q")
+    for instruction, operands in program:
+        opcode, immediate = encode_instruction(instruction, operands)
+        opcodes.append(opcode)
+        immediates.append(immediate)
+    return Bytecode(opcodes, immediates)
+
+
+def encode_instruction(
+    instruction: Instruction, operands: InstOperands
+) -> tuple[int, int]:
+    """
+    Lowers one instruction into its opcode and immediate.
+
+    Args:
+        instruction (Instruction): The instruction.
+        operands (InstOperands): Its operands.
+
+    Returns:
+        tuple[int, int]: The opcode and the immediate, 0 for instructions without one.
+
+    Raises:
+        InvalidInstructionError: If the instruction is not supported or has the wrong
+        number of operands.
+    """
+    opcode = OPCODES.get(instruction)
+    if opcode is None:
+        raise InvalidInstructionError("Instruction not supported")
+    if instruction in IMMEDIATE_INSTRUCTIONS:
+        if len(operands) != 1:
+            raise InvalidInstructionError(
+                f"{instruction.value} expects exactly one operand"
+            )
+        return opcode, int(operands[0])
+    if operands:
+        raise InvalidInstructionError(f"{instruction.value} does not take operands")
+    return opcode, 0
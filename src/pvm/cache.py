@@ -0,0 +1,179 @@
+"""
+Implements a content-addressed cache of program results.
+
+PhiVM instructions are pure: run on an empty stack, a program always ends with the
+same stack and flags, or fails with the same error, under any configuration with the
+same stack size, as long as it does not access memory outside the stack. ResultCache
+memoizes such runs keyed by the program's bytecode digest and replays the recorded
+outcome instead of executing the program again.
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Union
+
+from src.pvm.bytecode import MEMORY_OPCODES, Bytecode, compile_program
+from src.pvm.errors import (
+    DivisionByZeroError,
+    InvalidInstructionError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.types import Memory, Program
+from src.pvm.verifier import VerifiedProgram
+from src.pvm.vm import PhiVM
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Errors whose outcome is recorded and raised again on later hits
+CACHED_ERRORS = (
+    DivisionByZeroError,
+    InvalidInstructionError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+
+# (program digest, stack size, word width, sign flag on entry, overflow flag on entry)
+CacheKey = tuple[bytes, int, int, int, int]
+
+
+class CachedResult(NamedTuple):
+    """
+    The recorded outcome of one run.
+
+    Attributes:
+        stack (Memory): The live stack when the program stopped, bottom first.
+        sign_flag (int): The sign flag when the program stopped.
+        overflow_flag (int): The overflow flag when the program stopped.
+        executed (int): The number of instructions the run executed.
+        error_type (Optional[type[Exception]]): The type of the error the program
+            raised, if any. Only the type and arguments are kept: the error itself
+            would hold on to its traceback and, through it, to the VM.
+        error_args (tuple[object, ...]): The arguments of that error.
+    """
+
+    stack: Memory
+    sign_flag: int
+    overflow_flag: int
+    executed: int
+    error_type: Optional[type[Exception]]
+    error_args: tuple[object, ...]
+
+
+class ResultCache:
+    """
+    A bounded LRU cache of program outcomes with hit and miss statistics.
+
+    Only runs that start on an empty stack and use no memory instructions are cached;
+    other runs execute normally and count as bypasses.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The most outcomes kept; the least recently used one is
+                evicted beyond that.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, CachedResult] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of cacheable runs that were served from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """
+        Drops all cached outcomes; the statistics are kept.
+        """
+        self._entries.clear()
+
+    def run(
+        self, vm: PhiVM, program: Union[Program, Bytecode, VerifiedProgram]
+    ) -> None:
+        """
+        Runs a program on a VM, replaying its outcome if it is cached.
+
+        On a hit, the VM ends in the state a real run would leave it in, executed
+        included, except that stack slots above the final stack pointer are not
+        rewritten.
+
+        Args:
+            vm (PhiVM): The VM to run the program on.
+            program (Union[Program, Bytecode, VerifiedProgram]): The program to run.
+
+        Raises:
+            DivisionByZeroError, InvalidInstructionError, StackOverflowError,
+            StackUnderflowError: As raised by the program, whether cached or not.
+        """
+        bytecode = program.bytecode if isinstance(program, VerifiedProgram) else program
+        if not isinstance(bytecode, Bytecode):
+            bytecode = program = compile_program(bytecode)
+        if vm.stack_pointer != vm.stack_start or not MEMORY_OPCODES.isdisjoint(
+            bytecode.opcodes
+        ):
+            self.bypasses += 1
+            vm.run(program)
+            return
+        key = (
+            bytecode.digest(),
+            int(vm.stack_size),
+            vm.word_bits,
+            vm.sign_flag,
+            vm.overflow_flag,
+        )
+
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            _replay(vm, result)
+            return
+
+        self.misses += 1
+        try:
+            vm.run(program)
+        except CACHED_ERRORS as error:
+            self._store(key, _record(vm, error))
+            raise
+        self._store(key, _record(vm, None))
+
+    def _store(self, key: CacheKey, result: CachedResult) -> None:
+        self._entries[key] = result
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _record(vm: PhiVM, error: Optional[Exception]) -> CachedResult:
+    return CachedResult(
+        vm.dump_memory(vm.stack_start, vm.stack_pointer),
+        vm.sign_flag,
+        vm.overflow_flag,
+        vm.executed,
+        None if error is None else type(error),
+        () if error is None else error.args,
+    )
+
+
+def _replay(vm: PhiVM, result: CachedResult) -> None:
+    depth = len(result.stack)
+    vm.memory[vm.stack_start : vm.stack_start + depth] = result.stack
+    vm.mark_stack_written(vm.stack_start + depth)
+    vm.stack_pointer = vm.stack_start + depth
+    vm.sign_flag = result.sign_flag
+    vm.overflow_flag = result.overflow_flag
+    vm.executed = result.executed
+    if result.error_type is not None:
+        raise result.error_type(*result.error_args)
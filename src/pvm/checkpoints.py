@@ -0,0 +1,111 @@
+"""
+Implements checkpointed re-execution of edited programs.
+
+A CheckpointRunner runs a program in slices of a fixed number of instructions and
+saves a Snapshot of the VM (flags, the live stack and any memory the program wrote)
+before each slice. When the program is run again after an edit, the slices before the
+first changed instruction would compute exactly the same state, so the runner restores
+the last checkpoint before the change and executes only the rest. For a straight-line
+program edited near its end, a rerun costs time proportional to the distance of the
+edit from the end instead of the length of the program.
+"""
+
+from typing import Optional, Union
+
+from src.pvm.bytecode import Bytecode, compile_program
+from src.pvm.types import Program
+from src.pvm.vm import PhiVM, Snapshot
+
+DEFAULT_INTERVAL = 1024
+
+
+class CheckpointRunner:
+    """
+    Runs successive versions of a program on a VM, reusing the unchanged prefix.
+
+    Every run starts from the state the VM was in when the runner first ran a program,
+    as if the VM had been restored to it and the program run from scratch. Programs
+    with control flow do not execute in program order, so they are always run in full.
+    """
+
+    def __init__(self, vm: PhiVM, interval: int = DEFAULT_INTERVAL) -> None:
+        """
+        Initializes the runner.
+
+        Args:
+            vm (PhiVM): The VM to run programs on.
+            interval (int): The number of instructions between checkpoints.
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+        if interval < 1:
+            raise ValueError("interval must be a positive integer")
+        self.vm = vm
+        self.interval = interval
+        # The index of the instruction the last run started executing at
+        self.resumed_at = 0
+        self._program: Optional[Bytecode] = None
+        # Checkpoint k is the state before instruction k * interval of _program
+        self._checkpoints: list[Snapshot] = []
+
+    def run(self, program: Union[Program, Bytecode]) -> None:
+        """
+        Runs a program, resuming from the last checkpoint before its first change.
+
+        Args:
+            program (Union[Program, Bytecode]): The program to run.
+
+        Raises:
+            InvalidInstructionError, StackOverflowError, StackUnderflowError,
+            DivisionByZeroError, MemoryAccessError: As raised by the program; the
+            checkpoints taken before the fault are kept.
+        """
+        if not isinstance(program, Bytecode):
+            program = compile_program(program)
+        if not self._checkpoints:
+            self._checkpoints.append(self.vm.snapshot())
+        del self._checkpoints[self._unchanged_checkpoints(program) :]
+        self.vm.restore(self._checkpoints[-1])
+        self._program = program
+        self.resumed_at = (len(self._checkpoints) - 1) * self.interval
+        if program.has_control_flow:
+            self.vm.run(program)
+            return
+
+        opcodes = program.opcodes
+        immediates = program.immediates
+        for start in range(self.resumed_at, len(program), self.interval):
+            stop = start + self.interval
+            self.vm.run(
+                Bytecode(opcodes[start:stop], immediates[start:stop], validate=False)
+            )
+            if stop < len(program):
+                self._checkpoints.append(self.vm.snapshot())
+
+    def clear(self) -> None:
+        """
+        Drops all checkpoints; the next run starts from the VM's state at that time.
+        """
+        self._checkpoints.clear()
+        self._program = None
+
+    def _unchanged_checkpoints(self, program: Bytecode) -> int:
+        """
+        Counts the checkpoints whose preceding instructions the program leaves as they
+        were; the initial checkpoint always counts.
+        """
+        previous = self._program
+        if previous is None or previous.has_control_flow or program.has_control_flow:
+            return 1
+        kept = 1
+        while kept < len(self._checkpoints):
+            start = (kept - 1) * self.interval
+            stop = start + self.interval
+            if (
+                previous.opcodes[start:stop] != program.opcodes[start:stop]
+                or previous.immediates[start:stop] != program.immediates[start:stop]
+            ):
+                break
+            kept += 1
+        return kept
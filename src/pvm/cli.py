@@ -0,0 +1,191 @@
+"""
+Implements the PhiVM command line, run as python -m src.pvm.
+
+Usage:
+
+    python -m src.pvm program.pasm
+    python -m src.pvm --word-bits 32 --quiet programs/ more.pasm
+    generate-programs | python -m src.pvm
+
+Every path is a program text file (see src.pvm.assembler), a directory whose *.pasm
+files are run in path order, or - for standard input, the default. A file may hold
+many programs separated by --- lines; they are assembled and run one at a time, so
+memory use does not grow with the input. All programs run on one VM that is reset
+before each of them, and each prints one line naming its file and first line:
+
+    programs/a.pasm:1: ok top=42 sign=0 overflow=0
+    programs/a.pasm:6: fault DIVISION_BY_ZERO at 2 sp=1025
+
+A summary of the programs, faults and instructions per second is written to standard
+error at the end. Only the runs are timed, not reading and assembling the programs,
+and every instruction executed is counted, so a loop counts its body once per
+iteration. A program with a malformed line is reported and skipped, and reading
+resumes after the next --- line. The exit status is 1 if any program faulted or
+failed to assemble, else 0.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from src.pvm.arithmetic import WORD_BITS, WORD_WIDTHS
+from src.pvm.assembler import read_programs
+from src.pvm.configuration import Configuration
+from src.pvm.errors import AssemblyError, ConfigurationError
+from src.pvm.faults import NO_INDEX, RunStatus
+from src.pvm.types import Word
+from src.pvm.vm import PhiVM
+
+PROGRAM_SUFFIX = ".pasm"
+STDIN = "-"
+
+DEFAULT_MEMORY_SIZE = 1 << 16
+DEFAULT_STACK_START = 1 << 15
+DEFAULT_STACK_SIZE = 1 << 12
+
+
+class RunTotals:
+    """
+    Accumulates the outcome of every program the command line runs.
+    """
+
+    def __init__(self) -> None:
+        self.programs = 0
+        self.faults = 0
+        # Files that could not be read or assembled
+        self.errors = 0
+        self.instructions = 0
+        self.seconds = 0.0
+
+    def summary(self) -> str:
+        """
+        Returns the summary line printed after all programs ran.
+        """
+        rate = self.instructions / self.seconds if self.seconds else 0.0
+        return (
+            f"{self.programs} programs, {self.faults} faults, {self.errors} errors: "
+            f"{self.instructions} instructions in {self.seconds:.3f} s "
+            f"({rate:,.0f} instructions/s)"
+        )
+
+
+def format_status(vm: PhiVM, status: RunStatus) -> str:
+    """
+    Describes the outcome of a run.
+
+    Args:
+        vm (PhiVM): The VM the program ran on.
+        status (RunStatus): The status of the run.
+
+    Returns:
+        str: The top of the stack and the flags, or the fault and where it occurred.
+    """
+    if not status.ok:
+        where = ""
+        if status.instruction_index != NO_INDEX:
+            where = f" at {status.instruction_index}"
+        return f"fault {status.fault.name}{where} sp={status.stack_pointer}"
+    top = "-"
+    if vm.stack_pointer > vm.stack_start:
+        top = str(vm.memory[vm.stack_pointer - 1])
+    return f"ok top={top} sign={vm.sign_flag} overflow={vm.overflow_flag}"
+
+
+def run_source(
+    vm: PhiVM, name: str, lines: Iterable[str], totals: RunTotals, quiet: bool = False
+) -> None:
+    """
+    Runs every program in a stream of program text, printing one line per program.
+
+    A program with a line that fails to assemble is reported as an error instead of
+    run, and the stream continues after its next separator.
+
+    Args:
+        vm (PhiVM): The VM to run the programs on.
+        name (str): The name of the stream used in the output.
+        lines (Iterable[str]): The program text.
+        totals (RunTotals): The totals to add the runs to.
+        quiet (bool): Whether to print faults only.
+    """
+    clock = time.perf_counter
+
+    def report(error: AssemblyError) -> None:
+        totals.errors += 1
+        print(f"{name}: error {error}")
+
+    for line, bytecode in read_programs(lines, report):
+        vm.reset()
+        started = clock()
+        status = vm.run_status(bytecode)
+        totals.seconds += clock() - started
+        totals.programs += 1
+        totals.instructions += vm.executed
+        if not status.ok:
+            totals.faults += 1
+        if not (quiet and status.ok):
+            print(f"{name}:{line}: {format_status(vm, status)}")
+
+
+def _source_paths(paths: list[str]) -> Iterator[str]:
+    """
+    Expands directories into the program files they contain.
+    """
+    for path in paths:
+        if path != STDIN and Path(path).is_dir():
+            yield from map(str, sorted(Path(path).rglob(f"*{PROGRAM_SUFFIX}")))
+        else:
+            yield path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the command line.
+
+    Args:
+        argv (Optional[list[str]]): The arguments; sys.argv[1:] by default.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pvm", description="Run PhiVM program text"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[STDIN],
+        help=f"program files, directories of {PROGRAM_SUFFIX} files, or - for stdin",
+    )
+    parser.add_argument("--memory-size", type=int, default=DEFAULT_MEMORY_SIZE)
+    parser.add_argument("--stack-start", type=int, default=DEFAULT_STACK_START)
+    parser.add_argument("--stack-size", type=int, default=DEFAULT_STACK_SIZE)
+    parser.add_argument("--word-bits", type=int, choices=WORD_WIDTHS, default=WORD_BITS)
+    parser.add_argument("--quiet", action="store_true", help="print faults only")
+    args = parser.parse_args(argv)
+    try:
+        vm = PhiVM(
+            Configuration(
+                memory_size=Word(args.memory_size),
+                stack_start=Word(args.stack_start),
+                stack_size=Word(args.stack_size),
+                word_bits=args.word_bits,
+            )
+        )
+    except ConfigurationError as error:
+        parser.error(str(error))
+
+    totals = RunTotals()
+    for path in _source_paths(args.paths):
+        if path == STDIN:
+            run_source(vm, "<stdin>", sys.stdin, totals, args.quiet)
+            continue
+        try:
+            with open(path, encoding="utf-8") as lines:
+                run_source(vm, path, lines, totals, args.quiet)
+        except OSError as error:
+            totals.errors += 1
+            print(f"{path}: error {error.strerror}")
+    print(totals.summary(), file=sys.stderr)
+    return int(bool(totals.faults or totals.errors))
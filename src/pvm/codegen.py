@@ -0,0 +1,224 @@
+"""
+Implements a backend that translates straight-line PhiVM programs into Python functions.
+
+Each program is turned into Python source once, with stack slots held in local
+variables and flags computed only for the last flag-setting instruction, and compiled
+with compile(). Compiled programs are cached by program digest.
+
+The generated function writes the VM state only after the whole program has been
+evaluated. Whenever the interpreter would raise (stack bounds or division by zero),
+it leaves the VM untouched and the program is re-run by PhiVM.run, so callers observe
+exactly the interpreter's behavior, exceptions and partial state included.
+"""
+
+from typing import Callable, Union, cast
+
+from src.pvm.arithmetic import MIN_WORD, WORD_BITS, WORD_MODULUS, add, div, mul, sub
+from src.pvm.bytecode import INSTRUCTIONS, OPCODES, Bytecode, compile_program
+from src.pvm.errors import InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.translation import ProgramCache, SymbolicStack
+from src.pvm.types import Program
+from src.pvm.vm import PhiVM
+
+# Returns False, leaving the VM untouched, when the interpreter has to run instead
+ProgramFunction = Callable[[PhiVM], bool]
+
+_BINARY = {
+    Instruction.ADD: "add",
+    Instruction.SUB: "sub",
+    Instruction.MUL: "mul",
+    Instruction.DIV: "div",
+}
+_FUSED = {
+    Instruction.PUSH_ADD: "add",
+    Instruction.PUSH_SUB: "sub",
+    Instruction.PUSH_MUL: "mul",
+    Instruction.PUSH_DIV: "div",
+}
+_NATIVE_OPERATORS = {"add": "+", "sub": "-", "mul": "*", "div": "//"}
+
+_NAMESPACE = {
+    "_add": add,
+    "_sub": sub,
+    "_mul": mul,
+    "_div": div,
+    "_BIAS": -MIN_WORD,
+    "_MASK": WORD_MODULUS - 1,
+}
+
+
+class CompiledProgram:
+    """
+    A program compiled into a Python function operating on a PhiVM.
+
+    Calling it with a VM has the same effect as vm.run(program), including setting
+    vm.executed to the number of instructions run. The generated code
+    computes with 64-bit words, so on a VM with narrower words the program is
+    interpreted instead.
+    """
+
+    def __init__(
+        self, bytecode: Bytecode, source: str, function: ProgramFunction
+    ) -> None:
+        """
+        Initializes the compiled program.
+
+        Args:
+            bytecode (Bytecode): The program the function was generated from.
+            source (str): The generated Python source.
+            function (ProgramFunction): The compiled function.
+        """
+        self.bytecode = bytecode
+        self.source = source
+        self._function = function
+
+    def __call__(self, vm: PhiVM) -> None:
+        if vm.word_bits != WORD_BITS or not self._function(vm):
+            vm.run(self.bytecode)
+        else:
+            vm.executed = len(self.bytecode)
+
+
+def compile_to_python(program: Union[Program, Bytecode]) -> CompiledProgram:
+    """
+    Compiles a straight-line program into a Python function, reusing cached ones.
+
+    Args:
+        program (Union[Program, Bytecode]): The program to compile.
+
+    Returns:
+        CompiledProgram: The compiled program.
+
+    Raises:
+        InvalidInstructionError: If the program contains an invalid instruction or
+        one the backend does not support.
+    """
+    if not isinstance(program, Bytecode):
+        program = compile_program(program)
+    return _cache.get(program)
+
+
+def clear_cache() -> None:
+    """
+    Drops every cached compiled program.
+    """
+    _cache.clear()
+
+
+def _compile(program: Bytecode) -> CompiledProgram:
+    source = _generate_source(program)
+    namespace = dict(_NAMESPACE)
+    name = f"<phivm program {program.digest().hex()}>"
+    # pylint: disable-next=exec-used
+    exec(compile(source, name, "exec"), namespace)
+    return CompiledProgram(program, source, cast(ProgramFunction, namespace["run"]))
+
+
+_cache = ProgramCache(_compile)
+
+
+class _SourceBuilder:
+    """
+    Symbolically executes a program, emitting one statement per computed value.
+    """
+
+    def __init__(self) -> None:
+        self.body: list[str] = []
+        self.stack: SymbolicStack[str] = SymbolicStack(self._load)
+        self.values = 0
+
+    def _load(self, slot: int) -> str:
+        """Emits the read of a caller slot into a local."""
+        name = f"c{-slot}"
+        self.body.append(f"{name} = memory[base - {-slot}]")
+        return name
+
+    def apply(self, operation: str, operand1: str, operand2: str, final: bool) -> None:
+        """Emits an arithmetic operation; only the final one computes flags."""
+        name = f"v{self.values}"
+        self.values += 1
+        if operation == "div":
+            self.body.append(f"if {operand2} == 0: return False")
+        if final:
+            self.body.append(
+                f"{name}, sign, overflow = _{operation}({operand1}, {operand2})"
+            )
+        else:
+            operator = _NATIVE_OPERATORS[operation]
+            self.body.append(
+                f"{name} = (({operand1} {operator} {operand2} + _BIAS) & _MASK) - _BIAS"
+            )
+        self.stack.push(name)
+
+
+def _generate_source(program: Bytecode) -> str:
+    """
+    Generates the source of the function implementing a program.
+
+    Args:
+        program (Bytecode): The program to translate.
+
+    Returns:
+        str: The source of a function run(vm) -> bool.
+    """
+    flag_setters = {
+        OPCODES[instruction] for instruction in list(_BINARY) + list(_FUSED)
+    }
+    last_flag_setter = max(
+        (
+            index
+            for index, opcode in enumerate(program.opcodes)
+            if opcode in flag_setters
+        ),
+        default=-1,
+    )
+
+    builder = _SourceBuilder()
+    stack = builder.stack
+    for index, (opcode, immediate) in enumerate(
+        zip(program.opcodes, program.immediates)
+    ):
+        instruction = INSTRUCTIONS[opcode]
+        if instruction == Instruction.PUSH:
+            stack.push(f"({int(immediate)})")
+        elif instruction in _BINARY:
+            # Operands are popped one at a time so caller slots are read in order
+            operand2 = stack.pop()
+            operand1 = stack.pop()
+            builder.apply(
+                _BINARY[instruction], operand1, operand2, index == last_flag_setter
+            )
+        elif instruction in _FUSED:
+            operand1 = stack.pop()
+            builder.apply(
+                _FUSED[instruction],
+                operand1,
+                f"({int(immediate)})",
+                index == last_flag_setter,
+            )
+        else:
+            raise InvalidInstructionError(
+                f"{instruction.value} cannot be compiled to Python"
+            )
+
+    lines = [
+        "def run(vm):",
+        "    memory = vm.memory",
+        "    base = vm.stack_pointer",
+        "    depth = base - vm.stack_start",
+        f"    if depth < {stack.loaded} or depth + {stack.peak} > vm.stack_size:",
+        "        return False",
+    ]
+    lines.extend(f"    {statement}" for statement in builder.body)
+    lines.extend(
+        f"    memory[base + {slot}] = {expression}"
+        for slot, expression in sorted(stack.written.items())
+    )
+    lines.append(f"    vm.mark_stack_written(base + {stack.peak})")
+    lines.append(f"    vm.stack_pointer = base + {stack.depth()}")
+    if last_flag_setter >= 0:
+        lines.append("    vm.sign_flag = sign")
+        lines.append("    vm.overflow_flag = overflow")
+    lines.append("    return True")
+    return "\n".join(lines) + "\n"
@@ -3,6 +3,7 @@ Defines the Configuration class for PhiVM, handling the setup of VM parameters.
 """
 
 
+from src.pvm.arithmetic import WORD_BITS, WORD_WIDTHS
 from src.pvm.errors import ConfigurationError
 from src.pvm.types import Word
 
@@ -12,10 +13,16 @@ class Configuration:
     Manages the configuration settings for PhiVM.
 
     Holds and validates the configuration parameters such as memory size, stack start,
-    and stack size for the virtual machine.
+    stack size and word width for the virtual machine.
     """
 
-    def __init__(self, memory_size: Word, stack_start: Word, stack_size: Word) -> None:
+    def __init__(
+        self,
+        memory_size: Word,
+        stack_start: Word,
+        stack_size: Word,
+        word_bits: int = WORD_BITS,
+    ) -> None:
         """
         Initialize the VM configuration.
 
@@ -23,12 +30,32 @@ class Configuration:
             memory_size (Word): The total size of the VM's memory.
             stack_start (Word): The starting position of the stack in the memory.
             stack_size (Word): The size of the stack.
+            word_bits (int): The width of a word in bits, one of WORD_WIDTHS. Memory
+                packs words at this width, and arithmetic wraps and sets its flags
+                at it.
         """
         self.memory_size = memory_size
         self.stack_start = stack_start
         self.stack_size = stack_size
+        self.word_bits = word_bits
         self._validate_config()
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Configuration):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple[int, int, int, int]:
+        return (
+            int(self.memory_size),
+            int(self.stack_start),
+            int(self.stack_size),
+            self.word_bits,
+        )
+
     def _validate_config(self) -> None:
         """
         Validates the VM configuration.
@@ -47,3 +74,8 @@ class Configuration:
 
         if self.stack_start + self.stack_size > self.memory_size:
             raise ConfigurationError("Stack exceeds allocated memory size")
+
+        if self.word_bits not in WORD_WIDTHS:
+            raise ConfigurationError(
+                f"word_bits must be one of {', '.join(map(str, WORD_WIDTHS))}"
+            )
@@ -21,3 +21,19 @@ class InvalidInstructionError(Exception):
 
 class DivisionByZeroError(Exception):
     """Exception raised for division by zero instruction."""
+
+
+class MemoryAccessError(Exception):
+    """Exception raised for memory accesses outside the VM's address space."""
+
+
+class ProgramFormatError(Exception):
+    """Exception raised for malformed or incompatible program files."""
+
+
+class AssemblyError(Exception):
+    """Exception raised for malformed program text."""
+
+
+class InstructionLimitError(Exception):
+    """Exception raised when a program runs more instructions than it may."""
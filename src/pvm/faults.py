@@ -0,0 +1,90 @@
+"""
+Defines the structured fault codes reported by PhiVM.run_status.
+
+A RunStatus says whether a program ran to completion and, if it faulted, what kind of
+fault stopped it, the index of the faulting instruction and the stack pointer at that
+point, so callers running many programs can handle faults as data instead of catching
+an exception per program.
+"""
+
+from enum import IntEnum
+from typing import NamedTuple
+
+from src.pvm.errors import (
+    DivisionByZeroError,
+    InvalidInstructionError,
+    MemoryAccessError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+
+# The index reported when no instruction faulted, e.g. for an invalid jump target
+# found while decoding the program
+NO_INDEX = -1
+
+
+class Fault(IntEnum):
+    """
+    Enumerates the ways a program run can end.
+    """
+
+    NONE = 0
+    STACK_OVERFLOW = 1
+    STACK_UNDERFLOW = 2
+    DIVISION_BY_ZERO = 3
+    INVALID_INSTRUCTION = 4
+    MEMORY_ACCESS = 5
+
+
+# The fault code of each error raised by the VM
+FAULTS: dict[type[Exception], Fault] = {
+    StackOverflowError: Fault.STACK_OVERFLOW,
+    StackUnderflowError: Fault.STACK_UNDERFLOW,
+    DivisionByZeroError: Fault.DIVISION_BY_ZERO,
+    InvalidInstructionError: Fault.INVALID_INSTRUCTION,
+    MemoryAccessError: Fault.MEMORY_ACCESS,
+}
+
+# The errors run_status reports as faults; anything else propagates
+FAULT_ERRORS = (
+    StackOverflowError,
+    StackUnderflowError,
+    DivisionByZeroError,
+    InvalidInstructionError,
+    MemoryAccessError,
+)
+
+
+class RunStatus(NamedTuple):
+    """
+    The outcome of one program run.
+
+    Attributes:
+        fault (Fault): The fault that stopped the program, or Fault.NONE.
+        instruction_index (int): The index of the faulting instruction, or NO_INDEX.
+        stack_pointer (int): The stack pointer when the program stopped.
+    """
+
+    fault: Fault
+    instruction_index: int
+    stack_pointer: int
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the program ran to completion.
+        """
+        return self.fault == Fault.NONE
+
+
+def fault_of(error: Exception) -> Fault:
+    """
+    Returns the fault code of an error raised by the VM.
+
+    Args:
+        error (Exception): An instance of one of the FAULT_ERRORS.
+
+    Returns:
+        Fault: Its fault code.
+    """
+    return FAULTS[type(error)]
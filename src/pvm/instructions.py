@@ -15,4 +15,28 @@ class Instruction(Enum):
     SUB = "SUB"
     MUL = "MUL"
     DIV = "DIV"
+
+    # Superinstructions fusing a PUSH with the arithmetic instruction that consumes it
+    PUSH_ADD = "PUSH_ADD"
+    PUSH_SUB = "PUSH_SUB"
+    PUSH_MUL = "PUSH_MUL"
+    PUSH_DIV = "PUSH_DIV"
+
+    # Control flow; the operand is the index of the instruction to continue at
+    JMP = "JMP"
+    JZ = "JZ"
+    JNZ = "JNZ"
+    JS = "JS"
+    JNS = "JNS"
+    JO = "JO"
+    JNO = "JNO"
+    CALL = "CALL"
+    RET = "RET"
+
+    # Memory access outside the stack
+    LOAD = "LOAD"
+    STORE = "STORE"
+    MEMCPY = "MEMCPY"
+    MEMSET = "MEMSET"
+    MEMSUM = "MEMSUM"
     # Additional instructions can be added here as needed
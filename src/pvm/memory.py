@@ -0,0 +1,557 @@
+"""
+Implements the packed integer memory backing a PhiVM instance.
+
+Memory is normally a single array.array of signed words, 64 bits wide unless the
+configuration selects a narrower width, so the core VM needs
+no third-party imports: indexing it yields Python ints, slicing copies, and
+memoryview gives zero-copy views. Address spaces too large to allocate up front use
+PagedMemory, which supports the same indexing and allocates fixed-size pages on first
+write. Memory can also live in a buffer the VM does not own, such as a
+multiprocessing.shared_memory block, through a word memoryview from word_view; slicing
+such a view does not copy, so copies out of memory go through dump_range. The helpers
+here allocate memory, check address ranges against it and move, fill and sum whole
+ranges without per-word Python loops; summing a large range uses NumPy, imported on
+first use, when it is installed.
+"""
+
+from array import array
+from types import ModuleType
+from typing import Iterator, Optional, Sequence, Union, overload
+
+from src.pvm.errors import ConfigurationError, MemoryAccessError
+from src.pvm.types import Memory
+
+# The array typecode of a word: a signed 64-bit integer
+WORD_TYPECODE = "q"
+WORD_BYTES = 8
+# The array typecode of the signed words of each supported width
+WORD_TYPECODES = {8: "b", 16: "h", 32: "i", 64: WORD_TYPECODE}
+
+# Memory sizes above this many words are paged by default (128 MiB of words)
+MAX_DENSE_WORDS = 1 << 24
+DEFAULT_PAGE_SIZE = 4096
+
+# Ranges at least this long are summed with NumPy when it is available
+VECTORIZED_SUM_WORDS = 1024
+
+
+class PagedMemory:
+    """
+    A sparse word-addressed memory allocating its pages on first write.
+
+    Untouched pages read as zero. Integer indexing reads and writes single words
+    as Python ints. Slicing with a step of 1 reads a range into a new array and
+    writes a sequence of the same length into a range. Pages left all zero by fill
+    are released. Reading, summing, zeroing and copying ranges visit only the
+    resident pages, so their cost does not grow with the size of the range. The
+    pages written since the last save_pages or load_pages are tracked, so saving and
+    restoring the pages copies only those.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        typecode: str = WORD_TYPECODE,
+    ) -> None:
+        """
+        Initializes an all-zero memory.
+
+        Args:
+            size (int): The number of addressable words.
+            page_size (int): The number of words per page.
+            typecode (str): The array typecode of a word.
+        """
+        self.size = size
+        self.page_size = page_size
+        self.typecode = typecode
+        self._pages: dict[int, Memory] = {}
+        # The pages returned by the last save_pages or given to the last load_pages
+        self._saved: dict[int, Memory] = {}
+        # The numbers of the pages written or released since then
+        self._written: set[int] = set()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def resident_pages(self) -> int:
+        """
+        The number of allocated pages.
+        """
+        return len(self._pages)
+
+    def item(self, address: int) -> int:
+        """
+        Reads one word without checking the address.
+
+        Args:
+            address (int): The address, which must lie within memory.
+
+        Returns:
+            int: The word.
+        """
+        number, offset = divmod(address, self.page_size)
+        page = self._pages.get(number)
+        return 0 if page is None else page[offset]
+
+    @overload
+    def __getitem__(self, key: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, key: slice) -> Memory:
+        ...
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, Memory]:
+        if not isinstance(key, slice):
+            return self.item(self._address(key))
+        start, stop = self._range(key)
+        values = allocate_memory(stop - start, self.typecode)
+        for number, low, high in self._resident_spans(start, stop):
+            offset = number * self.page_size
+            values[low - start : high - start] = self._pages[number][
+                low - offset : high - offset
+            ]
+        return values
+
+    @overload
+    def __setitem__(self, key: int, value: int) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, key: slice, value: Sequence[int]) -> None:
+        ...
+
+    def __setitem__(
+        self, key: Union[int, slice], value: Union[int, Sequence[int]]
+    ) -> None:
+        if not isinstance(key, slice):
+            assert isinstance(value, int)
+            number, offset = divmod(self._address(key), self.page_size)
+            self._page(number)[offset] = value
+            return
+        assert not isinstance(value, int)
+        start, stop = self._range(key)
+        if len(value) != stop - start:
+            raise ValueError("Value and slice lengths differ")
+        values = _words(value, self.typecode)
+        for number, low, high in self._spans(start, stop):
+            offset = number * self.page_size
+            self._page(number)[low - offset : high - offset] = values[
+                low - start : high - start
+            ]
+
+    def fill(self, start: int, stop: int, value: int) -> None:
+        """
+        Sets the words in [start, stop) to a value, releasing pages left all zero.
+
+        Args:
+            start (int): The first address.
+            stop (int): One past the last address.
+            value (int): The value to store.
+        """
+        if value == 0:
+            self._clear(start, stop)
+            return
+        for number, low, high in self._spans(start, stop):
+            offset = number * self.page_size
+            self._page(number)[low - offset : high - offset] = _repeat(
+                value, high - low, self.typecode
+            )
+
+    def copy(self, destination: int, source: int, count: int) -> None:
+        """
+        Copies count words between two ranges, which may overlap.
+
+        Only the resident source pages are read: the destination is zeroed and they
+        are written over it, so copying untouched memory allocates nothing.
+
+        Args:
+            destination (int): The first address to write.
+            source (int): The first address to read.
+            count (int): The number of words.
+        """
+        chunks = []
+        for number, low, high in self._resident_spans(source, source + count):
+            offset = number * self.page_size
+            chunks.append((low, self._pages[number][low - offset : high - offset]))
+        self._clear(destination, destination + count)
+        for low, words in chunks:
+            start = destination + low - source
+            self[start : start + len(words)] = words
+
+    def save_pages(self) -> dict[int, Memory]:
+        """
+        Copies the resident pages out of memory.
+
+        Pages not written since the last save or load share the copies made then, so
+        only the pages written since are copied.
+
+        Returns:
+            dict[int, Memory]: The page copies keyed by page number. They may be
+            shared with other saves and must not be modified.
+        """
+        saved = self._saved
+        self._saved = {
+            number: (
+                saved[number]
+                if number in saved and number not in self._written
+                else page[:]
+            )
+            for number, page in self._pages.items()
+        }
+        self._written = set()
+        return self._saved
+
+    def load_pages(self, pages: dict[int, Memory]) -> None:
+        """
+        Replaces the contents of memory with pages saved by save_pages.
+
+        When the pages are those of the last save or load, only the pages written since
+        are copied back; otherwise every saved page is.
+
+        Args:
+            pages (dict[int, Memory]): The page copies keyed by page number.
+        """
+        unchanged = self._written if pages is self._saved else None
+        for number in [number for number in self._pages if number not in pages]:
+            del self._pages[number]
+        for number, page in pages.items():
+            if unchanged is None or number in unchanged:
+                self._pages[number] = page[:]
+        self._saved = pages
+        self._written = set()
+
+    def sum(self, start: int, stop: int) -> int:
+        """
+        Returns the exact sum of the words in [start, stop).
+        """
+        total = 0
+        for number, low, high in self._resident_spans(start, stop):
+            offset = number * self.page_size
+            total += sum(memoryview(self._pages[number])[low - offset : high - offset])
+        return total
+
+    def _clear(self, start: int, stop: int) -> None:
+        """
+        Zeroes the words in [start, stop), releasing pages left all zero.
+        """
+        for number, low, high in self._resident_spans(start, stop):
+            offset = number * self.page_size
+            page = self._pages[number]
+            self._written.add(number)
+            if high - low < self.page_size:
+                page[low - offset : high - offset] = _repeat(
+                    0, high - low, self.typecode
+                )
+            if high - low == self.page_size or page.count(0) == self.page_size:
+                del self._pages[number]
+
+    def _page(self, number: int) -> Memory:
+        """
+        Returns a page for writing, allocating it if it is not resident.
+        """
+        self._written.add(number)
+        page = self._pages.get(number)
+        if page is None:
+            page = self._pages[number] = allocate_memory(self.page_size, self.typecode)
+        return page
+
+    def _address(self, key: int) -> int:
+        address = int(key)
+        if address < 0:
+            address += self.size
+        if not 0 <= address < self.size:
+            raise IndexError(f"index {key} is out of bounds for size {self.size}")
+        return address
+
+    def _range(self, key: slice) -> tuple[int, int]:
+        start, stop, step = key.indices(self.size)
+        if step != 1:
+            raise ValueError("PagedMemory only supports contiguous slices")
+        return start, max(start, stop)
+
+    def _spans(self, start: int, stop: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Splits [start, stop) at page boundaries into (page number, low, high) spans.
+        """
+        while start < stop:
+            number = start // self.page_size
+            high = min(stop, (number + 1) * self.page_size)
+            yield number, start, high
+            start = high
+
+    def _resident_spans(self, start: int, stop: int) -> list[tuple[int, int, int]]:
+        """
+        Returns the spans of [start, stop) that lie in resident pages, in order.
+
+        The page numbers in the range or the resident pages are scanned, whichever
+        are fewer, so a huge range over a few resident pages is cheap.
+        """
+        if start >= stop:
+            return []
+        first, last = start // self.page_size, (stop - 1) // self.page_size
+        if last - first < len(self._pages):
+            numbers = [n for n in range(first, last + 1) if n in self._pages]
+        else:
+            numbers = sorted(n for n in self._pages if first <= n <= last)
+        return [
+            (
+                number,
+                max(start, number * self.page_size),
+                min(stop, (number + 1) * self.page_size),
+            )
+            for number in numbers
+        ]
+
+
+AddressSpace = Union[Memory, memoryview, PagedMemory]
+
+
+def create_memory(size: int, typecode: str = WORD_TYPECODE) -> AddressSpace:
+    """
+    Creates zero-filled VM memory, paged if it is too large to allocate up front.
+
+    Args:
+        size (int): The number of words.
+        typecode (str): The array typecode of a word.
+
+    Returns:
+        AddressSpace: A dense array of up to MAX_DENSE_WORDS words, PagedMemory
+        beyond that.
+    """
+    if size > MAX_DENSE_WORDS:
+        return PagedMemory(size, typecode=typecode)
+    return allocate_memory(size, typecode)
+
+
+def word_view(
+    buffer: Union[bytes, bytearray, memoryview], typecode: str = WORD_TYPECODE
+) -> memoryview:
+    """
+    Views a writable buffer, e.g. the buf of a multiprocessing.shared_memory block, as
+    VM memory.
+
+    Args:
+        buffer (Union[bytes, bytearray, memoryview]): The buffer; its words are
+            stored in native byte order.
+        typecode (str): The array typecode of a word.
+
+    Returns:
+        memoryview: A zero-copy view of the buffer with one element per word.
+
+    Raises:
+        ConfigurationError: If the buffer is read-only or its size is not a whole
+            number of words.
+    """
+    view = memoryview(buffer).cast("B")
+    if view.readonly:
+        raise ConfigurationError("Memory buffer must be writable")
+    word_bytes = array(typecode).itemsize
+    if len(view) % word_bytes:
+        raise ConfigurationError(
+            f"Memory buffer size {len(view)} is not a multiple of {word_bytes} bytes"
+        )
+    return view.cast(typecode)
+
+
+def allocate_memory(size: int, typecode: str = WORD_TYPECODE) -> Memory:
+    """
+    Allocates zero-filled VM memory.
+
+    Args:
+        size (int): The number of words to allocate.
+        typecode (str): The array typecode of a word.
+
+    Returns:
+        Memory: A contiguous array of the given size.
+    """
+    return _repeat(0, size, typecode)
+
+
+def typecode_of(memory: AddressSpace) -> str:
+    """
+    Returns the array typecode of the words of memory.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+
+    Returns:
+        str: The typecode, e.g. WORD_TYPECODE for 64-bit words.
+    """
+    if isinstance(memory, memoryview):
+        return memory.format
+    return memory.typecode
+
+
+def check_range(memory: AddressSpace, start: int, stop: int) -> None:
+    """
+    Checks that the half-open range [start, stop) lies within memory.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The first address of the range.
+        stop (int): One past the last address of the range.
+
+    Raises:
+        MemoryAccessError: If the range is reversed or lies outside memory.
+    """
+    if not 0 <= start <= stop <= len(memory):
+        raise MemoryAccessError(
+            f"Memory range [{start}, {stop}) is outside of [0, {len(memory)})"
+        )
+
+
+def load_range(memory: AddressSpace, start: int, values: Sequence[int]) -> None:
+    """
+    Copies values into memory starting at the given address.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The address of the first word to write.
+        values (Sequence[int]): The words to write.
+
+    Raises:
+        MemoryAccessError: If the values do not fit in memory.
+        OverflowError: If a value does not fit in a word.
+    """
+    stop = start + len(values)
+    check_range(memory, start, stop)
+    memory[start:stop] = _words(values, typecode_of(memory))
+
+
+def dump_range(memory: AddressSpace, start: int, stop: int) -> Memory:
+    """
+    Copies a range of memory out of the VM.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The first address of the range.
+        stop (int): One past the last address of the range.
+
+    Returns:
+        Memory: A copy of memory[start:stop].
+
+    Raises:
+        MemoryAccessError: If the range is outside memory.
+    """
+    check_range(memory, start, stop)
+    return _copy(memory, start, stop)
+
+
+def view_range(
+    memory: AddressSpace, start: int, stop: int
+) -> Union[memoryview, Memory]:
+    """
+    Returns a zero-copy view of a range of memory.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The first address of the range.
+        stop (int): One past the last address of the range.
+
+    Returns:
+        Union[memoryview, Memory]: A view whose writes change memory; a copy for
+        PagedMemory, which has no contiguous buffer.
+    """
+    if isinstance(memory, PagedMemory):
+        return memory[start:stop]
+    return memoryview(memory)[start:stop]
+
+
+def fill_range(memory: AddressSpace, start: int, stop: int, value: int) -> None:
+    """
+    Sets every word in a range that has been checked against memory.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The first address of the range.
+        stop (int): One past the last address of the range.
+        value (int): The value to store.
+    """
+    if isinstance(memory, PagedMemory):
+        memory.fill(start, stop, value)
+    elif start < stop:
+        memory[start:stop] = _repeat(value, stop - start, typecode_of(memory))
+
+
+def copy_range(memory: AddressSpace, destination: int, source: int, count: int) -> None:
+    """
+    Copies count words between two ranges that have been checked against memory.
+
+    The ranges may overlap; the source is read completely before writing.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        destination (int): The first address to write.
+        source (int): The first address to read.
+        count (int): The number of words.
+    """
+    if isinstance(memory, PagedMemory):
+        memory.copy(destination, source, count)
+    else:
+        memory[destination : destination + count] = _copy(
+            memory, source, source + count
+        )
+
+
+def sum_range(memory: AddressSpace, start: int, stop: int) -> int:
+    """
+    Sums a range that has been checked against memory.
+
+    Args:
+        memory (AddressSpace): The VM memory.
+        start (int): The first address of the range.
+        stop (int): One past the last address of the range.
+
+    Returns:
+        int: The sum, exact or wrapped to a word; callers wrap it either way.
+    """
+    if isinstance(memory, PagedMemory):
+        return memory.sum(start, stop)
+    if stop - start >= VECTORIZED_SUM_WORDS:
+        numpy = _numpy()
+        if numpy is not None:
+            dtype = numpy.dtype(typecode_of(memory))
+            words = numpy.frombuffer(
+                memory, dtype=dtype, count=stop - start, offset=start * dtype.itemsize
+            )
+            # Narrow words are summed as int64 so the sum does not wrap at their width
+            return int(words.sum(dtype=numpy.int64))
+    return sum(memoryview(memory)[start:stop])
+
+
+def _copy(memory: AddressSpace, start: int, stop: int) -> Memory:
+    """
+    Copies a range of memory into a new array; slicing a word view would not copy.
+    """
+    if isinstance(memory, memoryview):
+        words = array(memory.format)
+        words.frombytes(memory[start:stop].cast("B"))
+        return words
+    return memory[start:stop]
+
+
+def _repeat(value: int, count: int, typecode: str) -> Memory:
+    return array(typecode, (value,)) * count
+
+
+def _words(values: Sequence[int], typecode: str) -> Memory:
+    """
+    Returns values as an array of words of the given typecode, copying if needed.
+    """
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def _numpy() -> Optional[ModuleType]:
+    """
+    Imports NumPy on first use, returning None when it is not installed.
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
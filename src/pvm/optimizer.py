@@ -0,0 +1,131 @@
+"""
+Implements a peephole optimizer for PhiVM programs.
+
+The optimizer folds arithmetic on constants into a single PUSH and fuses a PUSH with
+the arithmetic instruction consuming it into a PUSH_<OP> superinstruction, so fewer
+instructions are dispatched at run time.
+"""
+
+from typing import Optional
+
+from src.pvm.arithmetic import WORD_BITS, Operation, WordArithmetic, word_arithmetic
+from src.pvm.bytecode import CONTROL_INSTRUCTIONS
+from src.pvm.errors import DivisionByZeroError
+from src.pvm.instructions import Instruction
+from src.pvm.types import InstOperands, Program, ProgramList, Word
+
+
+def _binary_operations(arithmetic: WordArithmetic) -> dict[Instruction, Operation]:
+    return {
+        Instruction.ADD: arithmetic.add,
+        Instruction.SUB: arithmetic.sub,
+        Instruction.MUL: arithmetic.mul,
+        Instruction.DIV: arithmetic.div,
+    }
+
+
+# The operations of 64-bit words
+BINARY_OPERATIONS = _binary_operations(word_arithmetic(WORD_BITS))
+
+FUSED_INSTRUCTIONS: dict[Instruction, Instruction] = {
+    Instruction.ADD: Instruction.PUSH_ADD,
+    Instruction.SUB: Instruction.PUSH_SUB,
+    Instruction.MUL: Instruction.PUSH_MUL,
+    Instruction.DIV: Instruction.PUSH_DIV,
+}
+
+FUSED_OPERATIONS: dict[Instruction, Operation] = {
+    fused: BINARY_OPERATIONS[instruction]
+    for instruction, fused in FUSED_INSTRUCTIONS.items()
+}
+
+
+def optimize(program: Program, word_bits: int = WORD_BITS) -> ProgramList:
+    """
+    Folds constant arithmetic and fuses PUSH/arithmetic pairs in a program.
+
+    For every program that runs without a stack fault, the optimized program leaves
+    the same live stack (stack_start up to stack_pointer) and the same final
+    sign_flag and overflow_flag, and raises DivisionByZeroError in the same cases:
+    the last flag-setting instruction is never folded away, and divisions by a
+    constant zero are neither folded nor fused, so the VM raises with the stack
+    pointer where the unoptimized program leaves it. Folding lowers the peak stack depth,
+    so a program that overflowed the stack may no longer do so, and slots above the
+    final stack pointer are not written the same way.
+
+    Programs with control flow are returned unchanged, since removing instructions
+    would move jump targets.
+
+    Args:
+        program (Program): The program to optimize.
+        word_bits (int): The word width of the VM the program will run on, which
+            constants are folded at.
+
+    Returns:
+        ProgramList: The optimized program.
+    """
+    if any(instruction in CONTROL_INSTRUCTIONS for instruction, _ in program):
+        return [(instruction, list(operands)) for instruction, operands in program]
+
+    arithmetic = word_arithmetic(word_bits)
+    operations = _binary_operations(arithmetic)
+    last_flag_setter = -1
+    for index, (instruction, _) in enumerate(program):
+        if instruction in BINARY_OPERATIONS or instruction in FUSED_OPERATIONS:
+            last_flag_setter = index
+
+    optimized: ProgramList = []
+    for index, (instruction, operands) in enumerate(program):
+        foldable = index < last_flag_setter
+        if instruction in BINARY_OPERATIONS and _ends_with_push(optimized, 1):
+            constant = optimized[-1][1][0]
+            if foldable and _ends_with_push(optimized, 2):
+                folded = _fold(operations[instruction], optimized[-2], constant)
+                if folded is not None:
+                    optimized[-2:] = [folded]
+                    continue
+            # PUSH_DIV by zero would raise with the divisor not yet pushed
+            if instruction != Instruction.DIV or arithmetic.wrap(constant) != 0:
+                optimized[-1] = (FUSED_INSTRUCTIONS[instruction], [constant])
+                continue
+        if (
+            instruction in FUSED_OPERATIONS
+            and foldable
+            and _ends_with_push(optimized, 1)
+        ):
+            folded = _fold(
+                operations[_UNFUSED_INSTRUCTIONS[instruction]],
+                optimized[-1],
+                operands[0],
+            )
+            if folded is not None:
+                optimized[-1] = folded
+                continue
+        optimized.append((instruction, list(operands)))
+    return optimized
+
+
+_UNFUSED_INSTRUCTIONS = {fused: plain for plain, fused in FUSED_INSTRUCTIONS.items()}
+
+
+def _ends_with_push(program: Program, count: int) -> bool:
+    return len(program) >= count and all(
+        instruction == Instruction.PUSH for instruction, _ in program[-count:]
+    )
+
+
+def _fold(
+    operation: Operation, push: tuple[Instruction, InstOperands], constant: Word
+) -> Optional[tuple[Instruction, InstOperands]]:
+    """
+    Evaluates an operation on the constant of a PUSH and another constant.
+
+    Returns:
+        The PUSH of the result, or None if the operation raises and must be left for
+        the VM to execute.
+    """
+    try:
+        result, _, _ = operation(int(push[1][0]), int(constant))
+    except DivisionByZeroError:
+        return None
+    return Instruction.PUSH, [Word(result)]
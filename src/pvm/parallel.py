@@ -0,0 +1,112 @@
+"""
+Implements run_many, which executes many programs across a pool of worker processes.
+
+Each worker builds one PhiVM for the shared Configuration and resets it between
+programs. Programs are shipped to the workers in their compact bytecode form. By
+default the first program to fault aborts the batch; with raise_errors=False every
+program runs and reports its fault in its result instead.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, NamedTuple, Optional, Union
+
+from src.pvm.bytecode import Bytecode, compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.faults import RunStatus
+from src.pvm.types import Program
+from src.pvm.vm import PhiVM
+
+# The VM owned by the current worker process, created by _init_worker
+_worker_vm: Optional[PhiVM] = None
+
+
+class RunResult(NamedTuple):
+    """
+    The final state of one program run.
+
+    Attributes:
+        stack (list[int]): The live stack, bottom first.
+        sign_flag (int): The final sign flag.
+        overflow_flag (int): The final overflow flag.
+        status (Optional[RunStatus]): How the run ended, with raise_errors=False;
+            the stack and flags are then those at the fault.
+    """
+
+    stack: list[int]
+    sign_flag: int
+    overflow_flag: int
+    status: Optional[RunStatus] = None
+
+
+def run_many(
+    programs: Iterable[Union[Program, Bytecode]],
+    config: Configuration,
+    workers: Optional[int] = None,
+    raise_errors: bool = True,
+) -> list[RunResult]:
+    """
+    Runs programs on fresh VMs across a process pool.
+
+    Args:
+        programs (Iterable[Union[Program, Bytecode]]): The programs to run.
+        config (Configuration): The configuration every program runs under.
+        workers (Optional[int]): The number of worker processes; defaults to the
+            number of CPUs. With one worker the programs run in this process.
+        raise_errors (bool): Whether a faulting program raises its error; if False,
+            each result carries the RunStatus of its program instead.
+
+    Returns:
+        list[RunResult]: The result of each program, in submission order.
+
+    Raises:
+        Exception: The first error raised by a program, e.g. DivisionByZeroError,
+            unless raise_errors is False.
+    """
+    compiled = [
+        program if isinstance(program, Bytecode) else compile_program(program)
+        for program in programs
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(compiled) <= 1:
+        vm = PhiVM(config)
+        return [_execute(vm, program, raise_errors) for program in compiled]
+
+    # Several chunks per worker keep the pool balanced when run times vary
+    chunksize = max(1, len(compiled) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config,)
+    ) as executor:
+        return list(
+            executor.map(
+                partial(_run_program, raise_errors=raise_errors),
+                compiled,
+                chunksize=chunksize,
+            )
+        )
+
+
+def _init_worker(config: Configuration) -> None:
+    global _worker_vm  # pylint: disable=global-statement
+    _worker_vm = PhiVM(config)
+
+
+def _run_program(program: Bytecode, raise_errors: bool) -> RunResult:
+    assert _worker_vm is not None, "worker VM is created by the pool initializer"
+    return _execute(_worker_vm, program, raise_errors)
+
+
+def _execute(vm: PhiVM, program: Bytecode, raise_errors: bool) -> RunResult:
+    vm.reset()
+    status = None
+    if raise_errors:
+        vm.run(program)
+    else:
+        status = vm.run_status(program)
+    return RunResult(
+        vm.memory[vm.stack_start : vm.stack_pointer].tolist(),
+        vm.sign_flag,
+        vm.overflow_flag,
+        status,
+    )
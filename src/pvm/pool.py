@@ -0,0 +1,120 @@
+"""
+Implements a pool of reusable PhiVM instances.
+
+Constructing a PhiVM allocates its whole memory, which dominates the cost of running
+a short program on a fresh VM. A pool keeps released VMs per Configuration and hands
+them out again after a reset, which only clears the memory the VM actually touched.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.pvm.configuration import Configuration
+from src.pvm.types import Word
+from src.pvm.vm import PhiVM
+
+DEFAULT_MAX_IDLE = 16
+
+
+class VMPool:
+    """
+    A thread-safe pool of idle PhiVM instances, grouped by Configuration.
+    """
+
+    def __init__(self, max_idle: int = DEFAULT_MAX_IDLE) -> None:
+        """
+        Initializes an empty pool.
+
+        Args:
+            max_idle (int): The most idle VMs kept per configuration; VMs released
+                beyond that are dropped.
+        """
+        self.max_idle = max_idle
+        self._idle: dict[Configuration, list[PhiVM]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, config: Configuration) -> PhiVM:
+        """
+        Takes a VM in its initial state out of the pool, creating one if needed.
+
+        Args:
+            config (Configuration): The configuration of the VM.
+
+        Returns:
+            PhiVM: A VM with an empty stack, cleared flags and zeroed memory.
+        """
+        with self._lock:
+            idle = self._idle.get(config)
+            if idle:
+                return idle.pop()
+        return PhiVM(config)
+
+    def release(self, vm: PhiVM) -> None:
+        """
+        Resets a VM and returns it to the pool.
+
+        The VM must not be used by the caller afterwards.
+
+        Args:
+            vm (PhiVM): A VM obtained from acquire, or any other PhiVM.
+        """
+        vm.reset()
+        config = _configuration_of(vm)
+        with self._lock:
+            idle = self._idle.setdefault(config, [])
+            if len(idle) < self.max_idle:
+                idle.append(vm)
+
+    def prefill(self, config: Configuration, count: int) -> None:
+        """
+        Creates VMs ahead of time so that later acquires do not allocate.
+
+        Args:
+            config (Configuration): The configuration of the VMs.
+            count (int): The number of idle VMs to have, capped at max_idle.
+        """
+        with self._lock:
+            missing = min(count, self.max_idle) - len(self._idle.get(config, []))
+        for _ in range(missing):
+            self.release(PhiVM(config))
+
+    def idle(self, config: Configuration) -> int:
+        """
+        Returns the number of idle VMs held for a configuration.
+        """
+        with self._lock:
+            return len(self._idle.get(config, []))
+
+    def clear(self) -> None:
+        """
+        Drops all idle VMs.
+        """
+        with self._lock:
+            self._idle.clear()
+
+    @contextmanager
+    def vm(self, config: Configuration) -> Iterator[PhiVM]:
+        """
+        Acquires a VM for the duration of a with block and releases it afterwards.
+
+        Args:
+            config (Configuration): The configuration of the VM.
+
+        Yields:
+            PhiVM: A VM in its initial state.
+        """
+        vm = self.acquire(config)
+        try:
+            yield vm
+        finally:
+            self.release(vm)
+
+
+def _configuration_of(vm: PhiVM) -> Configuration:
+    return Configuration(
+        memory_size=Word(len(vm.memory)),
+        stack_start=vm.stack_start,
+        stack_size=vm.stack_size,
+        word_bits=vm.word_bits,
+    )
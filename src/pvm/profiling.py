@@ -0,0 +1,119 @@
+"""
+Defines the Profile collected by PhiVM.run_profiled.
+
+A profile records, per instruction, how often it ran, the time spent in its handler
+and how often it left the overflow flag set, together with the deepest stack reached.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+from src.pvm.instructions import Instruction
+
+# Called after every instruction with its index, the instruction, its immediate and
+# the VM executing it
+TraceCallback = Callable[[int, Instruction, int, Any], None]
+
+
+class OpcodeStats:
+    """
+    Execution statistics of one instruction.
+    """
+
+    def __init__(self, count: int = 0, time_ns: int = 0, overflows: int = 0) -> None:
+        """
+        Initializes the statistics.
+
+        Args:
+            count (int): The number of times the instruction ran.
+            time_ns (int): The cumulative time spent in its handler, in nanoseconds.
+            overflows (int): The number of times it set the overflow flag.
+        """
+        self.count = count
+        self.time_ns = time_ns
+        self.overflows = overflows
+
+    def to_dict(self) -> dict[str, int]:
+        """
+        Returns the statistics as a plain dictionary.
+        """
+        return {
+            "count": self.count,
+            "time_ns": self.time_ns,
+            "overflows": self.overflows,
+        }
+
+
+class Profile:
+    """
+    Instruction-level profile of one or more program runs.
+    """
+
+    def __init__(self) -> None:
+        self.opcodes: dict[Instruction, OpcodeStats] = {}
+        self.max_stack_depth = 0
+
+    @property
+    def instructions(self) -> int:
+        """
+        The total number of instructions executed.
+        """
+        return sum(stats.count for stats in self.opcodes.values())
+
+    @property
+    def time_ns(self) -> int:
+        """
+        The total time spent in instruction handlers, in nanoseconds.
+        """
+        return sum(stats.time_ns for stats in self.opcodes.values())
+
+    def record(
+        self, instruction: Instruction, count: int, time_ns: int, overflows: int
+    ) -> None:
+        """
+        Adds statistics for an instruction.
+
+        Args:
+            instruction (Instruction): The instruction.
+            count (int): The number of additional executions.
+            time_ns (int): The additional handler time, in nanoseconds.
+            overflows (int): The additional overflow flag hits.
+        """
+        stats = self.opcodes.setdefault(instruction, OpcodeStats())
+        stats.count += count
+        stats.time_ns += time_ns
+        stats.overflows += overflows
+
+    def merge(self, other: "Profile") -> None:
+        """
+        Accumulates another profile into this one, e.g. to aggregate many programs.
+
+        Args:
+            other (Profile): The profile to add.
+        """
+        for instruction, stats in other.opcodes.items():
+            self.record(instruction, stats.count, stats.time_ns, stats.overflows)
+        self.max_stack_depth = max(self.max_stack_depth, other.max_stack_depth)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the profile as a JSON-serializable dictionary.
+        """
+        return {
+            "instructions": self.instructions,
+            "time_ns": self.time_ns,
+            "max_stack_depth": self.max_stack_depth,
+            "opcodes": {
+                instruction.value: stats.to_dict()
+                for instruction, stats in self.opcodes.items()
+            },
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        Returns the profile serialized as JSON.
+
+        Args:
+            indent (Optional[int]): The indentation passed to json.dumps.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
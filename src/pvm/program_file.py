@@ -0,0 +1,250 @@
+"""
+Implements the binary program file format and its memory-mapped loader.
+
+A program file stores a corpus of programs in bytecode form:
+
+    header      32 bytes: magic b"PHVM", version (u16), flags (u16),
+                program count (u64), instruction count (u64), CRC-32 of the
+                body (u32), reserved (u32)
+    immediates  int64[instruction count]
+    opcodes     uint8[instruction count], zero-padded to a multiple of 8 bytes
+    offsets     int64[program count + 1], index of each program's first instruction
+    kinds       uint8[program count], PROGRAM_CONTROL_FLOW if the program contains
+                control flow instructions
+
+All integers are little-endian. The per-instruction sections come first so that the
+writer can stream the immediates of each program to the file as it goes and write
+the header last. The loader maps the file and hands out Bytecode whose arrays are
+memoryviews over the mapping, so loading creates no per-instruction objects and
+copies nothing.
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from src.pvm.bytecode import Bytecode, check_opcodes, compile_program
+from src.pvm.errors import ProgramFormatError
+from src.pvm.types import Program
+
+MAGIC = b"PHVM"
+VERSION = 2
+FLAG_CHECKSUM = 0x1
+PROGRAM_CONTROL_FLOW = 0x1
+
+_HEADER = struct.Struct("<4sHHQQII")
+
+
+def save_programs(
+    path: str, programs: Iterable[Union[Program, Bytecode]], checksum: bool = True
+) -> None:
+    """
+    Writes programs to a program file.
+
+    The immediates of each program are written as soon as it is compiled; only the
+    opcodes, one byte per instruction, and the index are held until the end.
+
+    Args:
+        path (str): The file to write.
+        programs (Iterable[Union[Program, Bytecode]]): The programs to store.
+        checksum (bool): Whether to store a CRC-32 of the body for load-time checks.
+
+    Raises:
+        InvalidInstructionError: If a program contains an invalid instruction.
+    """
+    offsets = array("q", [0])
+    opcodes = array("B")
+    kinds = array("B")
+    crc = 0
+
+    def write(section: array) -> None:
+        nonlocal crc
+        if sys.byteorder != "little" and section.itemsize > 1:
+            section.byteswap()
+        if checksum:
+            crc = zlib.crc32(section, crc)
+        file.write(section)
+
+    with open(path, "wb") as file:
+        file.write(bytes(_HEADER.size))
+        for program in programs:
+            if not isinstance(program, Bytecode):
+                program = compile_program(program)
+            write(array("q", program.immediates))
+            opcodes.extend(program.opcodes)
+            offsets.append(len(opcodes))
+            kinds.append(PROGRAM_CONTROL_FLOW if program.has_control_flow else 0)
+        write(opcodes)
+        write(array("B", bytes(_padding(len(opcodes)))))
+        write(offsets)
+        write(kinds)
+        file.seek(0)
+        file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                FLAG_CHECKSUM if checksum else 0,
+                len(kinds),
+                len(opcodes),
+                crc,
+                0,
+            )
+        )
+
+
+class ProgramCorpus:
+    """
+    A read-only, memory-mapped program file.
+
+    Indexing the corpus returns the i-th program as Bytecode viewing the mapping.
+    Closing the corpus, e.g. at the end of a with block, ends indexing it; Bytecode
+    taken from it stays valid, and the file is unmapped once none of it is referenced
+    any more.
+    """
+
+    def __init__(self, path: str, verify_checksum: bool = True) -> None:
+        """
+        Maps a program file.
+
+        Args:
+            path (str): The file to load.
+            verify_checksum (bool): Whether to check the stored CRC-32, which reads
+                the whole file once.
+
+        Raises:
+            ProgramFormatError: If the file is not a valid program file.
+            InvalidInstructionError: If the file contains an unknown opcode.
+        """
+        if sys.byteorder != "little":
+            raise ProgramFormatError(
+                "Program files can only be mapped on little-endian hosts"
+            )
+        with open(path, "rb") as file:
+            self._mmap: Optional[mmap.mmap] = _map(file)
+        try:
+            with memoryview(self._mmap) as buffer:
+                count, instructions, body_start = _read_header(buffer, verify_checksum)
+                opcodes_start = body_start + 8 * instructions
+                offsets_start = opcodes_start + instructions + _padding(instructions)
+                kinds_start = offsets_start + 8 * (count + 1)
+                self._immediates = buffer[body_start:opcodes_start].cast("q")
+                self._opcodes = buffer[opcodes_start : opcodes_start + instructions]
+                self._offsets = buffer[offsets_start:kinds_start].cast("q")
+                self._kinds = buffer[kinds_start : kinds_start + count]
+            check_opcodes(self._opcodes)
+        except Exception:
+            self._release()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Bytecode:
+        if not -len(self) <= index < len(self):
+            raise IndexError("program index out of range")
+        index %= len(self)
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        if not 0 <= start <= stop <= len(self._opcodes):
+            raise ProgramFormatError(f"Program {index} has invalid offsets")
+        return Bytecode(
+            self._opcodes[start:stop],
+            self._immediates[start:stop],
+            validate=False,
+            has_control_flow=bool(self._kinds[index] & PROGRAM_CONTROL_FLOW),
+        )
+
+    def __iter__(self) -> Iterator[Bytecode]:
+        return (self[index] for index in range(len(self)))
+
+    def __enter__(self) -> "ProgramCorpus":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the corpus has been closed.
+        """
+        return self._mmap is None
+
+    def close(self) -> None:
+        """
+        Closes the corpus, unmapping the file unless Bytecode from it is still
+        referenced; the mapping is then released with the last of them.
+        """
+        if self._mmap is not None:
+            self._release()
+
+    def _release(self) -> None:
+        assert self._mmap is not None
+        for view in ("_offsets", "_immediates", "_opcodes", "_kinds"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views handed out hold their own reference to the mapping, which is
+            # unmapped when the last of them is garbage collected
+            pass
+        self._mmap = None
+
+
+def load_programs(path: str, verify_checksum: bool = True) -> ProgramCorpus:
+    """
+    Maps a program file for zero-copy access.
+
+    Args:
+        path (str): The file to load.
+        verify_checksum (bool): Whether to check the stored CRC-32.
+
+    Returns:
+        ProgramCorpus: The mapped programs.
+
+    Raises:
+        ProgramFormatError: If the file is not a valid program file.
+    """
+    return ProgramCorpus(path, verify_checksum)
+
+
+def _map(file: BinaryIO) -> mmap.mmap:
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError as error:
+        # Empty files cannot be mapped
+        raise ProgramFormatError("Program file is empty") from error
+
+
+def _read_header(buffer: memoryview, verify_checksum: bool) -> tuple[int, int, int]:
+    """
+    Parses and validates the header of a mapped program file.
+
+    Returns:
+        tuple[int, int, int]: The program count, the instruction count and the
+        offset of the body.
+    """
+    if len(buffer) < _HEADER.size:
+        raise ProgramFormatError("Program file is truncated")
+    magic, version, flags, count, instructions, crc, _ = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ProgramFormatError("Not a PhiVM program file")
+    if version != VERSION:
+        raise ProgramFormatError(f"Unsupported program file version {version}")
+    body_size = 9 * instructions + _padding(instructions) + 8 * (count + 1) + count
+    if len(buffer) != _HEADER.size + body_size:
+        raise ProgramFormatError("Program file size does not match its header")
+    if verify_checksum and flags & FLAG_CHECKSUM:
+        if zlib.crc32(buffer[_HEADER.size :]) != crc:
+            raise ProgramFormatError("Program file checksum mismatch")
+    return count, instructions, _HEADER.size
+
+
+def _padding(instructions: int) -> int:
+    """
+    Returns the number of zero bytes padding the opcode section to a multiple of 8.
+    """
+    return -instructions % 8
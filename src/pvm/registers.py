@@ -0,0 +1,203 @@
+"""
+Translates straight-line PhiVM programs into a register IR and interprets it.
+
+translate() symbolically executes a stack program once and emits one three-address
+instruction per arithmetic instruction, reading two virtual registers and writing a
+fresh one. PUSH emits nothing: its immediate becomes a constant register, as does the
+immediate of a fused PUSH_<OP>, and the caller's stack slots the program reads are
+loaded into registers on entry. The stack traffic of the original program disappears:
+the interpreter keeps every value in a local register file and touches memory only to
+load those inputs and, at the end, to spill the last value written to each stack slot,
+which is all a run leaves behind in memory. Translated programs are cached.
+
+The register file is only spilled once the whole program has run. A program whose
+stack bounds do not fit, or which divides by zero, is handed to PhiVM.run instead, as
+is every program on a VM with words narrower than the 64 bits the IR computes with.
+"""
+
+from typing import NamedTuple, Union
+
+from src.pvm.arithmetic import WORD_BITS, Operation
+from src.pvm.bytecode import INSTRUCTIONS, Bytecode, compile_program
+from src.pvm.errors import DivisionByZeroError, InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.optimizer import BINARY_OPERATIONS, FUSED_OPERATIONS
+from src.pvm.translation import ProgramCache, SymbolicStack
+from src.pvm.types import Program
+from src.pvm.vm import PhiVM
+
+
+class RegisterInstruction(NamedTuple):
+    """
+    A three-address instruction: destination = operation(source1, source2).
+
+    Attributes:
+        operation (Operation): The arithmetic operation, which also yields the flags.
+        destination (int): The register written.
+        source1 (int): The register holding the first operand.
+        source2 (int): The register holding the second operand.
+    """
+
+    operation: Operation
+    destination: int
+    source1: int
+    source2: int
+
+
+class RegisterProgram:  # pylint: disable=too-many-instance-attributes
+    """
+    A straight-line program translated into register IR.
+
+    Stack slots are numbered relative to the stack pointer on entry: slot -1 is the
+    top of the caller's stack, slot 0 the first one the program pushes. Calling it
+    with a VM has the same effect as vm.run(program), including setting vm.executed
+    to the number of instructions run.
+    """
+
+    def __init__(self, bytecode: Bytecode) -> None:
+        """
+        Translates a program.
+
+        Args:
+            bytecode (Bytecode): The program to translate.
+
+        Raises:
+            InvalidInstructionError: If the program contains an invalid instruction or
+            one that is not arithmetic or PUSH.
+        """
+        translator = _Translator()
+        for opcode, immediate in zip(bytecode.opcodes, bytecode.immediates):
+            translator.translate(INSTRUCTIONS[opcode], int(immediate))
+        stack = translator.stack
+        self.bytecode = bytecode
+        # The initial register file: the constants, and zero for every other register
+        self.registers = tuple(translator.registers)
+        # (register, slot) of every caller slot read
+        self.inputs = tuple(translator.inputs)
+        self.instructions = tuple(translator.instructions)
+        # (slot, register) of the last value written to every slot
+        self.outputs = tuple(sorted(stack.written.items()))
+        self.required = stack.loaded
+        self.peak = stack.peak
+        self.depth = stack.depth()
+
+    def __call__(self, vm: PhiVM) -> None:
+        if vm.word_bits != WORD_BITS or not self._run(vm):
+            vm.run(self.bytecode)
+        else:
+            vm.executed = len(self.bytecode)
+
+    def _run(self, vm: PhiVM) -> bool:
+        """
+        Runs the program on the register file, leaving the VM untouched on a fault.
+
+        Returns:
+            bool: False if the stack bounds do not fit or a division by zero occurred,
+            in which case the interpreter has to run the program instead.
+        """
+        memory = vm.memory
+        base = int(vm.stack_pointer)
+        depth = base - int(vm.stack_start)
+        if depth < self.required or depth + self.peak > vm.stack_size:
+            return False
+        registers = list(self.registers)
+        for register, slot in self.inputs:
+            registers[register] = memory[base + slot]
+        sign = overflow = 0
+        try:
+            for operation, destination, source1, source2 in self.instructions:
+                registers[destination], sign, overflow = operation(
+                    registers[source1], registers[source2]
+                )
+        except DivisionByZeroError:
+            return False
+        for slot, register in self.outputs:
+            memory[base + slot] = registers[register]
+        vm.mark_stack_written(base + self.peak)
+        vm.stack_pointer = base + self.depth
+        if self.instructions:
+            vm.sign_flag = sign
+            vm.overflow_flag = overflow
+        return True
+
+
+def translate(program: Union[Program, Bytecode]) -> RegisterProgram:
+    """
+    Translates a straight-line program into register IR, reusing cached ones.
+
+    Args:
+        program (Union[Program, Bytecode]): The program to translate.
+
+    Returns:
+        RegisterProgram: The translated program.
+
+    Raises:
+        InvalidInstructionError: If the program contains an invalid instruction or
+        one that is not arithmetic or PUSH.
+    """
+    if not isinstance(program, Bytecode):
+        program = compile_program(program)
+    return _cache.get(program)
+
+
+def clear_cache() -> None:
+    """
+    Drops every cached translated program.
+    """
+    _cache.clear()
+
+
+_cache = ProgramCache(RegisterProgram)
+
+
+class _Translator:
+    """
+    Symbolically executes a program, tracking the register held in each stack slot.
+    """
+
+    def __init__(self) -> None:
+        self.instructions: list[RegisterInstruction] = []
+        self.inputs: list[tuple[int, int]] = []  # one per caller slot read
+        self.registers: list[int] = []  # the initial value of every register
+        self.constants: dict[int, int] = {}
+        self.stack: SymbolicStack[int] = SymbolicStack(self._load)
+
+    def allocate(self, value: int = 0) -> int:
+        """Returns a fresh register holding value on entry."""
+        self.registers.append(value)
+        return len(self.registers) - 1
+
+    def constant(self, value: int) -> int:
+        """Returns the register holding a constant, sharing it between uses."""
+        register = self.constants.get(value)
+        if register is None:
+            register = self.constants[value] = self.allocate(value)
+        return register
+
+    def _load(self, slot: int) -> int:
+        """Returns a fresh register loaded from a caller slot on entry."""
+        register = self.allocate()
+        self.inputs.append((register, slot))
+        return register
+
+    def translate(self, instruction: Instruction, immediate: int) -> None:
+        """Translates one instruction."""
+        if instruction == Instruction.PUSH:
+            self.stack.push(self.constant(immediate))
+            return
+        if instruction in FUSED_OPERATIONS:
+            operation = FUSED_OPERATIONS[instruction]
+            source2 = self.constant(immediate)
+        elif instruction in BINARY_OPERATIONS:
+            operation = BINARY_OPERATIONS[instruction]
+            source2 = self.stack.pop()
+        else:
+            raise InvalidInstructionError(
+                f"{instruction.value} cannot be translated to register IR"
+            )
+        source1 = self.stack.pop()
+        destination = self.allocate()
+        self.instructions.append(
+            RegisterInstruction(operation, destination, source1, source2)
+        )
+        self.stack.push(destination)
@@ -0,0 +1,385 @@
+"""
+Implements an asyncio execution service for PhiVM and a JSON-lines server around it.
+
+Requests for the same Configuration that arrive while earlier ones are waiting are
+coalesced into one batch, which a worker task runs on a single pooled VM. Programs run
+through a ProgramRunner that yields to the event loop every yield_every instructions,
+so a long program, loops included, cannot starve the connections and workers sharing
+the loop, and a program running more than max_instructions instructions fails with
+InstructionLimitError, so one that never ends does not hold its worker forever.
+
+The workers are tasks on one event loop, not processes: they interleave the batches
+fairly but execute one instruction at a time between them. The service therefore
+bounds latency, not throughput; to use several cores, run several servers or batch
+the programs through src.pvm.parallel.
+
+The wire protocol exchanges one JSON object per line. A request looks like
+
+    {"id": 1, "config": {"memory_size": 256, "stack_start": 128, "stack_size": 64},
+     "program": [["PUSH", 6], ["PUSH", 7], ["MUL"]]}
+
+where config may also set word_bits, and its response like
+
+    {"id": 1, "top": 42, "sign_flag": 0, "overflow_flag": 0}
+
+or, if the program failed, {"id": 1, "error": "DivisionByZeroError", "message": ...}.
+Usage:
+
+    python -m src.pvm.server --port 7007
+    python -m src.pvm.server --unix /tmp/phivm.sock
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, NamedTuple, Optional
+
+from src.pvm.arithmetic import WORD_BITS
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    ConfigurationError,
+    DivisionByZeroError,
+    InstructionLimitError,
+    InvalidInstructionError,
+    MemoryAccessError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.pool import VMPool
+from src.pvm.stream import ProgramRunner
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+DEFAULT_WORKERS = 4
+DEFAULT_YIELD_EVERY = 1000
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_INSTRUCTIONS = 10_000_000
+
+# Errors reported to clients by class name instead of failing the request handler
+REPORTED_ERRORS = (
+    ConfigurationError,
+    DivisionByZeroError,
+    InstructionLimitError,
+    InvalidInstructionError,
+    MemoryAccessError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+
+
+class ExecutionResult(NamedTuple):
+    """
+    The outcome of one program run by the service.
+
+    Attributes:
+        top (Optional[int]): The final top of the stack; None if the stack is empty
+            or the program failed.
+        sign_flag (int): The final sign flag.
+        overflow_flag (int): The final overflow flag.
+        error (Optional[str]): The class name of the error the program raised.
+        message (str): The error message.
+    """
+
+    top: Optional[int]
+    sign_flag: int
+    overflow_flag: int
+    error: Optional[str] = None
+    message: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the result as sent over the wire.
+        """
+        if self.error is not None:
+            return {"error": self.error, "message": self.message}
+        return {
+            "top": self.top,
+            "sign_flag": self.sign_flag,
+            "overflow_flag": self.overflow_flag,
+        }
+
+
+def _failure(error: Exception) -> ExecutionResult:
+    return ExecutionResult(None, 0, 0, type(error).__name__, str(error))
+
+
+class ExecutionService:  # pylint: disable=too-many-instance-attributes
+    """
+    Runs programs on pooled VMs from worker tasks on the running event loop.
+
+    Use it as an async context manager, or call start() and close(). The workers
+    share the loop's thread; see the module docstring.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        workers: int = DEFAULT_WORKERS,
+        yield_every: int = DEFAULT_YIELD_EVERY,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        pool: Optional[VMPool] = None,
+        max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+    ) -> None:
+        """
+        Initializes the service.
+
+        Args:
+            workers (int): The number of batches executed concurrently, interleaved
+                on the event loop.
+            yield_every (int): The instructions run between yields to the event loop.
+            max_batch (int): The most requests run as one batch.
+            pool (Optional[VMPool]): The pool VMs are taken from; a private one is
+                created by default.
+            max_instructions (int): The most instructions one program may run.
+        """
+        self.workers = workers
+        self.yield_every = yield_every
+        self.max_batch = max_batch
+        self.max_instructions = max_instructions
+        self.pool = pool or VMPool(max_idle=workers)
+        self._pending: dict[
+            Configuration, list[tuple[Program, "asyncio.Future[ExecutionResult]"]]
+        ] = {}
+        self._ready: "asyncio.Queue[Configuration]" = asyncio.Queue()
+        self._tasks: list["asyncio.Task[None]"] = []
+
+    async def __aenter__(self) -> "ExecutionService":
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """
+        Starts the worker tasks on the running event loop.
+        """
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+    async def close(self) -> None:
+        """
+        Stops the worker tasks; requests still waiting are cancelled.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for batch in self._pending.values():
+            for _, future in batch:
+                future.cancel()
+        self._pending.clear()
+
+    async def execute(self, config: Configuration, program: Program) -> ExecutionResult:
+        """
+        Runs a program on a fresh VM.
+
+        Args:
+            config (Configuration): The configuration of the VM.
+            program (Program): The program to run.
+
+        Returns:
+            ExecutionResult: The final stack top and flags, or the error raised.
+
+        Raises:
+            Exception: Any error other than REPORTED_ERRORS the program raised; the
+                other programs of its batch still run.
+        """
+        future: "asyncio.Future[ExecutionResult]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        batch = self._pending.get(config)
+        if batch is None:
+            batch = self._pending[config] = []
+            self._ready.put_nowait(config)
+        batch.append((program, future))
+        return await future
+
+    async def _work(self) -> None:
+        while True:
+            config = await self._ready.get()
+            batch = self._pending.pop(config)
+            if len(batch) > self.max_batch:
+                self._pending[config] = batch[self.max_batch :]
+                self._ready.put_nowait(config)
+                batch = batch[: self.max_batch]
+            vm = self.pool.acquire(config)
+            try:
+                for program, future in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = await self._run(vm, program)
+                    except Exception as error:  # pylint: disable=broad-except
+                        if not future.done():
+                            future.set_exception(error)
+                        continue
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self.pool.release(vm)
+
+    async def _run(self, vm: PhiVM, program: Program) -> ExecutionResult:
+        vm.reset()
+        try:
+            runner = ProgramRunner(vm, program)
+            while not runner.done:
+                budget = self.max_instructions - runner.executed
+                if budget <= 0:
+                    raise InstructionLimitError(
+                        f"Program exceeded {self.max_instructions} instructions"
+                    )
+                runner.run(min(self.yield_every, budget))
+                await asyncio.sleep(0)
+        except REPORTED_ERRORS as error:
+            return _failure(error)
+        top = None
+        if vm.stack_pointer > vm.stack_start:
+            top = vm.memory[vm.stack_pointer - 1]
+        return ExecutionResult(top, vm.sign_flag, vm.overflow_flag)
+
+
+def parse_request(request: Any) -> tuple[Configuration, Program]:
+    """
+    Decodes one request.
+
+    Args:
+        request (Any): The decoded JSON request, an object with config and program
+            members.
+
+    Returns:
+        tuple[Configuration, Program]: The configuration and the program.
+
+    Raises:
+        ValueError: If the request is malformed.
+        ConfigurationError: If the configuration is invalid.
+        InvalidInstructionError: If the program names an unknown instruction.
+    """
+    try:
+        config = request["config"]
+        configuration = Configuration(
+            memory_size=Word(config["memory_size"]),
+            stack_start=Word(config["stack_start"]),
+            stack_size=Word(config["stack_size"]),
+            word_bits=int(config.get("word_bits", WORD_BITS)),
+        )
+        program: ProgramList = []
+        for name, *operands in request["program"]:
+            program.append((_instruction(name), [Word(value) for value in operands]))
+        return configuration, program
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"Malformed request: {error!r}") from error
+
+
+def _instruction(name: str) -> Instruction:
+    try:
+        return Instruction(name)
+    except ValueError as error:
+        raise InvalidInstructionError(f"Unknown instruction {name!r}") from error
+
+
+async def _respond(
+    service: ExecutionService,
+    line: bytes,
+    writer: asyncio.StreamWriter,
+    lock: asyncio.Lock,
+) -> None:
+    request_id = None
+    try:
+        request = json.loads(line)
+        if isinstance(request, dict):
+            request_id = request.get("id")
+        config, program = parse_request(request)
+        response = (await service.execute(config, program)).to_dict()
+    except Exception as error:  # pylint: disable=broad-except
+        # Reported like the expected errors, so that one bad request cannot end
+        # the connection and lose the responses of the others
+        response = _failure(error).to_dict()
+    response["id"] = request_id
+    async with lock:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+
+async def handle_connection(
+    service: ExecutionService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """
+    Serves the requests of one client; responses are sent as results complete.
+
+    Args:
+        service (ExecutionService): The service running the programs.
+        reader (asyncio.StreamReader): The client's request stream.
+        writer (asyncio.StreamWriter): The client's response stream.
+    """
+    lock = asyncio.Lock()
+    responses = []
+    try:
+        async for line in reader:
+            if line.strip():
+                responses.append(
+                    asyncio.create_task(_respond(service, line, writer, lock))
+                )
+        await asyncio.gather(*responses)
+    finally:
+        writer.close()
+
+
+async def serve(
+    service: ExecutionService,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    path: Optional[str] = None,
+) -> asyncio.Server:
+    """
+    Starts accepting connections for a running service.
+
+    Args:
+        service (ExecutionService): The service running the programs.
+        host (str): The TCP host to listen on.
+        port (int): The TCP port to listen on; 0 picks a free one.
+        path (Optional[str]): A Unix socket path to listen on instead of TCP.
+
+    Returns:
+        asyncio.Server: The listening server.
+    """
+
+    async def client(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await handle_connection(service, reader, writer)
+
+    if path is not None:
+        return await asyncio.start_unix_server(client, path)
+    return await asyncio.start_server(client, host, port)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    async with ExecutionService(args.workers, args.yield_every) as service:
+        server = await serve(service, args.host, args.port, args.unix)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs the server from the command line until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="PhiVM JSON-lines execution server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7007)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--yield-every", type=int, default=DEFAULT_YIELD_EVERY)
+    try:
+        asyncio.run(_main(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Implements VM memory in multiprocessing.shared_memory blocks.
+
+A coordinating process creates a SharedWords block, e.g. loading a large read-only
+data region into it once, and passes its name to worker processes. Each worker
+attaches to the block by name and runs a PhiVM over it. Every process then sees the
+same words without pickling or copying memory. VMs sharing a block need
+configurations with disjoint stack regions, and must not write to the same addresses
+concurrently; the VM does no locking.
+"""
+
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+from src.pvm.memory import WORD_TYPECODE, word_view
+
+
+class SharedWords:
+    """
+    A shared memory block viewed as VM memory.
+
+    The process that creates the block owns it: closing the owner's SharedWords also
+    unlinks the block, which other processes should have closed by then. Closing
+    fails with BufferError while views of the memory, e.g. from PhiVM.stack_view,
+    are still alive, and a VM over the memory must not be used afterwards.
+    """
+
+    def __init__(
+        self, size: int, name: Optional[str] = None, typecode: str = WORD_TYPECODE
+    ) -> None:
+        """
+        Creates a new all-zero block or attaches to an existing one.
+
+        Args:
+            size (int): The number of words.
+            name (Optional[str]): The name of the block to attach to; None creates
+                a new block.
+            typecode (str): The array typecode of a word, WORD_TYPECODES[word_bits]
+                for VMs configured with narrower words.
+        """
+        self.owner = name is None
+        nbytes = size * array(typecode).itemsize
+        if name is None:
+            self.block = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.block = shared_memory.SharedMemory(name=name)
+        # New blocks are zero-filled by the OS. The block may be larger than
+        # requested, rounded up to whole pages.
+        self.words = word_view(self.block.buf[:nbytes], typecode)
+
+    def __enter__(self) -> "SharedWords":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """
+        The name other processes attach to the block with.
+        """
+        return self.block.name
+
+    def close(self) -> None:
+        """
+        Detaches this process from the block, unlinking it if this process owns it.
+        """
+        self.words.release()
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
@@ -0,0 +1,157 @@
+"""
+Implements streaming execution of instruction iterators under an instruction budget.
+
+PhiVM.run needs the whole program up front. A StreamRunner instead pulls instructions
+one at a time from any iterable, e.g. a generator decoding them from a socket or file,
+so arbitrarily long streams run in constant memory. A ProgramRunner runs a whole
+program, control flow included, in the same slices. Each call of run executes at most
+a given number of instructions (its fuel) and can be followed by another call that
+resumes where the previous one stopped.
+"""
+
+from itertools import islice
+from typing import Iterable, Optional, Union
+
+from src.pvm.blocks import BlockCursor
+from src.pvm.bytecode import Bytecode, compile_program, encode_instruction
+from src.pvm.instructions import Instruction
+from src.pvm.types import InstOperands, Program
+from src.pvm.vm import PhiVM
+
+
+class StreamRunner:
+    """
+    Executes a stream of instructions on a VM in fuel-bounded slices.
+    """
+
+    def __init__(
+        self, vm: PhiVM, instructions: Iterable[tuple[Instruction, InstOperands]]
+    ) -> None:
+        """
+        Initializes the runner.
+
+        Args:
+            vm (PhiVM): The VM to execute the instructions on.
+            instructions (Iterable[tuple[Instruction, InstOperands]]): The stream;
+                it is consumed lazily and only once.
+        """
+        self.vm = vm
+        self.executed = 0
+        self.done = False
+        self._instructions = iter(instructions)
+
+    def run(self, fuel: Optional[int] = None) -> int:
+        """
+        Executes instructions until the stream ends or the fuel runs out.
+
+        The runner only learns that the stream has ended when it fails to pull an
+        instruction, so done may remain False after a call that used up its fuel
+        exactly on the last instruction; the next call then returns 0 and sets it.
+
+        Args:
+            fuel (Optional[int]): The most instructions to execute in this call;
+                None runs the stream to its end.
+
+        Returns:
+            int: The number of instructions executed by this call.
+
+        Raises:
+            ValueError: If fuel is negative.
+            InvalidInstructionError: If an instruction is not supported or has the
+                wrong number of operands.
+            StackOverflowError, StackUnderflowError, DivisionByZeroError: As raised by
+                the failing instruction, which is consumed but not counted; a later
+                call resumes after it.
+        """
+        if fuel is not None and fuel < 0:
+            raise ValueError("fuel must be a non-negative integer")
+        handlers = self.vm.handlers
+        executed = 0
+        try:
+            for instruction, operands in islice(self._instructions, fuel):
+                opcode, immediate = encode_instruction(instruction, operands)
+                handlers[opcode](immediate)
+                executed += 1
+        finally:
+            self.executed += executed
+        if fuel is None or executed < fuel:
+            self.done = True
+        return executed
+
+
+class ProgramRunner:
+    """
+    Executes a program, which may loop, on a VM in fuel-bounded slices.
+    """
+
+    def __init__(self, vm: PhiVM, program: Union[Program, Bytecode]) -> None:
+        """
+        Initializes the runner.
+
+        Args:
+            vm (PhiVM): The VM to execute the program on.
+            program (Union[Program, Bytecode]): The program.
+
+        Raises:
+            InvalidInstructionError: If the program contains an invalid instruction.
+        """
+        if not isinstance(program, Bytecode):
+            program = compile_program(program)
+        self.vm = vm
+        self.executed = 0
+        self._program = program
+        self._cursor = BlockCursor()
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the program has ended.
+        """
+        return self._cursor.done
+
+    def run(self, fuel: Optional[int] = None) -> int:
+        """
+        Executes instructions until the program ends or the fuel runs out.
+
+        Args:
+            fuel (Optional[int]): The most instructions to execute in this call;
+                None runs the program to its end.
+
+        Returns:
+            int: The number of instructions executed by this call.
+
+        Raises:
+            ValueError: If fuel is negative.
+            InvalidInstructionError: If a jump target lies outside the program.
+            StackOverflowError, StackUnderflowError, DivisionByZeroError,
+            MemoryAccessError: As raised by the failing instruction, which is
+                counted; the program cannot be resumed after it.
+        """
+        if fuel is not None and fuel < 0:
+            raise ValueError("fuel must be a non-negative integer")
+        try:
+            self.vm.resume(self._program, self._cursor, fuel)
+        finally:
+            self.executed += self.vm.executed
+        return self.vm.executed
+
+
+def run_stream(
+    vm: PhiVM,
+    instructions: Iterable[tuple[Instruction, InstOperands]],
+    fuel: Optional[int] = None,
+) -> int:
+    """
+    Executes a stream of instructions, stopping after at most fuel of them.
+
+    Passing the same iterator again continues after the last executed instruction.
+
+    Args:
+        vm (PhiVM): The VM to execute the instructions on.
+        instructions (Iterable[tuple[Instruction, InstOperands]]): The stream.
+        fuel (Optional[int]): The most instructions to execute; None for no limit.
+
+    Returns:
+        int: The number of instructions executed.
+    """
+    return StreamRunner(vm, instructions).run(fuel)
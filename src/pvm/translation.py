@@ -0,0 +1,120 @@
+"""
+Implements the pieces shared by the passes that translate bytecode into other forms.
+
+SymbolicStack tracks what each stack slot holds while a straight-line program is
+executed symbolically, as the Python and register backends do to replace the stack
+traffic with local values. ProgramCache keeps the result of such a translation, or of
+decoding a program into basic blocks, keyed by program digest, so that a program is
+translated once however often it runs.
+"""
+
+from typing import Callable, Generic, Optional, TypeVar
+
+from src.pvm.bytecode import Bytecode
+
+MAX_CACHED_PROGRAMS = 1024
+
+T = TypeVar("T")
+
+
+class SymbolicStack(Generic[T]):
+    """
+    The values held in the stack slots during a symbolic execution.
+
+    Slots are numbered relative to the stack pointer on entry: slot -1 is the top of
+    the caller's stack, slot 0 the first one the program pushes. Popping more values
+    than the program pushed reads the caller's slots through a load callback, in
+    order from the top down.
+    """
+
+    def __init__(self, load: Callable[[int], T]) -> None:
+        """
+        Initializes an empty stack.
+
+        Args:
+            load (Callable[[int], T]): Returns the value of a caller slot, given its
+                (negative) slot number, the first time the program reads it.
+        """
+        self.values: list[T] = []
+        # The last value written to every slot the program pushes to
+        self.written: dict[int, T] = {}
+        self.loaded = 0  # caller slots read so far
+        self.peak = 0  # highest relative depth reached
+        self._load = load
+
+    def depth(self) -> int:
+        """
+        Returns the current stack depth relative to the entry stack pointer.
+        """
+        return len(self.values) - self.loaded
+
+    def pop(self) -> T:
+        """
+        Pops a value, loading it from the caller's stack if the program has none.
+        """
+        if self.values:
+            return self.values.pop()
+        self.loaded += 1
+        return self._load(-self.loaded)
+
+    def push(self, value: T) -> None:
+        """
+        Pushes a value, recording it as the last write to its slot.
+        """
+        self.written[self.depth()] = value
+        self.values.append(value)
+        self.peak = max(self.peak, self.depth())
+
+
+class ProgramCache(Generic[T]):
+    """
+    A bounded cache of values built from programs, keyed by program digest.
+
+    Once it holds max_size values, the oldest one is dropped to make room.
+    """
+
+    def __init__(
+        self, build: Callable[[Bytecode], T], max_size: int = MAX_CACHED_PROGRAMS
+    ) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            build (Callable[[Bytecode], T]): Builds the value of a program missing
+                from the cache.
+            max_size (int): The most values kept.
+        """
+        self.max_size = max_size
+        self._build = build
+        self._values: dict[bytes, T] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, program: Bytecode) -> T:
+        """
+        Returns the value of a program, building and caching it on a miss.
+
+        Args:
+            program (Bytecode): The program.
+
+        Returns:
+            T: The cached or newly built value.
+
+        Raises:
+            Exception: Whatever build raises; nothing is cached then.
+        """
+        key = program.digest()
+        value: Optional[T] = self._values.get(key)
+        if value is None:
+            value = self._build(program)
+            if len(self._values) >= self.max_size:
+                del self._values[next(iter(self._values))]
+            self._values[key] = value
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops every cached value.
+        """
+        self._values.clear()
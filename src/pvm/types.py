@@ -1,13 +1,20 @@
 """
 Defines types used in PhiVM including Word, Program, InstOperands, and Memory.
-"""
 
+Words are plain Python ints holding signed values of the configured width, 64 bits
+by default; memory packs them into an array.array, so none of these types depends on
+NumPy.
+"""
 
-from numpy import int64
+from array import array
+from typing import Sequence
 
-# from src.pvm.instructions import Instruction
+from src.pvm.instructions import Instruction
 
-Word = int64
-InstOperands = list[Word]
-# Program = list[(Instruction, InstOperands)]
-Memory = list[Word]
+Word = int
+InstOperands = Sequence[Word]
+# Any sequence of instructions and their operands is accepted as a program; code that
+# builds one up by appending or concatenating uses the list form
+Program = Sequence[tuple[Instruction, InstOperands]]
+ProgramList = list[tuple[Instruction, InstOperands]]
+Memory = array
@@ -0,0 +1,130 @@
+"""
+Implements a static stack-depth verifier for straight-line PhiVM programs.
+
+Every instruction has a fixed stack effect, so the depth before each instruction of a
+straight-line program is known ahead of time. A program verified against a
+Configuration cannot overflow or underflow the stack, which lets PhiVM run it without
+per-instruction bounds checks.
+"""
+
+from typing import Union
+
+from src.pvm.bytecode import INSTRUCTIONS, Bytecode, compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    InvalidInstructionError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program
+
+# Elements an instruction needs on the stack, and its net effect on the depth
+STACK_EFFECTS: dict[Instruction, tuple[int, int]] = {
+    Instruction.PUSH: (0, 1),
+    Instruction.ADD: (2, -1),
+    Instruction.SUB: (2, -1),
+    Instruction.MUL: (2, -1),
+    Instruction.DIV: (2, -1),
+    Instruction.PUSH_ADD: (1, 0),
+    Instruction.PUSH_SUB: (1, 0),
+    Instruction.PUSH_MUL: (1, 0),
+    Instruction.PUSH_DIV: (1, 0),
+    Instruction.JMP: (0, 0),
+    Instruction.JZ: (1, -1),
+    Instruction.JNZ: (1, -1),
+    Instruction.JS: (0, 0),
+    Instruction.JNS: (0, 0),
+    Instruction.JO: (0, 0),
+    Instruction.JNO: (0, 0),
+    Instruction.CALL: (0, 0),
+    Instruction.RET: (0, 0),
+    Instruction.LOAD: (0, 1),
+    Instruction.STORE: (1, -1),
+    Instruction.MEMCPY: (3, -3),
+    Instruction.MEMSET: (3, -3),
+    Instruction.MEMSUM: (2, -1),
+}
+
+
+class VerifiedProgram:
+    """
+    A program whose stack depth has been checked against a stack size.
+
+    The bounds are relative to the stack depth on entry: the program needs at least
+    required elements on the stack and grows it by at most peak elements.
+    """
+
+    def __init__(self, bytecode: Bytecode, required: int, peak: int) -> None:
+        """
+        Initializes the verified program.
+
+        Args:
+            bytecode (Bytecode): The verified program.
+            required (int): The stack depth the program needs on entry.
+            peak (int): The highest depth reached, relative to the entry depth.
+        """
+        self.bytecode = bytecode
+        self.required = required
+        self.peak = peak
+
+    def fits(self, depth: int, stack_size: int) -> bool:
+        """
+        Checks whether the program stays within a stack when entered at a depth.
+
+        Args:
+            depth (int): The stack depth on entry.
+            stack_size (int): The size of the stack.
+
+        Returns:
+            bool: True if the program can run there without bounds checks.
+        """
+        return self.required <= depth and depth + self.peak <= stack_size
+
+
+def verify(
+    program: Union[Program, Bytecode], config: Configuration, entry_depth: int = 0
+) -> VerifiedProgram:
+    """
+    Verifies that a program never leaves the stack of a configuration.
+
+    Args:
+        program (Union[Program, Bytecode]): The program to verify.
+        config (Configuration): The configuration the program will run under.
+        entry_depth (int): The number of elements on the stack when the program
+            starts; 0 for a fresh VM.
+
+    Returns:
+        VerifiedProgram: The program with its stack bounds.
+
+    Raises:
+        StackUnderflowError: If an instruction would pop from an empty stack.
+        StackOverflowError: If an instruction would push onto a full stack.
+        InvalidInstructionError: If the program contains an invalid instruction or
+        control flow, whose stack depth is not fixed per instruction.
+    """
+    if not isinstance(program, Bytecode):
+        program = compile_program(program)
+    if program.has_control_flow:
+        raise InvalidInstructionError("Programs with control flow cannot be verified")
+    stack_size = int(config.stack_size)
+    effects = [STACK_EFFECTS[instruction] for instruction in INSTRUCTIONS]
+
+    depth = entry_depth
+    required = 0
+    peak = 0
+    for index, opcode in enumerate(program.opcodes):
+        needed, change = effects[opcode]
+        if depth < needed:
+            raise StackUnderflowError(
+                f"Not enough elements on the stack at instruction {index} "
+                f"({INSTRUCTIONS[opcode].value})"
+            )
+        required = max(required, needed - depth + entry_depth)
+        depth += change
+        if depth > stack_size:
+            raise StackOverflowError(
+                f"Stack overflow at instruction {index} ({INSTRUCTIONS[opcode].value})"
+            )
+        peak = max(peak, depth - entry_depth)
+    return VerifiedProgram(program, required, peak)
@@ -2,35 +2,167 @@
 Implements the PhiVM class for executing a stack-based virtual machine's instructions.
 """
 
-import numpy as np
-
+import sys
+import time
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from src.pvm.arithmetic import WORD_BITS, Operation, add, div, mul, sub, word_arithmetic
+from src.pvm.blocks import (
+    FALLTHROUGH,
+    MAX_CALL_DEPTH,
+    BasicBlock,
+    BlockCursor,
+    BlockProgram,
+    decode_blocks,
+)
+from src.pvm.bytecode import (
+    INSTRUCTIONS,
+    OPCODES,
+    Bytecode,
+    Handler,
+    build_dispatch_table,
+    compile_program,
+)
 from src.pvm.configuration import Configuration
 from src.pvm.errors import (
-    DivisionByZeroError,
+    ConfigurationError,
     InvalidInstructionError,
     StackOverflowError,
     StackUnderflowError,
 )
+from src.pvm.faults import FAULT_ERRORS, NO_INDEX, Fault, RunStatus, fault_of
 from src.pvm.instructions import Instruction
-from src.pvm.types import InstOperands, Memory, Word
+from src.pvm.memory import (
+    WORD_TYPECODES,
+    AddressSpace,
+    PagedMemory,
+    check_range,
+    copy_range,
+    create_memory,
+    dump_range,
+    fill_range,
+    load_range,
+    sum_range,
+    typecode_of,
+    view_range,
+)
+from src.pvm.profiling import Profile, TraceCallback
+from src.pvm.types import InstOperands, Memory, Program, Word
+from src.pvm.verifier import VerifiedProgram
+
+# The operation of each arithmetic opcode for the unchecked run loop of 64-bit VMs,
+# and whether its second operand is the immediate (PUSH_<OP>) rather than the top of
+# the stack.
+_OPERATIONS: dict[Instruction, tuple[Operation, bool]] = {
+    Instruction.ADD: (add, False),
+    Instruction.SUB: (sub, False),
+    Instruction.MUL: (mul, False),
+    Instruction.DIV: (div, False),
+    Instruction.PUSH_ADD: (add, True),
+    Instruction.PUSH_SUB: (sub, True),
+    Instruction.PUSH_MUL: (mul, True),
+    Instruction.PUSH_DIV: (div, True),
+}
+_UNCHECKED_OPERATIONS = tuple(
+    _OPERATIONS.get(instruction) for instruction in INSTRUCTIONS
+)
+
+_PUSH = OPCODES[Instruction.PUSH]
+_JMP = OPCODES[Instruction.JMP]
+_JZ = OPCODES[Instruction.JZ]
+_JNZ = OPCODES[Instruction.JNZ]
+_JS = OPCODES[Instruction.JS]
+_JNS = OPCODES[Instruction.JNS]
+_JO = OPCODES[Instruction.JO]
+_CALL = OPCODES[Instruction.CALL]
+_RET = OPCODES[Instruction.RET]
+
+
+class Snapshot:
+    """
+    A saved copy of the mutable state of a PhiVM.
+
+    Only the stack below its high-water mark and the dirty range are copied: the rest
+    of memory has not been written since the VM was reset. The stack copy includes
+    the slots above the stack pointer that instructions left behind, e.g. the
+    operands ADD popped, so a restore gives back exactly the memory of the VM. With
+    PagedMemory the resident pages are saved instead of the dirty range, so the cost
+    grows with the pages in use rather than with the span of addresses written.
+    """
+
+    def __init__(
+        self,
+        registers: tuple[int, int, int],
+        stack: Memory,
+        dirty: Union[tuple[int, Memory], dict[int, Memory]],
+    ) -> None:
+        """
+        Initializes the snapshot.
+
+        Args:
+            registers (tuple[int, int, int]): The saved stack pointer, sign flag and
+                overflow flag.
+            stack (Memory): A copy of the stack region up to its high-water mark.
+            dirty (Union[tuple[int, Memory], dict[int, Memory]]): The address of the
+                dirty range and a copy of it, or with PagedMemory the pages saved by
+                PagedMemory.save_pages.
+        """
+        self.registers = registers
+        self.stack = stack
+        self.dirty = dirty
 
 
-class PhiVM:
+class PhiVM:  # pylint: disable=too-many-instance-attributes
     """
     Represents a stack-based virtual machine.
 
     Manages the execution of instructions and maintains the state of the VM,
     including memory and stack.
+
+    Words are config.word_bits wide: memory packs them at that width, PUSH truncates
+    its immediate to it, and arithmetic wraps and sets the sign and overflow flags at
+    it.
+
+    Writes to memory made by load_memory and the memory instructions are tracked as a
+    dirty range, and writes to the stack region by a high-water mark, one past the
+    highest stack slot written. reset, snapshot and restore touch only the stack below
+    that mark and the dirty range. Memory outside both is left as the VM found it:
+    zero for memory the VM allocated, or e.g. a data region another process wrote
+    into a shared buffer. The stack region of memory the VM did not allocate counts
+    as written until the first reset clears it.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self, config: Configuration, memory: Optional[AddressSpace] = None
+    ) -> None:
         """
         Initializes the PhiVM with the given configuration.
 
         Args:
             config (Configuration): The configuration settings for the VM.
+            memory (Optional[AddressSpace]): The memory to use, e.g. a PagedMemory,
+                or a word_view of a shared buffer that other VMs or processes also
+                use; by default all-zero memory is allocated up front and only paged
+                when memory_size exceeds MAX_DENSE_WORDS.
+
+        Raises:
+            ConfigurationError: If the memory does not have memory_size words of
+                the configured width.
         """
-        self.memory: Memory = [Word(0)] * config.memory_size
+        typecode = WORD_TYPECODES[config.word_bits]
+        memory_given = memory is not None
+        if memory is None:
+            memory = create_memory(int(config.memory_size), typecode)
+        elif len(memory) != config.memory_size:
+            raise ConfigurationError("Memory size does not match the configuration")
+        elif typecode_of(memory) != typecode:
+            raise ConfigurationError(
+                "Memory word width does not match the configuration"
+            )
+        self.memory = memory
+        self.word_bits = config.word_bits
+        self._arithmetic = word_arithmetic(config.word_bits)
         self.stack_pointer: Word = config.stack_start
         self.stack_start: Word = config.stack_start
         self.stack_size: Word = config.stack_size
@@ -38,6 +170,23 @@ class PhiVM:
         self.sign_flag = 0  # 1 if result is negative
         self.overflow_flag = 0  # 1 if there's an arithmetic overflow
 
+        self._handlers = build_dispatch_table(self)
+        if self.word_bits != WORD_BITS:
+            # Immediates are 64-bit; PUSH on a narrower VM truncates them first
+            handlers = list(self._handlers)
+            handlers[_PUSH] = self._push_truncated
+            self._handlers = tuple(handlers)
+        # [start, stop) of the memory written outside the stack region
+        self._dirty = (0, 0)
+        # One past the highest stack slot that may be nonzero
+        self._stack_high = int(self.stack_start)
+        if memory_given:
+            self._stack_high += int(self.stack_size)
+        # The index of the instruction that raised in the last faulting run
+        self._fault_index = NO_INDEX
+        # The number of instructions the last run executed, a faulting one included
+        self.executed = 0
+
     def execute_instruction(
         self, instruction: Instruction, operands: InstOperands
     ) -> None:
@@ -51,80 +200,627 @@ class PhiVM:
         Raises:
             InvalidInstructionError: If the instruction is not supported.
         """
-        if instruction == Instruction.PUSH:
-            self._push(operands)
-        elif instruction == Instruction.ADD:
-            self._add()
-        elif instruction == Instruction.SUB:
-            self._sub()
-        elif instruction == Instruction.MUL:
-            self._mul()
-        elif instruction == Instruction.DIV:
-            self._div()
-        else:
+        opcode = OPCODES.get(instruction)
+        if opcode is None:
             raise InvalidInstructionError("Instruction not supported")
+        self._handlers[opcode](int(operands[0]) if operands else 0)
 
-    def run(self, program: list) -> None:
+    def run(self, program: Union[Program, Bytecode, VerifiedProgram]) -> None:
         """
         Runs a sequence of instructions (a program).
 
+        A program given as a list is compiled to bytecode first; callers running the
+        same program repeatedly should compile it once with compile_program and pass
+        the Bytecode instead. On a 64-bit VM, a VerifiedProgram that fits the current
+        stack depth runs without per-instruction bounds checks. Programs with control
+        flow run block by block; see _run_blocks. Afterwards, executed holds the number
+        of instructions the run executed, counting those in loops every time.
+
+        Args:
+            program (Union[Program, Bytecode, VerifiedProgram]): The program to run,
+                as a sequence of instructions and operands, in its pre-decoded form, or
+                verified against the stack bounds.
+        """
+        self.executed = 0
+        if isinstance(program, VerifiedProgram):
+            if self.word_bits == WORD_BITS and program.fits(
+                int(self.stack_pointer - self.stack_start), int(self.stack_size)
+            ):
+                self.mark_stack_written(int(self.stack_pointer) + program.peak)
+                self._run_unchecked(program.bytecode)
+                self.executed = len(program.bytecode)
+                return
+            program = program.bytecode
+        if not isinstance(program, Bytecode):
+            program = compile_program(program)
+        if program.has_control_flow:
+            self.executed = self._run_blocks(decode_blocks(program))
+            return
+        handlers = self._handlers
+        pairs = zip(program.opcodes, program.immediates)
+        try:
+            for opcode, immediate in pairs:
+                handlers[opcode](immediate)
+        except FAULT_ERRORS:
+            self._fault_index = len(program.opcodes) - 1 - _remaining(pairs)
+            self.executed = self._fault_index + 1
+            raise
+        self.executed = len(program.opcodes)
+
+    def resume(
+        self, program: Bytecode, cursor: BlockCursor, fuel: Optional[int] = None
+    ) -> int:
+        """
+        Runs at most fuel instructions of a program, continuing where cursor points.
+
+        Every program runs block by block here, a straight-line one as a single block,
+        so that a long program, or one that never ends, can be run in slices with
+        other work in between. The cursor is moved to where the slice stopped, and
+        cursor.done is set once the program has ended.
+
+        Args:
+            program (Bytecode): The program to run.
+            cursor (BlockCursor): Where to continue; a new cursor starts the program.
+            fuel (Optional[int]): The most instructions to execute; None runs the
+                program to its end.
+
+        Returns:
+            int: The number of instructions executed; executed is set to it too.
+
+        Raises:
+            InvalidInstructionError: If a jump target lies outside the program.
+            StackOverflowError, StackUnderflowError, DivisionByZeroError,
+            MemoryAccessError: As raised by the faulting instruction; the cursor is
+                then not moved.
+        """
+        self.executed = 0
+        self.executed = self._run_blocks(decode_blocks(program), fuel, cursor)
+        return self.executed
+
+    def run_status(
+        self, program: Union[Program, Bytecode, VerifiedProgram]
+    ) -> RunStatus:
+        """
+        Runs a program like run, but reports a fault as a status instead of raising.
+
+        Faults are still detected by the handlers raising, but the error stops at this
+        method, so a caller running many programs needs no try statement per program
+        and one faulting program does not abort the others. The VM is left in the
+        state the fault left it in, as after run raised.
+
+        Args:
+            program (Union[Program, Bytecode, VerifiedProgram]): The program to run.
+
+        Returns:
+            RunStatus: Fault.NONE if the program ran to completion; otherwise the
+            fault, the index of the faulting instruction (NO_INDEX if the program
+            was rejected before running) and the stack pointer at the fault.
+        """
+        self._fault_index = NO_INDEX
+        try:
+            self.run(program)
+        except FAULT_ERRORS as error:
+            return RunStatus(
+                fault_of(error), self._fault_index, int(self.stack_pointer)
+            )
+        return RunStatus(Fault.NONE, NO_INDEX, int(self.stack_pointer))
+
+    def run_profiled(
+        self,
+        program: Union[Program, Bytecode, VerifiedProgram],
+        trace: Optional[TraceCallback] = None,
+    ) -> Profile:
+        """
+        Runs a program through an instrumented loop and returns its profile.
+
+        The instrumentation lives only in this loop, so run() pays nothing for it.
+        Verified programs are run through the checked handlers here, and programs
+        with control flow block by block like run, with the control flow
+        instructions profiled like the others.
+
+        Args:
+            program (Union[Program, Bytecode, VerifiedProgram]): The program to run.
+            trace (Optional[TraceCallback]): Called after every instruction with its
+                index, the instruction, its immediate and the VM.
+
+        Returns:
+            Profile: Per-instruction counts, handler times and overflow flag hits,
+            and the maximum stack depth reached.
+        """
+        if isinstance(program, VerifiedProgram):
+            program = program.bytecode
+        if not isinstance(program, Bytecode):
+            program = compile_program(program)
+        counts = [0] * len(INSTRUCTIONS)
+        times = [0] * len(INSTRUCTIONS)
+        overflows = [0] * len(INSTRUCTIONS)
+        max_depth = int(self.stack_pointer - self.stack_start)
+        # A straight-line program decodes into a single block
+        for index, opcode, immediate, elapsed in self._profiled_steps(
+            decode_blocks(program)
+        ):
+            times[opcode] += elapsed
+            counts[opcode] += 1
+            if self.overflow_flag and _UNCHECKED_OPERATIONS[opcode] is not None:
+                overflows[opcode] += 1
+            max_depth = max(max_depth, int(self.stack_pointer - self.stack_start))
+            if trace is not None:
+                trace(index, INSTRUCTIONS[opcode], immediate, self)
+
+        profile = Profile()
+        profile.max_stack_depth = max_depth
+        for opcode, count in enumerate(counts):
+            if count:
+                profile.record(
+                    INSTRUCTIONS[opcode], count, times[opcode], overflows[opcode]
+                )
+        return profile
+
+    def _profiled_steps(
+        self, program: BlockProgram
+    ) -> Iterator[tuple[int, int, int, int]]:
+        """
+        Runs a decoded program like _run_blocks, timing every instruction.
+
+        Yields:
+            tuple[int, int, int, int]: The index, opcode and immediate of each
+            instruction once it has executed, and the nanoseconds it took.
+        """
+        handlers = self._handlers
+        blocks = program.blocks
+        immediates = program.bytecode.immediates
+        clock = time.perf_counter_ns
+        calls: list[int] = []
+        index = 0
+        while index < len(blocks):
+            block = blocks[index]
+            exit_index = block.start + len(block.opcodes)
+            pairs: Iterable[tuple[int, int]] = zip(block.opcodes, block.immediates)
+            if block.exit != FALLTHROUGH:
+                pairs = chain(pairs, ((block.exit, immediates[exit_index]),))
+            index = block.following
+            for offset, (opcode, immediate) in enumerate(pairs, block.start):
+                started = clock()
+                if offset == exit_index:
+                    index = self._transfer(opcode, block, calls)
+                else:
+                    handlers[opcode](immediate)
+                yield offset, opcode, immediate, clock() - started
+
+    def _run_blocks(
+        self,
+        program: BlockProgram,
+        fuel: Optional[int] = None,
+        cursor: Optional[BlockCursor] = None,
+    ) -> int:
+        """
+        Runs a program with control flow one basic block at a time.
+
+        Jumps and calls take the instruction index in their immediate. JZ and JNZ pop
+        the top of the stack and jump if it is (not) zero; JS, JNS, JO and JNO jump if
+        the sign or overflow flag is (not) set. CALL pushes the index of the next
+        instruction onto a call stack separate from the data stack, and RET continues
+        there. The program ends when control reaches the end of the program.
+
+        Given fuel, the run stops once it has executed that many instructions, in the
+        middle of a block if need be, and saves where it stopped in the cursor.
+
+        Args:
+            program (BlockProgram): The decoded program.
+            fuel (Optional[int]): The most instructions to execute; None for no limit.
+            cursor (Optional[BlockCursor]): Where to start and record the stop; by
+                default the run starts at the first block.
+
+        Returns:
+            int: The number of instructions executed; on a fault, executed is set
+            to the number up to and including the faulting one instead.
+
+        Raises:
+            StackOverflowError: If calls nest deeper than MAX_CALL_DEPTH.
+            StackUnderflowError: On RET with an empty call stack, or JZ or JNZ on an
+                empty stack.
+        """
+        handlers = self._handlers
+        blocks = program.blocks
+        end = len(blocks)
+        if cursor is None:
+            cursor = BlockCursor()
+        index = cursor.index
+        # The body instructions of the current block run before; only a resumed
+        # block starts with any
+        skip = cursor.offset
+        if fuel is None:
+            fuel = sys.maxsize
+        executed = 0
+        # The body instructions of the current block left to run, up to stop; None
+        # once they are done and only its exit remains
+        pairs: Optional[Iterator[tuple[int, int]]] = None
+        stop = 0
+        try:
+            while index < end:
+                block = blocks[index]
+                stop = len(block.opcodes)
+                pairs = zip(block.opcodes, block.immediates)
+                if skip:
+                    pairs = islice(pairs, skip, None)
+                if executed + block.length - skip > fuel:
+                    # The fuel runs out within this block
+                    stop = skip + fuel - executed
+                    pairs = islice(pairs, stop - skip)
+                    for opcode, immediate in pairs:
+                        handlers[opcode](immediate)
+                    pairs = None
+                    executed, skip = fuel, stop
+                    break
+                for opcode, immediate in pairs:
+                    handlers[opcode](immediate)
+                pairs = None
+                executed += block.length - skip
+                skip = 0
+                if block.exit == FALLTHROUGH:
+                    index = block.following
+                else:
+                    index = self._transfer(block.exit, block, cursor.calls)
+        except FAULT_ERRORS:
+            self._fault_index = block.start + stop
+            if pairs is not None:
+                self._fault_index -= 1 + _remaining(pairs)
+                executed += self._fault_index - block.start - skip + 1
+            self.executed = executed
+            raise
+        cursor.index, cursor.offset, cursor.done = index, skip, index >= end
+        return executed
+
+    def _transfer(self, opcode: int, block: BasicBlock, calls: list[int]) -> int:
+        """
+        Executes the control flow instruction ending a block.
+
+        JZ and JNZ pop the element they test.
+
+        Args:
+            opcode (int): The opcode of the instruction.
+            block (BasicBlock): The block it ends.
+            calls (list[int]): The call stack of return block indices.
+
+        Returns:
+            int: The index of the block execution continues at.
+        """
+        if opcode == _CALL:
+            if len(calls) >= MAX_CALL_DEPTH:
+                raise StackOverflowError("Call stack overflow")
+            calls.append(block.following)
+            return block.target
+        if opcode == _RET:
+            if not calls:
+                raise StackUnderflowError("Return with an empty call stack")
+            return calls.pop()
+        if opcode == _JMP:
+            return block.target
+        if opcode in (_JZ, _JNZ):
+            if self.stack_pointer <= self.stack_start:
+                raise StackUnderflowError(
+                    "Not enough elements on the stack to perform a conditional jump"
+                )
+            self.stack_pointer -= 1
+            taken = (self.memory[self.stack_pointer] == 0) == (opcode == _JZ)
+        else:
+            flag = self.sign_flag if opcode in (_JS, _JNS) else self.overflow_flag
+            taken = bool(flag) == (opcode in (_JS, _JO))
+        return block.target if taken else block.following
+
+    def _run_unchecked(self, program: Bytecode) -> None:
+        """
+        Runs a program known to stay within the stack, without bounds checks.
+
+        The stack pointer is kept in a local and written back when the program ends
+        or raises, leaving the same state as the checked handlers.
+
+        Args:
+            program (Bytecode): The verified program.
+        """
+        memory = self.memory
+        stack_pointer = int(self.stack_pointer)
+        operations = _UNCHECKED_OPERATIONS
+        handlers = self._handlers
+        pairs = zip(program.opcodes, program.immediates)
+        try:
+            for opcode, immediate in pairs:
+                entry = operations[opcode]
+                if entry is None:
+                    if opcode == _PUSH:
+                        memory[stack_pointer] = immediate
+                        stack_pointer += 1
+                        continue
+                    # Memory instructions keep their own bounds checks
+                    self.stack_pointer = Word(stack_pointer)
+                    handlers[opcode](immediate)
+                    stack_pointer = int(self.stack_pointer)
+                elif entry[1]:
+                    result, self.sign_flag, self.overflow_flag = entry[0](
+                        memory[stack_pointer - 1], immediate
+                    )
+                    memory[stack_pointer - 1] = result
+                else:
+                    stack_pointer -= 2
+                    result, self.sign_flag, self.overflow_flag = entry[0](
+                        memory[stack_pointer], memory[stack_pointer + 1]
+                    )
+                    memory[stack_pointer] = result
+                    stack_pointer += 1
+        except FAULT_ERRORS:
+            self._fault_index = len(program.opcodes) - 1 - _remaining(pairs)
+            self.executed = self._fault_index + 1
+            raise
+        finally:
+            self.stack_pointer = Word(stack_pointer)
+
+    @property
+    def handlers(self) -> tuple[Handler, ...]:
+        """
+        The handler of each opcode, as the VM dispatches them.
+
+        On a VM narrower than 64 bits, PUSH truncates its immediate to the word width.
+        Code executing opcodes on the VM outside of run should call these handlers
+        rather than build its own table from build_dispatch_table.
+        """
+        return self._handlers
+
+    def reset(self) -> None:
+        """
+        Returns the VM to its freshly constructed state without reallocating memory.
+
+        Only the stack below its high-water mark and the dirty range are cleared.
+        """
+        fill_range(self.memory, self.stack_start, self._stack_high, 0)
+        fill_range(self.memory, *self._dirty, 0)
+        self._dirty = (0, 0)
+        self._stack_high = int(self.stack_start)
+        self.stack_pointer = self.stack_start
+        self.sign_flag = 0
+        self.overflow_flag = 0
+
+    def snapshot(self) -> Snapshot:
+        """
+        Saves the current state of the VM.
+
+        Returns:
+            Snapshot: A copy of the stack pointer, the flags, the written part of the
+            stack region and the dirty range or resident pages.
+        """
+        memory = self.memory
+        return Snapshot(
+            (int(self.stack_pointer), self.sign_flag, self.overflow_flag),
+            dump_range(memory, self.stack_start, self._stack_high),
+            (
+                memory.save_pages()
+                if isinstance(memory, PagedMemory)
+                else (self._dirty[0], dump_range(memory, *self._dirty))
+            ),
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Returns the VM to a previously saved state.
+
+        Args:
+            snapshot (Snapshot): A snapshot taken from a VM with the same configuration.
+        """
+        stack_high = int(self.stack_start) + len(snapshot.stack)
+        if isinstance(snapshot.dirty, dict):
+            assert isinstance(self.memory, PagedMemory)
+            # The pages hold the stack too. Clearing paged memory visits only the
+            # resident pages, so all of it can count as dirty for the next reset.
+            self.memory.load_pages(snapshot.dirty)
+            self._dirty = (0, len(self.memory))
+        else:
+            fill_range(self.memory, *self._dirty, 0)
+            fill_range(self.memory, stack_high, max(stack_high, self._stack_high), 0)
+            dirty_start, dirty = snapshot.dirty
+            self._dirty = (dirty_start, dirty_start + len(dirty))
+            self.memory[slice(*self._dirty)] = dirty
+            self.memory[self.stack_start : stack_high] = snapshot.stack
+        self._stack_high = stack_high
+        stack_pointer, self.sign_flag, self.overflow_flag = snapshot.registers
+        self.stack_pointer = Word(stack_pointer)
+
+    def stack_view(self) -> Union[memoryview, Memory]:
+        """
+        Returns a zero-copy view of the stack region of memory.
+
+        Returns:
+            Union[memoryview, Memory]: memory[stack_start:stack_start + stack_size];
+            writes through the view change the VM's memory. With PagedMemory this is
+            a copy instead.
+        """
+        self.mark_stack_written(self.stack_start + self.stack_size)
+        return view_range(
+            self.memory, self.stack_start, self.stack_start + self.stack_size
+        )
+
+    def load_memory(self, start: int, values: Sequence[int]) -> None:
+        """
+        Copies a block of words into memory in one operation.
+
+        Args:
+            start (int): The address of the first word to write.
+            values (Sequence[int]): The words to write.
+
+        Raises:
+            MemoryAccessError: If the block does not fit in memory.
+        """
+        load_range(self.memory, start, values)
+        self._mark_dirty(start, start + len(values))
+
+    def mark_stack_written(self, stop: int) -> None:
+        """
+        Records that stack slots below an address may have been written.
+
+        Backends that write the stack region of memory directly instead of through
+        the handlers call this, so reset, snapshot and restore cover those slots.
+
         Args:
-            program (Program): The program to run, as a list of instructions and operands.
+            stop (int): One past the highest stack slot written.
         """
-        for instruction, operands in program:
-            self.execute_instruction(instruction, operands)
+        if stop > self._stack_high:
+            self._stack_high = stop
 
-    def _push(self, operands: InstOperands) -> None:
+    def _mark_dirty(self, start: int, stop: int) -> None:
+        """
+        Extends the dirty range to cover writes to [start, stop).
+        """
+        if start >= stop:
+            return
+        if self._dirty[0] < self._dirty[1]:
+            start = min(start, self._dirty[0])
+            stop = max(stop, self._dirty[1])
+        self._dirty = (start, stop)
+
+    def dump_memory(self, start: int, stop: int) -> Memory:
+        """
+        Copies a range of memory out of the VM in one operation.
+
+        Args:
+            start (int): The first address of the range.
+            stop (int): One past the last address of the range.
+
+        Returns:
+            Memory: A copy of memory[start:stop].
+
+        Raises:
+            MemoryAccessError: If the range is outside memory.
+        """
+        return dump_range(self.memory, start, stop)
+
+    def _push(self, operand: int) -> None:
         """
         Pushes a value onto the stack.
 
         Args:
-            operands (InstOperands): The operands for the push instruction; expects one operand.
+            operand (int): The value to push.
 
         Raises:
             StackOverflowError: If pushing the value would exceed the stack size.
         """
         if self.stack_pointer >= self.stack_start + self.stack_size:
             raise StackOverflowError("Stack overflow")
-        self.memory[self.stack_pointer] = operands[0]
+        self.memory[self.stack_pointer] = operand
         self.stack_pointer += 1
+        if self.stack_pointer > self._stack_high:
+            self._stack_high = self.stack_pointer
 
-    def _add(self) -> None:
+    def _push_truncated(self, operand: int) -> None:
         """
-        Executes the ADD instruction which pops the top two elements from the stack,
-        adds them together, and pushes the result back onto the stack.
+        Executes PUSH on a VM with words narrower than 64 bits, truncating the
+        immediate to the word width.
+
+        Raises:
+            StackOverflowError: If pushing the value would exceed the stack size.
+        """
+        self._push(self._arithmetic.wrap(operand))
+
+    def _pop_operands(self, operation: str) -> tuple[int, int]:
+        """
+        Pops the two operands of a binary instruction.
+
+        Args:
+            operation (str): The operation name used in the error message.
+
+        Returns:
+            tuple[int, int]: The second-from-top and the top element.
 
         Raises:
             StackUnderflowError: If there are fewer than two elements on the stack.
-            StackOverflowError: If the result cannot be pushed onto the stack because it is full.
         """
         if self.stack_pointer < self.stack_start + 2:
-            raise StackUnderflowError("Not enough elements on the stack to perform add")
-
-        # Pop the top two elements and add them
+            raise StackUnderflowError(
+                f"Not enough elements on the stack to perform {operation}"
+            )
         self.stack_pointer -= 1
         operand2 = self.memory[self.stack_pointer]
         self.stack_pointer -= 1
         operand1 = self.memory[self.stack_pointer]
+        return operand1, operand2
+
+    def _peek_values(self, count: int, operation: str) -> list[int]:
+        """
+        Reads the operands of an instruction taking count elements from the stack
+        without popping them, so that it can check them before it changes any state.
+
+        Args:
+            count (int): The number of elements to read.
+            operation (str): The operation name used in the error message.
 
-        # Convert to native Python ints for flag calculations
-        result = operand1 + operand2
+        Returns:
+            list[int]: The top count elements, the top last.
 
-        # Update flags
-        self.sign_flag = 1 if result < 0 else 0
-        self.overflow_flag = (
-            1
-            if (operand1 > 0 and operand2 > 0 > result)
-            or (operand1 < 0 and operand2 < 0 < result)
-            else 0
-        )
+        Raises:
+            StackUnderflowError: If there are fewer than count elements on the stack.
+        """
+        if self.stack_pointer < self.stack_start + count:
+            raise StackUnderflowError(
+                f"Not enough elements on the stack to perform {operation}"
+            )
+        return self.memory[self.stack_pointer - count : self.stack_pointer].tolist()
 
+    def _push_result(self, result: int, operation: str) -> None:
+        """
+        Pushes the result of an arithmetic instruction.
+
+        Args:
+            result (int): The value to push.
+            operation (str): The operation name used in the error message.
+
+        Raises:
+            StackOverflowError: If the result cannot be pushed because the stack is full.
+        """
         if self.stack_pointer >= self.stack_start + self.stack_size:
-            raise StackOverflowError("Stack overflow on add")
+            raise StackOverflowError(f"Stack overflow on {operation}")
         self.memory[self.stack_pointer] = result
         self.stack_pointer += 1
 
-    def _sub(self) -> None:
+    def _apply_immediate(
+        self, operation: Operation, operand: int, operation_name: str
+    ) -> None:
+        """
+        Applies a binary operation to the top of the stack and an immediate in place.
+
+        This is the shared body of the fused PUSH_<OP> instructions, which behave like
+        PUSH followed by <OP> without the intermediate stack traffic.
+
+        Args:
+            operation (Operation): The arithmetic operation to apply.
+            operand (int): The immediate used as the second operand.
+            operation_name (str): The operation name used in the error message.
+
+        Raises:
+            StackUnderflowError: If the stack is empty.
+        """
+        if self.stack_pointer < self.stack_start + 1:
+            raise StackUnderflowError(
+                f"Not enough elements on the stack to perform {operation_name}"
+            )
+        top = self.stack_pointer - 1
+        result, self.sign_flag, self.overflow_flag = operation(
+            self.memory[top], operand
+        )
+        self.memory[top] = result
+
+    def _add(self, _operand: int) -> None:
+        """
+        Executes the ADD instruction which pops the top two elements from the stack,
+        adds them together, and pushes the result back onto the stack.
+
+        Raises:
+            StackUnderflowError: If there are fewer than two elements on the stack.
+            StackOverflowError: If the result cannot be pushed onto the stack because it is full.
+        """
+        operand1, operand2 = self._pop_operands("add")
+        result, self.sign_flag, self.overflow_flag = self._arithmetic.add(
+            operand1, operand2
+        )
+        self._push_result(result, "add")
+
+    def _sub(self, _operand: int) -> None:
         """
         Executes the SUB instruction, which subtracts the top stack element from the next top
         element.
@@ -137,34 +833,13 @@ class PhiVM:
             the operation.
             StackOverflowError: If the result cannot be pushed onto the stack because it is full.
         """
-        if self.stack_pointer < self.stack_start + 2:
-            raise StackUnderflowError(
-                "Not enough elements on the stack to perform subtract"
-            )
-
-        # Pop the top two elements from the stack
-        self.stack_pointer -= 1
-        operand2 = self.memory[self.stack_pointer]
-        self.stack_pointer -= 1
-        operand1 = self.memory[self.stack_pointer]
-
-        # Perform the subtraction
-        result = operand1 - operand2
-
-        self.sign_flag = 1 if result < 0 else 0
-        self.overflow_flag = (
-            1
-            if (operand1 < 0 < result and operand2 > 0)
-            or (operand1 > 0 > result and operand2 < 0)
-            else 0
+        operand1, operand2 = self._pop_operands("subtract")
+        result, self.sign_flag, self.overflow_flag = self._arithmetic.sub(
+            operand1, operand2
         )
+        self._push_result(result, "subtract")
 
-        if self.stack_pointer >= self.stack_start + self.stack_size:
-            raise StackOverflowError("Stack overflow on subtract")
-        self.memory[self.stack_pointer] = result
-        self.stack_pointer += 1
-
-    def _mul(self) -> None:
+    def _mul(self, _operand: int) -> None:
         """
         Executes the MUL instruction, which multiplies the top two elements on the stack.
 
@@ -176,39 +851,13 @@ class PhiVM:
             the operation.
             StackOverflowError: If the result cannot be pushed onto the stack because it is full.
         """
+        operand1, operand2 = self._pop_operands("multiply")
+        result, self.sign_flag, self.overflow_flag = self._arithmetic.mul(
+            operand1, operand2
+        )
+        self._push_result(result, "multiply")
 
-        if self.stack_pointer < self.stack_start + 2:
-            raise StackUnderflowError(
-                "Not enough elements on the stack to perform multiply"
-            )
-
-        # Pop the top two elements from the stack
-        self.stack_pointer -= 1
-        operand2 = self.memory[self.stack_pointer]
-        self.stack_pointer -= 1
-        operand1 = self.memory[self.stack_pointer]
-
-        # Convert operands to Python's native int for overflow checking
-        python_int_result = int(operand1) * int(operand2)
-
-        # Check for overflow
-        max_int64 = np.iinfo(np.int64).max
-        min_int64 = np.iinfo(np.int64).min
-        self.overflow_flag = not min_int64 <= python_int_result <= max_int64
-
-        # Perform the multiplication
-        result = operand1 * operand2
-
-        # Update VM flags based on the result
-        self.sign_flag = 1 if result < 0 else 0
-
-        # Push the result back onto the stack, if space permits
-        if self.stack_pointer >= self.stack_start + self.stack_size:
-            raise StackOverflowError("Stack overflow on multiply")
-        self.memory[self.stack_pointer] = result
-        self.stack_pointer += 1
-
-    def _div(self) -> None:
+    def _div(self, _operand: int) -> None:
         """
         Executes the DIV instruction, which divides the second top element on the stack
         by the top element.
@@ -222,30 +871,120 @@ class PhiVM:
             DivisionByZeroError: If the division operation attempts to divide by zero.
             StackOverflowError: If the result cannot be pushed onto the stack because it is full.
         """
-        if self.stack_pointer < self.stack_start + 2:
-            raise StackUnderflowError(
-                "Not enough elements on the stack to perform division"
-            )
+        dividend, divisor = self._pop_operands("division")
+        result, self.sign_flag, self.overflow_flag = self._arithmetic.div(
+            dividend, divisor
+        )
+        self._push_result(result, "division")
 
-        # Pop the top two elements for division
-        self.stack_pointer -= 1
-        divisor = self.memory[self.stack_pointer]
+    def _push_add(self, operand: int) -> None:
+        """
+        Executes the fused PUSH_ADD instruction, adding the immediate to the top element.
+        """
+        self._apply_immediate(self._arithmetic.add, operand, "add")
+
+    def _push_sub(self, operand: int) -> None:
+        """
+        Executes the fused PUSH_SUB instruction, subtracting the immediate from the top
+        element.
+        """
+        self._apply_immediate(self._arithmetic.sub, operand, "subtract")
+
+    def _push_mul(self, operand: int) -> None:
+        """
+        Executes the fused PUSH_MUL instruction, multiplying the top element by the
+        immediate.
+        """
+        self._apply_immediate(self._arithmetic.mul, operand, "multiply")
+
+    def _push_div(self, operand: int) -> None:
+        """
+        Executes the fused PUSH_DIV instruction, dividing the top element by the immediate.
+
+        Raises:
+            DivisionByZeroError: If the immediate is zero.
+        """
+        self._apply_immediate(self._arithmetic.div, operand, "division")
+
+    def _load(self, address: int) -> None:
+        """
+        Pushes the word at the address given by the immediate.
+
+        Raises:
+            MemoryAccessError: If the address is outside memory.
+            StackOverflowError: If the stack is full.
+        """
+        check_range(self.memory, address, address + 1)
+        self._push_result(self.memory[address], "load")
+        self.mark_stack_written(self.stack_pointer)
+
+    def _store(self, address: int) -> None:
+        """
+        Pops the top element into the address given by the immediate.
+
+        Raises:
+            StackUnderflowError: If the stack is empty.
+            MemoryAccessError: If the address is outside memory.
+        """
+        (value,) = self._peek_values(1, "store")
+        check_range(self.memory, address, address + 1)
         self.stack_pointer -= 1
-        dividend = self.memory[self.stack_pointer]
+        self.memory[address] = value
+        self._mark_dirty(address, address + 1)
 
-        # Check for division by zero
-        if divisor == 0:
-            raise DivisionByZeroError("Attempted division by zero")
+    def _memcpy(self, _operand: int) -> None:
+        """
+        Pops a destination, a source and a count (on top), then copies count words
+        from the source to the destination; overlapping ranges are handled.
 
-        # Perform the division
-        result = dividend // divisor
+        Raises:
+            StackUnderflowError: If there are fewer than three elements on the stack.
+            MemoryAccessError: If either range is outside memory or count is negative.
+        """
+        destination, source, count = self._peek_values(3, "memcpy")
+        check_range(self.memory, source, source + count)
+        check_range(self.memory, destination, destination + count)
+        self.stack_pointer -= 3
+        copy_range(self.memory, destination, source, count)
+        self._mark_dirty(destination, destination + count)
+
+    def _memset(self, _operand: int) -> None:
+        """
+        Pops a destination, a value and a count (on top), then fills count words from
+        the destination with the value.
 
-        # Update VM flags based on the result (update as needed)
-        self.sign_flag = 1 if result < 0 else 0
-        self.overflow_flag = 0  # Overflow is not typically an issue in integer division
+        Raises:
+            StackUnderflowError: If there are fewer than three elements on the stack.
+            MemoryAccessError: If the range is outside memory or count is negative.
+        """
+        destination, value, count = self._peek_values(3, "memset")
+        check_range(self.memory, destination, destination + count)
+        self.stack_pointer -= 3
+        fill_range(self.memory, destination, destination + count, value)
+        self._mark_dirty(destination, destination + count)
 
-        # Push the result back onto the stack, if space permits
-        if self.stack_pointer >= self.stack_start + self.stack_size:
-            raise StackOverflowError("Stack overflow on division")
-        self.memory[self.stack_pointer] = result
-        self.stack_pointer += 1
+    def _memsum(self, _operand: int) -> None:
+        """
+        Pops a start address and a count (on top), then pushes the wrapped sum of the
+        count words from the start address. The flags are not changed.
+
+        Raises:
+            StackUnderflowError: If there are fewer than two elements on the stack.
+            MemoryAccessError: If the range is outside memory or count is negative.
+        """
+        start, count = self._peek_values(2, "memsum")
+        check_range(self.memory, start, start + count)
+        self.stack_pointer -= 2
+        total = self._arithmetic.wrap(sum_range(self.memory, start, start + count))
+        self._push_result(total, "memsum")
+
+
+def _remaining(pairs: Iterator[tuple[int, int]]) -> int:
+    """
+    Consumes the instructions a run loop stopped before and returns their number.
+
+    When a handler raises, its run loop has taken exactly the instructions up to and
+    including the faulting one from the iterator, so the faulting index follows from
+    what is left without counting instructions on the fast path.
+    """
+    return sum(1 for _ in pairs)
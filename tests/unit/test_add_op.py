@@ -4,7 +4,7 @@ import numpy as np
 
 from src.pvm.configuration import Configuration
 from src.pvm.instructions import Instruction
-from src.pvm.types import Word
+from src.pvm.types import Program, Word
 from src.pvm.vm import PhiVM
 
 
@@ -16,7 +16,7 @@ class TestAddOperation(unittest.TestCase):
 
     def test_add_basic(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(5)]),
             (Instruction.PUSH, [Word(10)]),
             (Instruction.ADD, []),
@@ -28,7 +28,7 @@ class TestAddOperation(unittest.TestCase):
     def test_add_overflow(self) -> None:
         vm = PhiVM(self.config)
         max_int64 = np.iinfo(np.int64).max
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(max_int64)]),
             (Instruction.PUSH, [Word(1)]),
             (Instruction.ADD, []),
@@ -39,7 +39,7 @@ class TestAddOperation(unittest.TestCase):
 
     def test_add_sign_flag(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(-5)]),
             (Instruction.PUSH, [Word(-10)]),
             (Instruction.ADD, []),
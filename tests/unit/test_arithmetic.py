@@ -0,0 +1,65 @@
+import itertools
+import unittest
+import warnings
+
+import numpy as np
+
+from src.pvm.arithmetic import MAX_WORD, MIN_WORD, add, div, mul, sub, wrap
+from src.pvm.errors import DivisionByZeroError
+
+EDGE_VALUES = [0, 1, -1, 2, -2, 7, -7, MAX_WORD, MIN_WORD, MAX_WORD // 2, MIN_WORD // 2]
+
+
+def numpy_reference(
+    operation: str, operand1: int, operand2: int
+) -> tuple[int, int, int]:
+    # The NumPy scalar implementation the native one replaces
+    a, b = np.int64(operand1), np.int64(operand2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if operation == "add":
+            result = a + b
+            overflow = bool((a > 0 and b > 0 > result) or (a < 0 and b < 0 < result))
+        elif operation == "sub":
+            result = a - b
+            overflow = bool((a < 0 < result and b > 0) or (a > 0 > result and b < 0))
+        elif operation == "mul":
+            overflow = not MIN_WORD <= int(a) * int(b) <= MAX_WORD
+            result = a * b
+        else:
+            result = a // b
+            overflow = False
+    return int(result), int(result < 0), int(overflow)
+
+
+class TestArithmetic(unittest.TestCase):
+    def test_matches_numpy_semantics(self) -> None:
+        operations = {"add": add, "sub": sub, "mul": mul, "div": div}
+        for (name, operation), (operand1, operand2) in itertools.product(
+            operations.items(), itertools.product(EDGE_VALUES, repeat=2)
+        ):
+            if name == "div" and operand2 == 0:
+                continue
+            with self.subTest(operation=name, operand1=operand1, operand2=operand2):
+                self.assertEqual(
+                    operation(operand1, operand2),
+                    numpy_reference(name, operand1, operand2),
+                )
+
+    def test_results_are_native_ints(self) -> None:
+        result, sign_flag, overflow_flag = mul(MAX_WORD, 3)
+        self.assertIs(type(result), int)
+        self.assertEqual((result, sign_flag, overflow_flag), (MAX_WORD - 2, 0, 1))
+
+    def test_wrap(self) -> None:
+        self.assertEqual(wrap(MAX_WORD + 1), MIN_WORD)
+        self.assertEqual(wrap(MIN_WORD - 1), MAX_WORD)
+        self.assertEqual(wrap(-(1 << 64)), 0)
+
+    def test_division_by_zero(self) -> None:
+        with self.assertRaises(DivisionByZeroError):
+            div(1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.pvm.assembler import assemble, disassemble, read_programs
+from src.pvm.bytecode import compile_program
+from src.pvm.cli import main
+from src.pvm.configuration import Configuration
+from src.pvm.errors import AssemblyError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+SOURCE = """\
+; the answer
+PUSH 6
+push_mul 0x7   # fused
+---
+PUSH 1
+PUSH 0
+DIV
+---
+"""
+
+
+class TestAssembler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+
+    def test_assemble_matches_the_list_form(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(6)]),
+            (Instruction.PUSH_MUL, [Word(7)]),
+            (Instruction.STORE, [Word(3)]),
+            (Instruction.JMP, [Word(5)]),
+            (Instruction.MEMSUM, []),
+        ]
+        text = "PUSH 6\npush_mul 0x7 ; comment\n\nSTORE 3\nJMP 5\nMEMSUM\n"
+        expected = compile_program(program)
+        self.assertEqual(assemble(text).digest(), expected.digest())
+        self.assertEqual(assemble(disassemble(program)).digest(), expected.digest())
+        vm = PhiVM(self.config)
+        vm.run(assemble(text))
+        self.assertEqual(vm.memory[3], 42)
+
+    def test_read_programs_streams_sections(self) -> None:
+        programs = list(read_programs(io.StringIO(SOURCE)))
+        self.assertEqual([program.line for program in programs], [2, 5])
+        self.assertEqual([len(program.bytecode) for program in programs], [2, 3])
+
+    def test_separators_may_carry_comments(self) -> None:
+        text = "PUSH 1\n---  ; ends a program\nPUSH 2\n---# another\n"
+        programs = list(read_programs(io.StringIO(text)))
+        self.assertEqual([program.line for program in programs], [1, 3])
+        self.assertEqual([len(program.bytecode) for program in programs], [1, 1])
+
+    def test_malformed_lines(self) -> None:
+        for text in ("PUSH x", "JUMP 3", "PUSH", "ADD 1", f"PUSH {2**63}"):
+            with self.subTest(text=text), self.assertRaisesRegex(
+                AssemblyError, "^Line 2: "
+            ):
+                list(read_programs(["PUSH 1", text]))
+        with self.assertRaises(AssemblyError):
+            assemble(SOURCE)
+
+    def test_errors_skip_to_the_next_program(self) -> None:
+        errors: list[AssemblyError] = []
+        text = "PUSH 1\nPUSH x\nPUSH 2\n---\nPUSH 3\n---\nJUMP\n---\nPUSH 4\n"
+        programs = list(read_programs(io.StringIO(text), errors.append))
+        self.assertEqual([program.line for program in programs], [5, 9])
+        self.assertEqual([str(error)[:7] for error in errors], ["Line 2:", "Line 7:"])
+
+
+class TestCommandLine(unittest.TestCase):
+    def run_main(self, argv: list[str]) -> tuple[int, str, str]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = main(argv)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_runs_files_and_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "a.pasm"), "w", encoding="utf-8") as file:
+                file.write(SOURCE)
+            with open(os.path.join(directory, "b.pasm"), "w", encoding="utf-8") as file:
+                file.write("PUSH 100\nPUSH_ADD 100\n")
+            status, output, summary = self.run_main(["--word-bits", "8", directory])
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            [os.path.basename(line) for line in output.splitlines()],
+            [
+                "a.pasm:2: ok top=42 sign=0 overflow=0",
+                "a.pasm:5: fault DIVISION_BY_ZERO at 2 sp=32768",
+                "b.pasm:1: ok top=-56 sign=1 overflow=1",
+            ],
+        )
+        self.assertIn("3 programs, 1 faults, 0 errors: 7 instructions", summary)
+
+    def test_errors_and_quiet_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ok.pasm")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("PUSH 1\n")
+            missing = os.path.join(directory, "missing.pasm")
+            status, output, _ = self.run_main(["--quiet", path, missing])
+        self.assertEqual(status, 1)
+        self.assertEqual(output, f"{missing}: error No such file or directory\n")
+
+    def test_loops_count_every_instruction_and_errors_resume(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "loop.pasm")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("PUSH 9\nPUSH_SUB 1\nJNS 1\n---\nBAD\n---\nPUSH 1\n")
+            status, output, summary = self.run_main([path])
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            [line[len(path) :] for line in output.splitlines()],
+            [
+                ":1: ok top=-1 sign=1 overflow=0",
+                ": error Line 5: Unknown instruction 'BAD'",
+                ":7: ok top=1 sign=0 overflow=0",
+            ],
+        )
+        self.assertIn("2 programs, 0 faults, 1 errors: 22 instructions", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
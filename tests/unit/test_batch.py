@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from src.pvm.batch import BatchPhiVM
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError, StackUnderflowError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+MAX_INT64 = np.iinfo(np.int64).max
+MIN_INT64 = np.iinfo(np.int64).min
+
+
+class TestBatchPhiVM(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.inputs = np.array(
+            [
+                [5, 10],
+                [-5, 3],
+                [MAX_INT64, 1],
+                [MIN_INT64, -1],
+                [MAX_INT64 // 2, 3],
+                [0, 0],
+                [-7, 2],
+            ],
+            dtype=np.int64,
+        )
+
+    def _run_scalar(
+        self, instruction: Instruction, operand1: int, operand2: int
+    ) -> tuple[int, int, int]:
+        vm = PhiVM(self.config)
+        vm.run(
+            [
+                (Instruction.PUSH, [Word(operand1)]),
+                (Instruction.PUSH, [Word(operand2)]),
+                (instruction, []),
+            ]
+        )
+        return int(vm.memory[vm.stack_pointer - 1]), vm.sign_flag, vm.overflow_flag
+
+    def test_lanes_match_scalar_vm(self) -> None:
+        for instruction in (Instruction.ADD, Instruction.SUB, Instruction.MUL):
+            with self.subTest(instruction=instruction):
+                batch = BatchPhiVM(self.config, lanes=len(self.inputs))
+                results = batch.run([(instruction, [])], inputs=self.inputs)
+                for lane, (operand1, operand2) in enumerate(self.inputs):
+                    expected = self._run_scalar(instruction, operand1, operand2)
+                    self.assertEqual(
+                        (
+                            results[lane],
+                            batch.sign_flag[lane],
+                            batch.overflow_flag[lane],
+                        ),
+                        expected,
+                    )
+
+    def test_division_by_zero_is_masked_per_lane(self) -> None:
+        batch = BatchPhiVM(self.config, lanes=len(self.inputs))
+        results = batch.run([(Instruction.DIV, [])], inputs=self.inputs)
+        self.assertEqual(batch.fault_mask.tolist(), [False] * 5 + [True, False])
+        self.assertEqual(results[0], 0)
+        self.assertEqual(results[6], -4)
+        self.assertEqual(results[3], MIN_INT64)
+        with self.assertRaises(DivisionByZeroError):
+            self._run_scalar(Instruction.DIV, 0, 0)
+
+    def test_immediates_are_broadcast(self) -> None:
+        batch = BatchPhiVM(self.config, lanes=3)
+        program: Program = [(Instruction.PUSH, [Word(2)]), (Instruction.MUL, [])]
+        results = batch.run(program, inputs=[1, 2, 3])
+        self.assertEqual(results.tolist(), [2, 4, 6])
+        results = batch.run([(Instruction.PUSH_SUB, [Word(1)])])
+        self.assertEqual(results.tolist(), [1, 3, 5])
+
+    def test_stack_underflow(self) -> None:
+        batch = BatchPhiVM(self.config, lanes=4)
+        with self.assertRaises(StackUnderflowError):
+            batch.run([(Instruction.PUSH, [Word(1)]), (Instruction.ADD, [])])
+
+
+if __name__ == "__main__":
+    unittest.main()
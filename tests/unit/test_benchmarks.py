@@ -0,0 +1,33 @@
+import unittest
+
+from benchmarks.bench_import import measure_import
+from benchmarks.bench_vm import Benchmark, benchmarks, compare, measure
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare_reports_regressions_over_threshold(self) -> None:
+        baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+        results = {"a": 95.0, "b": 80.0, "c": 150.0, "new": 1.0}
+        regressions = compare(results, baseline, threshold_percent=10)
+        self.assertEqual([regression.name for regression in regressions], ["b"])
+        self.assertAlmostEqual(regressions[0].percent, 20.0)
+
+    def test_suite_covers_opcodes_and_construction(self) -> None:
+        names = {benchmark.name for benchmark in benchmarks()}
+        self.assertIn("opcode/ADD", names)
+        self.assertIn("length/1000", names)
+        self.assertIn("construct/memory=1024", names)
+
+    def test_measure_returns_rate(self) -> None:
+        benchmark = Benchmark("noop", 10, lambda: None)
+        self.assertGreater(measure(benchmark, repeat=1, min_time=0.001), 0)
+
+    def test_core_imports_without_numpy(self) -> None:
+        for module in ("src.pvm.vm", "src.pvm.server"):
+            with self.subTest(module=module):
+                self.assertFalse(measure_import(module, repeat=1).loads_numpy)
+        self.assertTrue(measure_import("src.pvm.batch", repeat=1).loads_numpy)
+
+
+if __name__ == "__main__":
+    unittest.main()
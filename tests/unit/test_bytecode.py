@@ -0,0 +1,68 @@
+import unittest
+from array import array
+from typing import Union
+
+import numpy as np
+
+from src.pvm.bytecode import OPCODES, Bytecode, compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.errors import InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+
+class TestBytecode(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.program: Program = [
+            (Instruction.PUSH, [Word(7)]),
+            (Instruction.PUSH, [Word(3)]),
+            (Instruction.SUB, []),
+            (Instruction.PUSH, [Word(-2)]),
+            (Instruction.MUL, []),
+        ]
+
+    def test_compile_program(self) -> None:
+        bytecode = compile_program(self.program)
+        self.assertEqual(len(bytecode), 5)
+        self.assertEqual(bytecode.opcodes[2], OPCODES[Instruction.SUB])
+        self.assertEqual(list(bytecode.immediates), [7, 3, 0, -2, 0])
+
+    def test_run_bytecode_matches_legacy_program(self) -> None:
+        expected_memory = np.zeros(2048, dtype=np.int64)
+        # 7 - 3 = 4, times -2; the popped -2 is left above the stack pointer
+        expected_memory[1024:1026] = [-8, -2]
+        forms: list[Union[Program, Bytecode]] = [
+            self.program,
+            compile_program(self.program),
+        ]
+        for program in forms:
+            with self.subTest(form=type(program).__name__):
+                vm = PhiVM(self.config)
+                vm.run(program)
+                self.assertEqual(vm.stack_pointer, 1025)
+                assert isinstance(vm.memory, array)
+                self.assertTrue(np.array_equal(vm.memory, expected_memory))
+                self.assertEqual((vm.sign_flag, vm.overflow_flag), (1, 0))
+
+    def test_bytecode_can_be_rerun(self) -> None:
+        bytecode = compile_program(self.program)
+        vm = PhiVM(self.config)
+        vm.run(bytecode)
+        vm.run(bytecode)
+        self.assertEqual(vm.stack_pointer, self.config.stack_start + 2)
+
+    def test_push_requires_operand(self) -> None:
+        with self.assertRaises(InvalidInstructionError):
+            compile_program([(Instruction.PUSH, [])])
+
+    def test_unknown_opcode_rejected(self) -> None:
+        with self.assertRaises(InvalidInstructionError):
+            Bytecode([len(OPCODES)], [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
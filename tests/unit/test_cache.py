@@ -0,0 +1,92 @@
+import gc
+import unittest
+import weakref
+from typing import Union
+
+from src.pvm.bytecode import Bytecode, compile_program
+from src.pvm.cache import ResultCache
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.program: Program = [
+            (Instruction.PUSH, [Word(9)]),
+            (Instruction.PUSH, [Word(4)]),
+            (Instruction.PUSH, [Word(-3)]),
+            (Instruction.MUL, []),
+        ]
+        self.cache = ResultCache(max_entries=2)
+
+    def run_fresh(self, program: Union[Program, Bytecode]) -> PhiVM:
+        vm = PhiVM(self.config)
+        self.cache.run(vm, program)
+        return vm
+
+    def test_hit_replays_stack_and_flags(self) -> None:
+        expected = PhiVM(self.config)
+        expected.run(self.program)
+        self.run_fresh(self.program)
+        vm = self.run_fresh(compile_program(self.program))
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(vm.stack_pointer, expected.stack_pointer)
+        self.assertEqual(vm.stack_view()[:2].tolist(), [9, -12])
+        self.assertEqual(vm.sign_flag, expected.sign_flag)
+        self.assertEqual(vm.executed, 4)
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_errors_are_cached(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(5)]),
+            (Instruction.PUSH_DIV, [Word(0)]),
+        ]
+        for _ in range(2):
+            vm = PhiVM(self.config)
+            with self.assertRaises(DivisionByZeroError):
+                self.cache.run(vm, program)
+            self.assertEqual(vm.stack_view()[0], 5)
+            self.assertEqual(vm.executed, 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_cached_errors_do_not_keep_the_vm_alive(self) -> None:
+        vm = PhiVM(self.config)
+        try:
+            self.cache.run(
+                vm, [(Instruction.PUSH, [Word(5)]), (Instruction.PUSH_DIV, [Word(0)])]
+            )
+        except DivisionByZeroError:
+            pass
+        collected = weakref.ref(vm)
+        del vm
+        gc.collect()
+        self.assertIsNone(collected())
+        self.assertEqual(len(self.cache), 1)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        programs = [[(Instruction.PUSH, [Word(value)])] for value in range(3)]
+        self.run_fresh(programs[0])
+        self.run_fresh(programs[1])
+        self.run_fresh(programs[0])
+        self.run_fresh(programs[2])
+        self.assertEqual((len(self.cache), self.cache.evictions), (2, 1))
+        self.run_fresh(programs[0])
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_non_empty_stack_bypasses_cache(self) -> None:
+        vm = PhiVM(self.config)
+        vm.execute_instruction(Instruction.PUSH, [Word(1)])
+        self.cache.run(vm, self.program)
+        self.assertEqual(self.cache.bypasses, 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from array import array
+
+from src.pvm.checkpoints import CheckpointRunner
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+
+def counter(length: int) -> ProgramList:
+    program: ProgramList = [(Instruction.PUSH, [Word(0)])]
+    return program + [(Instruction.PUSH_ADD, [Word(1)])] * (length - 1)
+
+
+class TestCheckpointRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+        self.runner = CheckpointRunner(self.vm, interval=10)
+
+    def assert_matches_fresh_run(self, program: Program) -> None:
+        fresh = PhiVM(self.config)
+        fresh.run(program)
+        self.assertEqual(self.vm.stack_pointer, fresh.stack_pointer)
+        assert isinstance(self.vm.memory, array) and isinstance(fresh.memory, array)
+        self.assertEqual(self.vm.memory.tolist(), fresh.memory.tolist())
+        self.assertEqual(
+            (self.vm.sign_flag, self.vm.overflow_flag),
+            (fresh.sign_flag, fresh.overflow_flag),
+        )
+
+    def test_rerun_resumes_before_the_first_change(self) -> None:
+        program = counter(95)
+        self.runner.run(program)
+        self.assertEqual(self.runner.resumed_at, 0)
+        edited = program[:83] + [(Instruction.PUSH_SUB, [Word(100)])] + program[84:]
+        self.runner.run(edited)
+        self.assertEqual(self.runner.resumed_at, 80)
+        self.assert_matches_fresh_run(edited)
+        edited = [(Instruction.PUSH, [Word(5)])] + edited[1:]
+        self.runner.run(edited)
+        self.assertEqual(self.runner.resumed_at, 0)
+        self.assert_matches_fresh_run(edited)
+
+    def test_truncated_and_extended_programs(self) -> None:
+        program = counter(50) + [(Instruction.STORE, [Word(7)])]
+        self.runner.run(program)
+        self.runner.run(program[:25])
+        self.assertEqual(self.runner.resumed_at, 20)
+        self.assert_matches_fresh_run(program[:25])
+        self.runner.run(program)
+        self.assertEqual(self.runner.resumed_at, 20)
+        self.assert_matches_fresh_run(program)
+
+    def test_checkpoints_before_a_fault_are_kept(self) -> None:
+        program = counter(40) + [(Instruction.PUSH_DIV, [Word(0)])]
+        with self.assertRaises(DivisionByZeroError):
+            self.runner.run(program)
+        self.runner.run(program[:-1] + [(Instruction.PUSH_DIV, [Word(2)])])
+        self.assertEqual(self.runner.resumed_at, 40)
+        self.assert_matches_fresh_run(
+            program[:-1] + [(Instruction.PUSH_DIV, [Word(2)])]
+        )
+
+    def test_stale_stack_slots_are_restored(self) -> None:
+        runner = CheckpointRunner(self.vm, interval=3)
+        program: ProgramList = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.ADD, []),
+            (Instruction.PUSH_ADD, [Word(0)]),
+        ]
+        runner.run(program)
+        # LOAD reads the operand ADD left above the stack pointer at the checkpoint
+        edited = program[:3] + [(Instruction.LOAD, [Word(1025)])]
+        runner.run(edited)
+        self.assertEqual(runner.resumed_at, 3)
+        self.assert_matches_fresh_run(edited)
+        self.assertEqual(self.vm.memory[self.vm.stack_pointer - 1], 2)
+
+        self.vm.reset()
+        runner = CheckpointRunner(self.vm, interval=4)
+        program = [(Instruction.PUSH, [Word(value)]) for value in range(1, 6)]
+        program += [(Instruction.ADD, [])] * 3 + [(Instruction.PUSH_ADD, [Word(0)])]
+        runner.run(program)
+        # MEMSUM over a slot an ADD popped before the checkpoint
+        edited = program[:8] + [
+            (Instruction.PUSH, [Word(1028)]),
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.MEMSUM, []),
+        ]
+        runner.run(edited)
+        self.assertEqual(runner.resumed_at, 8)
+        self.assert_matches_fresh_run(edited)
+        self.assertEqual(self.vm.memory[self.vm.stack_pointer - 1], 5)
+
+    def test_control_flow_runs_in_full(self) -> None:
+        program: Program = counter(30) + [(Instruction.JMP, [Word(31)])]
+        self.runner.run(program)
+        self.runner.run(program)
+        self.assertEqual(self.runner.resumed_at, 0)
+        self.assert_matches_fresh_run(program)
+
+    def test_invalid_interval(self) -> None:
+        with self.assertRaises(ValueError):
+            CheckpointRunner(self.vm, interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import unittest
+from array import array
+
+import numpy as np
+
+from src.pvm.codegen import compile_to_python
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    DivisionByZeroError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+MAX_INT64 = np.iinfo(np.int64).max
+
+
+class TestCodegen(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(64), stack_start=Word(16), stack_size=Word(8)
+        )
+
+    def assert_same_state(self, actual: PhiVM, expected: PhiVM) -> None:
+        self.assertEqual(actual.stack_pointer, expected.stack_pointer)
+        assert isinstance(actual.memory, array) and isinstance(expected.memory, array)
+        self.assertEqual(actual.memory.tolist(), expected.memory.tolist())
+        self.assertEqual(actual.sign_flag, expected.sign_flag)
+        self.assertEqual(actual.overflow_flag, expected.overflow_flag)
+
+    def test_random_programs_match_interpreter(self) -> None:
+        rng = random.Random(1234)
+        values = [0, 1, -1, 3, -7, MAX_INT64, -MAX_INT64 - 1]
+        binary = [Instruction.ADD, Instruction.SUB, Instruction.MUL, Instruction.DIV]
+        for _ in range(200):
+            program: ProgramList = []
+            depth = 0
+            for _ in range(rng.randint(1, 12)):
+                if depth >= 2 and rng.random() < 0.5:
+                    program.append((rng.choice(binary), []))
+                    depth -= 1
+                elif depth >= 1 and rng.random() < 0.3:
+                    instruction = rng.choice(
+                        [Instruction.PUSH_ADD, Instruction.PUSH_MUL]
+                    )
+                    program.append((instruction, [Word(rng.choice(values))]))
+                elif depth < 8:
+                    program.append((Instruction.PUSH, [Word(rng.choice(values))]))
+                    depth += 1
+            expected = PhiVM(self.config)
+            actual = PhiVM(self.config)
+            try:
+                expected.run(program)
+            except DivisionByZeroError:
+                with self.assertRaises(DivisionByZeroError):
+                    compile_to_python(program)(actual)
+            else:
+                compile_to_python(program)(actual)
+            self.assert_same_state(actual, expected)
+            self.assertEqual(actual.executed, expected.executed)
+
+    def test_program_consuming_caller_stack(self) -> None:
+        prelude: ProgramList = [(Instruction.PUSH, [Word(v)]) for v in (2, 9, 4)]
+        program: ProgramList = [
+            (Instruction.SUB, []),
+            (Instruction.ADD, []),
+            (Instruction.PUSH, [Word(-1)]),
+            (Instruction.MUL, []),
+        ]
+        expected = PhiVM(self.config)
+        expected.run(prelude + program)
+        actual = PhiVM(self.config)
+        actual.run(prelude)
+        compile_to_python(program)(actual)
+        self.assert_same_state(actual, expected)
+        self.assertEqual(actual.memory[actual.stack_pointer - 1], -7)
+
+    def test_stack_faults_match_interpreter(self) -> None:
+        compiled = compile_to_python([(Instruction.ADD, [])])
+        with self.assertRaises(StackUnderflowError):
+            compiled(PhiVM(self.config))
+        compiled = compile_to_python([(Instruction.PUSH, [Word(1)])] * 9)
+        vm = PhiVM(self.config)
+        with self.assertRaises(StackOverflowError):
+            compiled(vm)
+        self.assertEqual(vm.stack_pointer, self.config.stack_start + 8)
+
+    def test_compiled_programs_are_cached(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH_ADD, [Word(2)]),
+        ]
+        self.assertIs(compile_to_python(program), compile_to_python(list(program)))
+        self.assertNotIn("_push", compile_to_python(program).source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+from src.pvm.blocks import FALLTHROUGH, decode_blocks
+from src.pvm.bytecode import compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    InvalidInstructionError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.optimizer import optimize
+from src.pvm.types import Program, Word
+from src.pvm.verifier import verify
+from src.pvm.vm import PhiVM
+
+
+class TestControlFlow(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def stack(self) -> list[int]:
+        return self.vm.memory[self.vm.stack_start : self.vm.stack_pointer].tolist()
+
+    def test_countdown_loop_on_sign_flag(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(999)]),
+            (Instruction.PUSH_SUB, [Word(1)]),
+            (Instruction.JNS, [Word(1)]),
+        ]
+        self.vm.run(program)
+        self.assertEqual(self.stack(), [-1])
+        self.assertEqual(self.vm.sign_flag, 1)
+        self.assertEqual(self.vm.executed, 1 + 2 * 1000)
+
+    def test_conditional_jumps_pop_their_condition(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(0)]),
+            (Instruction.JZ, [Word(3)]),
+            (Instruction.PUSH, [Word(111)]),
+            (Instruction.PUSH, [Word(7)]),
+            (Instruction.JNZ, [Word(6)]),
+            (Instruction.PUSH, [Word(222)]),
+            (Instruction.JO, [Word(0)]),
+        ]
+        self.vm.run(program)
+        self.assertEqual(self.stack(), [])
+
+    def test_call_and_return(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(5)]),
+            (Instruction.CALL, [Word(4)]),
+            (Instruction.PUSH_MUL, [Word(2)]),
+            (Instruction.JMP, [Word(6)]),
+            (Instruction.PUSH_ADD, [Word(10)]),
+            (Instruction.RET, []),
+        ]
+        self.vm.run(program)
+        self.assertEqual(self.stack(), [30])
+
+    def test_blocks_are_decoded_once_with_resolved_targets(self) -> None:
+        bytecode = compile_program(
+            [
+                (Instruction.PUSH, [Word(3)]),
+                (Instruction.PUSH_SUB, [Word(1)]),
+                (Instruction.JNS, [Word(1)]),
+                (Instruction.PUSH, [Word(1)]),
+            ]
+        )
+        decoded = decode_blocks(bytecode)
+        self.assertIs(bytecode.blocks, decoded)
+        self.assertIs(decode_blocks(bytecode), decoded)
+        self.assertEqual(
+            [(block.exit, block.target) for block in decoded.blocks],
+            [(FALLTHROUGH, 1), (decoded.blocks[1].exit, 1), (FALLTHROUGH, 3)],
+        )
+
+    def test_faults(self) -> None:
+        cases: list[tuple[Program, type[Exception]]] = [
+            ([(Instruction.JMP, [Word(2)])], InvalidInstructionError),
+            ([(Instruction.RET, [])], StackUnderflowError),
+            ([(Instruction.JZ, [Word(1)])], StackUnderflowError),
+            ([(Instruction.CALL, [Word(0)])], StackOverflowError),
+        ]
+        for program, error in cases:
+            with self.subTest(program=program), self.assertRaises(error):
+                self.vm.run(program)
+        status = self.vm.run_status(
+            [
+                (Instruction.PUSH, [Word(1)]),
+                (Instruction.JMP, [Word(3)]),
+                (Instruction.PUSH, [Word(5)]),
+                (Instruction.PUSH_DIV, [Word(0)]),
+            ]
+        )
+        self.assertEqual((status.instruction_index, self.vm.executed), (3, 3))
+
+    def test_straight_line_tools_reject_or_skip_control_flow(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.ADD, []),
+            (Instruction.JMP, [Word(4)]),
+        ]
+        self.assertEqual(optimize(program), program)
+        with self.assertRaises(InvalidInstructionError):
+            verify(program, self.config)
+
+    def test_control_flow_is_profiled(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.CALL, [Word(4)]),
+            (Instruction.JNS, [Word(1)]),
+            (Instruction.JMP, [Word(6)]),
+            (Instruction.PUSH_SUB, [Word(1)]),
+            (Instruction.RET, []),
+        ]
+        indices: list[int] = []
+        profile = self.vm.run_profiled(
+            program, trace=lambda index, *_: indices.append(index)
+        )
+        self.assertEqual(indices, [0] + [1, 4, 5, 2] * 3 + [3])
+        self.assertEqual(self.stack(), [-1])
+        self.assertEqual(profile.instructions, 14)
+        self.assertEqual(profile.opcodes[Instruction.CALL].count, 3)
+        self.assertEqual(profile.opcodes[Instruction.JMP].count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 from src.pvm.configuration import Configuration
 from src.pvm.errors import DivisionByZeroError
 from src.pvm.instructions import Instruction
-from src.pvm.types import Word
+from src.pvm.types import Program, Word
 from src.pvm.vm import PhiVM
 
 
@@ -15,7 +15,7 @@ class TestDivOperation(unittest.TestCase):
 
     def test_div_basic(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(20)]),
             (Instruction.PUSH, [Word(5)]),
             (Instruction.DIV, []),
@@ -26,7 +26,7 @@ class TestDivOperation(unittest.TestCase):
 
     def test_div_by_zero(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(5)]),
             (Instruction.PUSH, [Word(0)]),
             (Instruction.DIV, []),
@@ -36,7 +36,7 @@ class TestDivOperation(unittest.TestCase):
 
     def test_div_sign_flag_positive_dividend_negative_divisor(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(10)]),
             (Instruction.PUSH, [Word(-2)]),
             (Instruction.DIV, []),
@@ -49,7 +49,7 @@ class TestDivOperation(unittest.TestCase):
 
     def test_div_sign_flag_negative_dividend_positive_divisor(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(-10)]),
             (Instruction.PUSH, [Word(2)]),
             (Instruction.DIV, []),
@@ -0,0 +1,85 @@
+import unittest
+
+from src.pvm.configuration import Configuration
+from src.pvm.faults import NO_INDEX, Fault, RunStatus
+from src.pvm.instructions import Instruction
+from src.pvm.parallel import run_many
+from src.pvm.types import ProgramList, Word
+from src.pvm.verifier import verify
+from src.pvm.vm import PhiVM
+
+
+def push(*values: int) -> ProgramList:
+    return [(Instruction.PUSH, [Word(value)]) for value in values]
+
+
+class TestRunStatus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def test_completed_run(self) -> None:
+        status = self.vm.run_status(push(1, 2) + [(Instruction.ADD, [])])
+        self.assertEqual(status, RunStatus(Fault.NONE, NO_INDEX, 1025))
+        self.assertTrue(status.ok)
+
+    def test_straight_line_faults(self) -> None:
+        cases = [
+            (push(1, 0) + [(Instruction.DIV, [])] + push(5), Fault.DIVISION_BY_ZERO, 2),
+            (push(1) + [(Instruction.ADD, [])], Fault.STACK_UNDERFLOW, 1),
+            (push(1) + [(Instruction.STORE, [Word(4096)])], Fault.MEMORY_ACCESS, 1),
+            (push(*range(513)), Fault.STACK_OVERFLOW, 512),
+        ]
+        for program, fault, index in cases:
+            with self.subTest(fault=fault):
+                self.vm.reset()
+                status = self.vm.run_status(program)
+                self.assertEqual(
+                    (status.fault, status.instruction_index), (fault, index)
+                )
+                self.assertFalse(status.ok)
+
+    def test_verified_program_fault(self) -> None:
+        program = verify(push(7, 3, 0) + [(Instruction.DIV, [])], self.config)
+        status = self.vm.run_status(program)
+        self.assertEqual(status, RunStatus(Fault.DIVISION_BY_ZERO, 3, 1025))
+
+    def test_control_flow_faults(self) -> None:
+        cases = [
+            (
+                push(1)
+                + [(Instruction.PUSH_DIV, [Word(0)]), (Instruction.JMP, [Word(0)])],
+                1,
+            ),
+            (push(1, 2) + [(Instruction.RET, [])], 2),
+            (push(1) + [(Instruction.JZ, [Word(3)]), (Instruction.JZ, [Word(3)])], 2),
+        ]
+        for program, index in cases:
+            with self.subTest(program=program):
+                self.vm.reset()
+                status = self.vm.run_status(program)
+                self.assertEqual(status.instruction_index, index)
+
+    def test_rejected_program_has_no_index(self) -> None:
+        status = self.vm.run_status([(Instruction.JMP, [Word(5)])])
+        self.assertEqual(status.fault, Fault.INVALID_INSTRUCTION)
+        self.assertEqual(status.instruction_index, NO_INDEX)
+
+
+class TestRunManyFaults(unittest.TestCase):
+    def test_faulting_programs_do_not_abort_the_batch(self) -> None:
+        config = Configuration(
+            memory_size=Word(256), stack_start=Word(128), stack_size=Word(64)
+        )
+        programs = [push(6, value) + [(Instruction.DIV, [])] for value in (3, 0, 2)]
+        results = run_many(programs, config, workers=2, raise_errors=False)
+        self.assertEqual([result.stack for result in results], [[2], [], [3]])
+        statuses = [result.status for result in results]
+        self.assertEqual(statuses[1], RunStatus(Fault.DIVISION_BY_ZERO, 2, 128))
+        self.assertTrue(statuses[0] and statuses[0].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from array import array
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import MemoryAccessError
+from src.pvm.instructions import Instruction
+from src.pvm.types import Word
+from src.pvm.vm import PhiVM
+
+
+class TestMemory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def test_memory_is_packed_int64(self) -> None:
+        assert isinstance(self.vm.memory, array)
+        self.assertEqual(self.vm.memory.typecode, "q")
+        self.assertEqual(self.vm.memory.itemsize * len(self.vm.memory), 2048 * 8)
+
+    def test_stack_view_is_zero_copy(self) -> None:
+        self.vm.run([(Instruction.PUSH, [Word(42)])])
+        view = self.vm.stack_view()
+        self.assertEqual(len(view), self.config.stack_size)
+        self.assertEqual(view[0], 42)
+        view[0] = 7
+        self.assertEqual(self.vm.memory[self.config.stack_start], 7)
+
+    def test_load_and_dump_memory(self) -> None:
+        self.vm.load_memory(10, [1, 2, 3])
+        self.assertEqual(self.vm.dump_memory(9, 14).tolist(), [0, 1, 2, 3, 0])
+
+    def test_dump_is_a_copy(self) -> None:
+        dumped = self.vm.dump_memory(0, 4)
+        dumped[0] = 99
+        self.assertEqual(self.vm.memory[0], 0)
+
+    def test_out_of_range_access(self) -> None:
+        with self.assertRaises(MemoryAccessError):
+            self.vm.load_memory(2047, [1, 2])
+        with self.assertRaises(MemoryAccessError):
+            self.vm.dump_memory(-1, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from array import array
+
+from src.pvm.cache import ResultCache
+from src.pvm.configuration import Configuration
+from src.pvm.errors import MemoryAccessError, StackUnderflowError
+from src.pvm.instructions import Instruction
+from src.pvm.types import InstOperands, Program, ProgramList, Word
+from src.pvm.verifier import verify
+from src.pvm.vm import PhiVM
+
+
+def push(*values: int) -> ProgramList:
+    return [(Instruction.PUSH, [Word(value)]) for value in values]
+
+
+class TestMemoryInstructions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def stack(self) -> list[int]:
+        return self.vm.memory[self.vm.stack_start : self.vm.stack_pointer].tolist()
+
+    def test_load_and_store(self) -> None:
+        self.vm.load_memory(10, [5])
+        self.vm.run(
+            [
+                (Instruction.LOAD, [Word(10)]),
+                (Instruction.PUSH_MUL, [Word(3)]),
+                (Instruction.STORE, [Word(11)]),
+                (Instruction.LOAD, [Word(11)]),
+            ]
+        )
+        self.assertEqual(self.stack(), [15])
+        self.assertEqual(self.vm.dump_memory(10, 12).tolist(), [5, 15])
+
+    def test_bulk_instructions(self) -> None:
+        self.vm.run(
+            push(0, 3, 100)
+            + [(Instruction.MEMSET, [])]
+            + push(50, 0, 100)
+            + [(Instruction.MEMCPY, [])]
+            + push(0, 150)
+            + [(Instruction.MEMSUM, [])]
+        )
+        self.assertEqual(self.stack(), [450])
+        self.assertEqual(self.vm.dump_memory(148, 152).tolist(), [3, 3, 0, 0])
+
+    def test_overlapping_copy(self) -> None:
+        self.vm.load_memory(0, [1, 2, 3, 4])
+        self.vm.run(push(1, 0, 3) + [(Instruction.MEMCPY, [])])
+        self.assertEqual(self.vm.dump_memory(0, 4).tolist(), [1, 1, 2, 3])
+
+    def test_faults(self) -> None:
+        cases: list[tuple[Program, type[Exception]]] = [
+            ([(Instruction.LOAD, [Word(2048)])], MemoryAccessError),
+            (push(1) + [(Instruction.STORE, [Word(-1)])], MemoryAccessError),
+            (push(2040, 0, 9) + [(Instruction.MEMSET, [])], MemoryAccessError),
+            (push(0, 0, -1) + [(Instruction.MEMCPY, [])], MemoryAccessError),
+            (push(0) + [(Instruction.MEMSUM, [])], StackUnderflowError),
+        ]
+        for program, error in cases:
+            with self.subTest(program=program), self.assertRaises(error):
+                self.vm.reset()
+                self.vm.run(program)
+
+    def test_faults_leave_the_operands_on_the_stack(self) -> None:
+        cases: list[tuple[ProgramList, tuple[Instruction, InstOperands]]] = [
+            (push(1), (Instruction.STORE, [Word(-1)])),
+            (push(2040, 0, 9), (Instruction.MEMSET, [])),
+            (push(0, 2040, 9), (Instruction.MEMCPY, [])),
+            (push(2040, 9), (Instruction.MEMSUM, [])),
+        ]
+        for operands, instruction in cases:
+            with self.subTest(instruction=instruction):
+                self.vm.reset()
+                status = self.vm.run_status(operands + [instruction])
+                self.assertFalse(status.ok)
+                self.assertEqual(status.stack_pointer, 1024 + len(operands))
+                self.assertEqual(self.stack(), [operand[1][0] for operand in operands])
+
+    def test_verified_program_and_reset(self) -> None:
+        program = push(7) + [
+            (Instruction.STORE, [Word(3)]),
+            (Instruction.LOAD, [Word(3)]),
+        ]
+        self.vm.run(verify(program, self.config))
+        self.assertEqual(self.stack(), [7])
+        self.vm.reset()
+        assert isinstance(self.vm.memory, array)
+        self.assertFalse(any(self.vm.memory))
+
+    def test_result_cache_bypasses_memory_programs(self) -> None:
+        cache = ResultCache()
+        cache.run(self.vm, [(Instruction.LOAD, [Word(0)])])
+        self.assertEqual((cache.bypasses, len(cache)), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import numpy as np
 
 from src.pvm.configuration import Configuration
 from src.pvm.instructions import Instruction
-from src.pvm.types import Word
+from src.pvm.types import Program, Word
 from src.pvm.vm import PhiVM
 
 
@@ -16,7 +16,7 @@ class TestMulOperation(unittest.TestCase):
 
     def test_mul_basic(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(6)]),
             (Instruction.PUSH, [Word(7)]),
             (Instruction.MUL, []),
@@ -28,7 +28,7 @@ class TestMulOperation(unittest.TestCase):
     def test_mul_overflow(self) -> None:
         vm = PhiVM(self.config)
         large_number = np.iinfo(np.int64).max // 2
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(large_number)]),
             (Instruction.PUSH, [Word(3)]),
             (Instruction.MUL, []),
@@ -40,7 +40,7 @@ class TestMulOperation(unittest.TestCase):
 
     def test_mul_sign_flag(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(-3)]),
             (Instruction.PUSH, [Word(4)]),
             (Instruction.MUL, []),
@@ -0,0 +1,102 @@
+import unittest
+from typing import Optional
+
+import numpy as np
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError
+from src.pvm.instructions import Instruction
+from src.pvm.optimizer import optimize
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+
+    def assert_equivalent(
+        self, program: Program, optimized: Optional[Program] = None
+    ) -> None:
+        expected = PhiVM(self.config)
+        expected.run(program)
+        actual = PhiVM(self.config)
+        actual.run(optimize(program) if optimized is None else optimized)
+        self.assertEqual(actual.stack_pointer, expected.stack_pointer)
+        live = slice(self.config.stack_start, expected.stack_pointer)
+        self.assertEqual(actual.memory[live].tolist(), expected.memory[live].tolist())
+        self.assertEqual(actual.sign_flag, expected.sign_flag)
+        self.assertEqual(actual.overflow_flag, expected.overflow_flag)
+
+    def test_constant_chain_is_folded(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.ADD, []),
+            (Instruction.PUSH, [Word(3)]),
+            (Instruction.MUL, []),
+            (Instruction.PUSH, [Word(4)]),
+            (Instruction.SUB, []),
+        ]
+        self.assertEqual(
+            optimize(program),
+            [(Instruction.PUSH, [Word(9)]), (Instruction.PUSH_SUB, [Word(4)])],
+        )
+        self.assert_equivalent(program)
+
+    def test_final_flags_are_preserved(self) -> None:
+        max_int64 = np.iinfo(np.int64).max
+        program: Program = [
+            (Instruction.PUSH, [Word(max_int64)]),
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.ADD, []),
+        ]
+        self.assertEqual(len(optimize(program)), 2)
+        self.assert_equivalent(program)
+
+    def test_push_is_fused_with_non_constant_operand(self) -> None:
+        # The ADD consumes a value already on the stack, so it cannot be folded
+        program: ProgramList = [
+            (Instruction.PUSH, [Word(7)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.DIV, []),
+            (Instruction.ADD, []),
+            (Instruction.PUSH, [Word(5)]),
+            (Instruction.MUL, []),
+        ]
+        self.assertEqual(
+            optimize(program),
+            [(Instruction.PUSH_ADD, [Word(3)]), (Instruction.PUSH_MUL, [Word(5)])],
+        )
+        prelude: ProgramList = [(Instruction.PUSH, [Word(-6)])]
+        self.assert_equivalent(prelude + program, prelude + optimize(program))
+
+    def test_division_by_zero_is_not_folded(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(5)]),
+            (Instruction.PUSH, [Word(0)]),
+            (Instruction.DIV, []),
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.ADD, []),
+        ]
+        for optimized in (optimize(program), optimize(program[:3])):
+            with self.subTest(optimized=optimized):
+                self.assertEqual(optimized[:3], program[:3])
+                expected = PhiVM(self.config)
+                with self.assertRaises(DivisionByZeroError):
+                    expected.run(program)
+                vm = PhiVM(self.config)
+                with self.assertRaises(DivisionByZeroError):
+                    vm.run(optimized)
+                self.assertEqual(vm.stack_pointer, expected.stack_pointer)
+
+    def test_divisor_truncated_to_zero_is_not_fused(self) -> None:
+        program: Program = [(Instruction.PUSH, [Word(256)]), (Instruction.DIV, [])]
+        self.assertEqual(optimize(program, word_bits=8), program)
+        self.assertEqual(optimize(program), [(Instruction.PUSH_DIV, [Word(256)])])
+
+
+if __name__ == "__main__":
+    unittest.main()
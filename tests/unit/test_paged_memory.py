@@ -0,0 +1,146 @@
+import unittest
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import ConfigurationError, MemoryAccessError
+from src.pvm.instructions import Instruction
+from src.pvm.memory import PagedMemory
+from src.pvm.types import Word
+from src.pvm.vm import PhiVM
+
+
+class TestPagedMemory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.memory = PagedMemory(1 << 20, page_size=16)
+
+    def test_untouched_pages_read_as_zero(self) -> None:
+        self.assertEqual(self.memory.item(12345), 0)
+        self.assertEqual(self.memory[100:110].tolist(), [0] * 10)
+        self.assertEqual(self.memory.resident_pages, 0)
+
+    def test_writes_allocate_pages_on_demand(self) -> None:
+        self.memory[5] = 7
+        self.memory[30:50] = range(20)
+        self.assertEqual(self.memory[-(1 << 20) + 5], 7)
+        self.assertEqual(self.memory[28:34].tolist(), [0, 0, 0, 1, 2, 3])
+        self.assertEqual(self.memory.resident_pages, 4)
+
+    def test_zeroed_pages_are_released(self) -> None:
+        self.memory.fill(0, 64, 1)
+        self.memory.fill(8, 40, 0)
+        self.assertEqual(self.memory.resident_pages, 3)
+        self.assertEqual(self.memory[6:10].tolist(), [1, 1, 0, 0])
+        self.memory.fill(0, 8, 0)
+        self.assertEqual(self.memory.resident_pages, 2)
+        with self.assertRaises(IndexError):
+            self.memory.__getitem__(1 << 20)
+
+    def test_copy_reads_only_resident_pages(self) -> None:
+        self.memory[10:14] = [1, 2, 3, 4]
+        self.memory[100] = 9
+        self.memory.copy(12, 10, 4)
+        self.assertEqual(self.memory[10:16].tolist(), [1, 2, 1, 2, 3, 4])
+        self.memory.copy(96, 1000, 8)
+        self.assertEqual(self.memory.item(100), 0)
+        self.assertEqual(self.memory.resident_pages, 1)
+        self.memory.copy(1 << 19, 8, 16)
+        self.assertEqual(
+            self.memory[(1 << 19) + 2 : (1 << 19) + 9].tolist(), [1, 2, 1, 2, 3, 4, 0]
+        )
+        self.assertEqual(self.memory.resident_pages, 2)
+
+    def test_saves_copy_only_pages_written_since(self) -> None:
+        self.memory[5] = 1
+        self.memory[40] = 2
+        first = self.memory.save_pages()
+        self.memory[40] = 3
+        self.memory[100] = 4
+        second = self.memory.save_pages()
+        self.assertIs(second[0], first[0])
+        self.assertIsNot(second[2], first[2])
+        self.memory.load_pages(first)
+        self.assertEqual(
+            (self.memory.item(40), self.memory.item(100), self.memory.resident_pages),
+            (2, 0, 2),
+        )
+        self.memory[5] = 8
+        self.memory.fill(32, 48, 0)
+        self.memory.load_pages(first)
+        self.assertEqual((self.memory.item(5), self.memory.item(40)), (1, 2))
+        self.assertEqual((first[0][5], first[2][8]), (1, 2))
+
+
+class TestPagedVM(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(1 << 32), stack_start=Word(1 << 31), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def test_large_address_space_is_paged(self) -> None:
+        assert isinstance(self.vm.memory, PagedMemory)
+        self.vm.run(
+            [
+                (Instruction.PUSH, [Word(6)]),
+                (Instruction.PUSH_MUL, [Word(7)]),
+                (Instruction.STORE, [Word((1 << 32) - 1)]),
+                (Instruction.LOAD, [Word((1 << 32) - 1)]),
+            ]
+        )
+        self.assertEqual(self.vm.stack_view()[0], 42)
+        self.assertEqual(self.vm.memory.resident_pages, 2)
+        with self.assertRaises(MemoryAccessError):
+            self.vm.execute_instruction(Instruction.LOAD, [Word(1 << 32)])
+
+    def test_bulk_instructions_skip_untouched_pages(self) -> None:
+        assert isinstance(self.vm.memory, PagedMemory)
+        self.vm.load_memory(5, [20, 22])
+        self.vm.run(
+            [
+                (Instruction.PUSH, [Word(3 << 30)]),
+                (Instruction.PUSH, [Word(0)]),
+                (Instruction.PUSH, [Word(1 << 30)]),
+                (Instruction.MEMCPY, []),
+                (Instruction.PUSH, [Word(0)]),
+                (Instruction.PUSH, [Word(1 << 31)]),
+                (Instruction.MEMSUM, []),
+            ]
+        )
+        self.assertEqual(self.vm.stack_view()[0], 42)
+        self.assertEqual(self.vm.memory.item((3 << 30) + 6), 22)
+        self.assertEqual(self.vm.memory.resident_pages, 3)
+
+    def test_reset_and_restore_release_pages(self) -> None:
+        assert isinstance(self.vm.memory, PagedMemory)
+        snapshot = self.vm.snapshot()
+        self.vm.load_memory(1 << 20, [1, 2, 3])
+        self.vm.execute_instruction(Instruction.PUSH, [Word(9)])
+        self.vm.restore(snapshot)
+        self.assertEqual(self.vm.stack_pointer, self.vm.stack_start)
+        self.assertEqual(self.vm.memory.item(1 << 20), 0)
+        self.vm.load_memory(0, [1])
+        self.vm.reset()
+        self.assertEqual(self.vm.memory.resident_pages, 0)
+
+    def test_snapshots_save_resident_pages_not_the_dirty_range(self) -> None:
+        assert isinstance(self.vm.memory, PagedMemory)
+        self.vm.load_memory(0, [1])
+        self.vm.load_memory((1 << 32) - 1, [2])
+        self.vm.execute_instruction(Instruction.PUSH, [Word(3)])
+        snapshot = self.vm.snapshot()
+        self.vm.load_memory(1 << 20, [4])
+        self.vm.execute_instruction(Instruction.PUSH, [Word(5)])
+        self.vm.restore(snapshot)
+        self.assertEqual(self.vm.memory.resident_pages, 3)
+        self.assertEqual(self.vm.memory.item((1 << 32) - 1), 2)
+        self.assertEqual(self.vm.memory.item(1 << 20), 0)
+        self.assertEqual(self.vm.stack_pointer, self.vm.stack_start + 1)
+        self.vm.reset()
+        self.assertEqual(self.vm.memory.resident_pages, 0)
+
+    def test_memory_must_match_configuration(self) -> None:
+        with self.assertRaises(ConfigurationError):
+            PhiVM(self.config, memory=PagedMemory(1024))
+
+
+if __name__ == "__main__":
+    unittest.main()
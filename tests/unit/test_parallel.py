@@ -0,0 +1,49 @@
+import unittest
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError
+from src.pvm.instructions import Instruction
+from src.pvm.parallel import RunResult, run_many
+from src.pvm.types import Program, Word
+
+
+class TestRunMany(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(256), stack_start=Word(128), stack_size=Word(64)
+        )
+        self.programs: list[Program] = [
+            [
+                (Instruction.PUSH, [Word(value)]),
+                (Instruction.PUSH, [Word(10)]),
+                (Instruction.SUB, []),
+            ]
+            for value in range(20)
+        ]
+
+    def test_results_are_in_submission_order(self) -> None:
+        results = run_many(self.programs, self.config, workers=2)
+        self.assertEqual(
+            [result.stack for result in results], [[v - 10] for v in range(20)]
+        )
+        self.assertEqual(results[3], RunResult([-7], 1, 0))
+        self.assertEqual(results[15], RunResult([5], 0, 0))
+
+    def test_worker_vm_is_reset_between_programs(self) -> None:
+        results = run_many(self.programs, self.config, workers=1)
+        self.assertTrue(all(len(result.stack) == 1 for result in results))
+
+    def test_errors_are_propagated(self) -> None:
+        programs = self.programs + [
+            [
+                (Instruction.PUSH, [Word(1)]),
+                (Instruction.PUSH, [Word(0)]),
+                (Instruction.DIV, []),
+            ]
+        ]
+        with self.assertRaises(DivisionByZeroError):
+            run_many(programs, self.config, workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
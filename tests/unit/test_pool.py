@@ -0,0 +1,107 @@
+import unittest
+from array import array
+
+from src.pvm.configuration import Configuration
+from src.pvm.instructions import Instruction
+from src.pvm.pool import VMPool
+from src.pvm.types import Word
+from src.pvm.vm import PhiVM
+
+
+def memory_words(vm: PhiVM) -> list[int]:
+    assert isinstance(vm.memory, array)
+    return vm.memory.tolist()
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def test_reset_clears_stack_flags_and_loaded_memory(self) -> None:
+        self.vm.load_memory(10, [1, 2, 3])
+        self.vm.run([(Instruction.PUSH, [Word(-1)]), (Instruction.PUSH, [Word(2)])])
+        self.vm.execute_instruction(Instruction.MUL, [])
+        self.vm.reset()
+        self.assertEqual(self.vm.stack_pointer, self.vm.stack_start)
+        self.assertEqual((self.vm.sign_flag, self.vm.overflow_flag), (0, 0))
+        self.assertFalse(any(memory_words(self.vm)))
+
+    def test_restore_returns_to_snapshot(self) -> None:
+        self.vm.load_memory(100, [7, 8])
+        self.vm.execute_instruction(Instruction.PUSH, [Word(5)])
+        snapshot = self.vm.snapshot()
+
+        self.vm.load_memory(1500, [9])
+        self.vm.run([(Instruction.PUSH, [Word(-9)]), (Instruction.ADD, [])])
+        self.vm.restore(snapshot)
+
+        self.assertEqual(self.vm.stack_view()[:2].tolist(), [5, 0])
+        self.assertEqual(self.vm.sign_flag, 0)
+        self.assertEqual(self.vm.dump_memory(100, 102).tolist(), [7, 8])
+        self.assertEqual(self.vm.memory[1500], 0)
+
+    def test_restore_round_trips_all_of_memory(self) -> None:
+        self.vm.load_memory(10, [4])
+        self.vm.run(
+            [
+                (Instruction.PUSH, [Word(1)]),
+                (Instruction.PUSH, [Word(2)]),
+                (Instruction.ADD, []),
+            ]
+        )
+        expected = memory_words(self.vm)
+        snapshot = self.vm.snapshot()
+        self.vm.run(
+            [
+                (Instruction.PUSH, [Word(5)]),
+                (Instruction.PUSH, [Word(6)]),
+                (Instruction.PUSH, [Word(7)]),
+                (Instruction.MUL, []),
+                (Instruction.STORE, [Word(20)]),
+            ]
+        )
+        self.vm.restore(snapshot)
+        self.assertEqual(memory_words(self.vm), expected)
+        self.assertEqual(self.vm.stack_pointer, self.vm.stack_start + 1)
+        self.vm.reset()
+        self.assertFalse(any(memory_words(self.vm)))
+
+    def test_snapshot_is_independent_of_later_writes(self) -> None:
+        self.vm.execute_instruction(Instruction.PUSH, [Word(1)])
+        snapshot = self.vm.snapshot()
+        self.vm.execute_instruction(Instruction.PUSH_ADD, [Word(41)])
+        self.assertEqual(snapshot.stack.tolist(), [1])
+        self.vm.restore(snapshot)
+        self.assertEqual(self.vm.stack_view()[:2].tolist(), [1, 0])
+
+
+class TestVMPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.pool = VMPool(max_idle=2)
+
+    def test_released_vm_is_reused_in_initial_state(self) -> None:
+        with self.pool.vm(self.config) as vm:
+            vm.load_memory(0, [1])
+            vm.execute_instruction(Instruction.PUSH, [Word(3)])
+        self.assertIs(self.pool.acquire(self.config), vm)
+        self.assertEqual(vm.stack_pointer, vm.stack_start)
+        self.assertFalse(any(memory_words(vm)))
+
+    def test_vms_are_pooled_per_configuration(self) -> None:
+        other = Configuration(
+            memory_size=Word(64), stack_start=Word(0), stack_size=Word(64)
+        )
+        self.pool.prefill(self.config, 5)
+        self.assertEqual(self.pool.idle(self.config), 2)
+        self.assertEqual(self.pool.idle(other), 0)
+        self.assertEqual(len(self.pool.acquire(other).memory), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
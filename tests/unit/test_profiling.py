@@ -0,0 +1,71 @@
+import json
+import unittest
+from array import array
+
+import numpy as np
+
+from src.pvm.configuration import Configuration
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        max_int64 = np.iinfo(np.int64).max
+        self.program: Program = [
+            (Instruction.PUSH, [Word(max_int64)]),
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.MUL, []),
+            (Instruction.ADD, []),
+            (Instruction.PUSH, [Word(4)]),
+            (Instruction.ADD, []),
+        ]
+
+    def test_profile_counts(self) -> None:
+        vm = PhiVM(self.config)
+        profile = vm.run_profiled(self.program)
+        self.assertEqual(profile.instructions, 7)
+        self.assertEqual(profile.opcodes[Instruction.PUSH].count, 4)
+        self.assertEqual(profile.opcodes[Instruction.ADD].count, 2)
+        self.assertEqual(profile.opcodes[Instruction.ADD].overflows, 1)
+        self.assertEqual(profile.opcodes[Instruction.PUSH].overflows, 0)
+        self.assertNotIn(Instruction.DIV, profile.opcodes)
+        self.assertEqual(profile.max_stack_depth, 3)
+
+    def test_profiled_run_matches_plain_run(self) -> None:
+        expected = PhiVM(self.config)
+        expected.run(self.program)
+        actual = PhiVM(self.config)
+        actual.run_profiled(self.program)
+        assert isinstance(actual.memory, array) and isinstance(expected.memory, array)
+        self.assertEqual(actual.memory.tolist(), expected.memory.tolist())
+        self.assertEqual(actual.overflow_flag, expected.overflow_flag)
+
+    def test_trace_callback(self) -> None:
+        seen = []
+        vm = PhiVM(self.config)
+        vm.run_profiled(
+            self.program,
+            trace=lambda index, instruction, _, machine: seen.append(
+                (index, instruction, int(machine.stack_pointer))
+            ),
+        )
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen[3], (3, Instruction.MUL, 1026))
+
+    def test_json_export(self) -> None:
+        profile = PhiVM(self.config).run_profiled(self.program)
+        profile.merge(PhiVM(self.config).run_profiled(self.program))
+        summary = json.loads(profile.to_json())
+        self.assertEqual(summary["instructions"], 14)
+        self.assertEqual(summary["opcodes"]["MUL"]["count"], 2)
+        self.assertGreaterEqual(summary["time_ns"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from src.pvm.bytecode import compile_program
+from src.pvm.configuration import Configuration
+from src.pvm.errors import InvalidInstructionError, ProgramFormatError
+from src.pvm.instructions import Instruction
+from src.pvm.program_file import load_programs, save_programs
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+
+class TestProgramFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.programs: list[Program] = [
+            [(Instruction.PUSH, [Word(4)]), (Instruction.PUSH_MUL, [Word(-3)])],
+            [],
+            [
+                (Instruction.PUSH, [Word(9)]),
+                (Instruction.PUSH, [Word(2)]),
+                (Instruction.DIV, []),
+            ],
+        ]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "corpus.pvm")
+
+    def test_round_trip(self) -> None:
+        save_programs(self.path, self.programs)
+        with load_programs(self.path) as corpus:
+            self.assertEqual(len(corpus), 3)
+            for loaded, program in zip(corpus, self.programs):
+                self.assertEqual(loaded.digest(), compile_program(program).digest())
+
+    def test_loaded_program_runs_on_vm(self) -> None:
+        save_programs(self.path, self.programs)
+        with load_programs(self.path) as corpus:
+            program = corpus[-1]
+            self.assertIsInstance(program.opcodes, memoryview)
+            vm = PhiVM(self.config)
+            vm.run(program)
+            self.assertEqual(vm.memory[vm.stack_pointer - 1], 4)
+            restored = pickle.loads(pickle.dumps(program))
+            self.assertEqual(restored.digest(), program.digest())
+        self.assertTrue(corpus.closed)
+        vm.reset()
+        vm.run(program)
+        self.assertEqual(vm.memory[vm.stack_pointer - 1], 4)
+
+    def test_corpus_closes_while_programs_are_referenced(self) -> None:
+        save_programs(self.path, self.programs)
+        vm = PhiVM(self.config)
+        with load_programs(self.path) as corpus:
+            for program in corpus:
+                vm.run(program)
+        self.assertTrue(corpus.closed)
+        corpus.close()
+        with self.assertRaises(ValueError):
+            corpus.__getitem__(0)
+        clean = load_programs(self.path)
+        clean.close()
+        self.assertTrue(clean.closed)
+
+    def test_control_flow_is_read_from_the_index(self) -> None:
+        loop = [(Instruction.PUSH, [Word(3)]), (Instruction.JMP, [Word(2)])]
+        save_programs(self.path, [*self.programs, loop])
+        with load_programs(self.path) as corpus:
+            self.assertEqual(
+                [program.has_control_flow for program in corpus],
+                [False, False, False, True],
+            )
+
+    def test_unknown_opcode_is_rejected(self) -> None:
+        save_programs(self.path, self.programs)
+        with open(self.path, "r+b") as file:
+            # The first opcode follows the header and the 5 immediates
+            file.seek(32 + 8 * 5)
+            file.write(b"\xff")
+        with self.assertRaises(InvalidInstructionError):
+            load_programs(self.path, verify_checksum=False)
+
+    def test_corrupted_file_is_rejected(self) -> None:
+        save_programs(self.path, self.programs)
+        with open(self.path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"\x02")
+        with self.assertRaisesRegex(ProgramFormatError, "checksum"):
+            load_programs(self.path)
+
+    def test_not_a_program_file(self) -> None:
+        with open(self.path, "wb") as file:
+            file.write(b"not a program file at all, just some bytes")
+        with self.assertRaises(ProgramFormatError):
+            load_programs(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import random
+import unittest
+from array import array
+
+from src.pvm.arithmetic import MAX_WORD, MIN_WORD, add, mul
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    DivisionByZeroError,
+    InvalidInstructionError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.registers import RegisterInstruction, translate
+from src.pvm.types import Program, ProgramList, Word
+from src.pvm.vm import PhiVM
+
+
+class TestRegisters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(64), stack_start=Word(16), stack_size=Word(8)
+        )
+
+    def assert_same_state(self, actual: PhiVM, expected: PhiVM) -> None:
+        self.assertEqual(actual.stack_pointer, expected.stack_pointer)
+        assert isinstance(actual.memory, array) and isinstance(expected.memory, array)
+        self.assertEqual(actual.memory.tolist(), expected.memory.tolist())
+        self.assertEqual(actual.sign_flag, expected.sign_flag)
+        self.assertEqual(actual.overflow_flag, expected.overflow_flag)
+
+    def test_translation_is_three_address(self) -> None:
+        translated = translate(
+            [
+                (Instruction.PUSH, [Word(2)]),
+                (Instruction.PUSH, [Word(3)]),
+                (Instruction.ADD, []),
+                (Instruction.PUSH_MUL, [Word(2)]),
+            ]
+        )
+        self.assertEqual(
+            translated.instructions,
+            (RegisterInstruction(add, 2, 0, 1), RegisterInstruction(mul, 3, 2, 0)),
+        )
+        self.assertEqual(translated.registers, (2, 3, 0, 0))
+        self.assertEqual(translated.outputs, ((0, 3), (1, 1)))
+
+    def test_random_programs_match_interpreter(self) -> None:
+        rng = random.Random(4321)
+        values = [0, 1, -1, 3, -7, MAX_WORD, MIN_WORD]
+        binary = [Instruction.ADD, Instruction.SUB, Instruction.MUL, Instruction.DIV]
+        fused = [Instruction.PUSH_SUB, Instruction.PUSH_DIV]
+        for _ in range(200):
+            program: ProgramList = []
+            depth = 0
+            for _ in range(rng.randint(1, 12)):
+                if depth >= 2 and rng.random() < 0.5:
+                    program.append((rng.choice(binary), []))
+                    depth -= 1
+                elif depth >= 1 and rng.random() < 0.3:
+                    program.append((rng.choice(fused), [Word(rng.choice(values))]))
+                elif depth < 8:
+                    program.append((Instruction.PUSH, [Word(rng.choice(values))]))
+                    depth += 1
+            expected = PhiVM(self.config)
+            actual = PhiVM(self.config)
+            try:
+                expected.run(program)
+            except DivisionByZeroError:
+                with self.assertRaises(DivisionByZeroError):
+                    translate(program)(actual)
+            else:
+                translate(program)(actual)
+            self.assert_same_state(actual, expected)
+            self.assertEqual(actual.executed, expected.executed)
+
+    def test_program_consuming_caller_stack(self) -> None:
+        prelude: ProgramList = [(Instruction.PUSH, [Word(v)]) for v in (2, 9, 4)]
+        program: ProgramList = [
+            (Instruction.SUB, []),
+            (Instruction.ADD, []),
+            (Instruction.PUSH_MUL, [Word(-1)]),
+        ]
+        expected = PhiVM(self.config)
+        expected.run(prelude + program)
+        actual = PhiVM(self.config)
+        actual.run(prelude)
+        translate(program)(actual)
+        self.assert_same_state(actual, expected)
+        self.assertEqual(translate(program).required, 3)
+
+    def test_faults_match_interpreter(self) -> None:
+        vm = PhiVM(self.config)
+        with self.assertRaises(StackUnderflowError):
+            translate([(Instruction.PUSH, [Word(1)]), (Instruction.ADD, [])])(vm)
+        self.assertEqual(vm.stack_pointer, self.config.stack_start + 1)
+        with self.assertRaises(InvalidInstructionError):
+            translate([(Instruction.LOAD, [Word(0)])])
+
+    def test_translations_are_cached(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH_ADD, [Word(2)]),
+        ]
+        self.assertIs(translate(program), translate(list(program)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import unittest
+
+from src.pvm.configuration import Configuration
+from src.pvm.instructions import Instruction
+from src.pvm.server import ExecutionResult, ExecutionService, serve
+from src.pvm.types import Program, ProgramList, Word
+
+
+def product(value: int) -> ProgramList:
+    return [
+        (Instruction.PUSH, [Word(value)]),
+        (Instruction.PUSH, [Word(-2)]),
+        (Instruction.MUL, []),
+    ]
+
+
+class TestExecutionService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+
+    async def test_concurrent_requests_are_batched_on_one_vm(self) -> None:
+        async with ExecutionService(workers=2) as service:
+            results = await asyncio.gather(
+                *(service.execute(self.config, product(v)) for v in range(50))
+            )
+            self.assertEqual(service.pool.idle(self.config), 1)
+        self.assertEqual(
+            [result.top for result in results], [-2 * v for v in range(50)]
+        )
+        self.assertEqual(results[1], ExecutionResult(-2, 1, 0))
+
+    async def test_errors_are_reported_by_class_name(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH_DIV, [Word(0)]),
+        ]
+        async with ExecutionService() as service:
+            result = await service.execute(self.config, program)
+            empty = await service.execute(self.config, [])
+        self.assertEqual(result.error, "DivisionByZeroError")
+        self.assertEqual(empty, ExecutionResult(None, 0, 0))
+
+    async def test_control_flow_programs_run(self) -> None:
+        countdown: Program = [
+            (Instruction.PUSH, [Word(999)]),
+            (Instruction.PUSH_SUB, [Word(1)]),
+            (Instruction.JNS, [Word(1)]),
+        ]
+        async with ExecutionService() as service:
+            result = await service.execute(self.config, countdown)
+        self.assertEqual(result, ExecutionResult(-1, 1, 0))
+
+    async def test_endless_loops_do_not_block_other_requests(self) -> None:
+        endless: Program = [(Instruction.JMP, [Word(0)])]
+        async with ExecutionService(
+            workers=1, yield_every=100, max_instructions=10_000
+        ) as service:
+            results = await asyncio.gather(
+                service.execute(self.config, endless),
+                service.execute(self.config, product(4)),
+            )
+        self.assertEqual(results[0].error, "InstructionLimitError")
+        self.assertEqual(results[1], ExecutionResult(-8, 1, 0))
+
+    async def test_unexpected_errors_fail_only_their_request(self) -> None:
+        too_wide: Program = [(Instruction.PUSH, [Word(2**70)])]
+        async with ExecutionService(workers=1) as service:
+            results = await asyncio.gather(
+                service.execute(self.config, too_wide),
+                service.execute(self.config, product(4)),
+                return_exceptions=True,
+            )
+        self.assertIsInstance(results[0], OverflowError)
+        self.assertEqual(results[1], ExecutionResult(-8, 1, 0))
+
+    async def test_long_programs_yield_to_short_ones(self) -> None:
+        other = Configuration(
+            memory_size=Word(64), stack_start=Word(0), stack_size=Word(64)
+        )
+        long_program: ProgramList = [(Instruction.PUSH, [Word(0)])]
+        long_program += [(Instruction.PUSH_ADD, [Word(1)])] * 50_000
+        finished: list[str] = []
+
+        async def run(name: str, config: Configuration, program: Program) -> None:
+            await service.execute(config, program)
+            finished.append(name)
+
+        async with ExecutionService(workers=2, yield_every=100) as service:
+            await asyncio.gather(
+                run("long", self.config, long_program),
+                run("short", other, product(3)),
+            )
+        self.assertEqual(finished, ["short", "long"])
+
+    async def test_json_lines_over_tcp(self) -> None:
+        config = {"memory_size": 2048, "stack_start": 1024, "stack_size": 512}
+        requests = [
+            {"id": 1, "config": config, "program": [["PUSH", 6], ["PUSH_MUL", 7]]},
+            {"id": 2, "config": config, "program": [["POP"]]},
+            {"id": 3, "config": config, "program": [["ADD"]]},
+            {"id": 4, "config": config, "program": [["PUSH", 2**70]]},
+        ]
+        async with ExecutionService() as service:
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                for request in requests:
+                    writer.write(json.dumps(request).encode() + b"\n")
+                writer.write(b"not json\n")
+                writer.write_eof()
+                lines = [json.loads(line) async for line in reader]
+                writer.close()
+        responses = {response["id"]: response for response in lines}
+        self.assertEqual(
+            responses[1], {"id": 1, "top": 42, "sign_flag": 0, "overflow_flag": 0}
+        )
+        self.assertEqual(responses[2]["error"], "InvalidInstructionError")
+        self.assertEqual(responses[3]["error"], "StackUnderflowError")
+        self.assertEqual(responses[4]["error"], "OverflowError")
+        self.assertEqual(responses[None]["error"], "JSONDecodeError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import ConfigurationError
+from src.pvm.instructions import Instruction
+from src.pvm.memory import word_view
+from src.pvm.shared import SharedWords
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+MEMORY_SIZE = 2048
+DATA_SIZE = 100
+RESULTS = 1000
+
+
+def worker_config(worker: int) -> Configuration:
+    return Configuration(
+        memory_size=Word(MEMORY_SIZE),
+        stack_start=Word(1024 + 64 * worker),
+        stack_size=Word(64),
+    )
+
+
+def sum_data(name: str, worker: int) -> None:
+    shared = SharedWords(MEMORY_SIZE, name)
+    program: Program = [
+        (Instruction.PUSH, [Word(0)]),
+        (Instruction.PUSH, [Word(DATA_SIZE)]),
+        (Instruction.MEMSUM, []),
+        (Instruction.PUSH_ADD, [Word(worker)]),
+        (Instruction.STORE, [Word(RESULTS + worker)]),
+    ]
+    PhiVM(worker_config(worker), memory=shared.words).run(program)
+    shared.close()
+
+
+class TestSharedMemory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+
+    def test_vm_over_a_buffer(self) -> None:
+        buffer = bytearray(2048 * 8)
+        vm = PhiVM(self.config, memory=word_view(buffer))
+        vm.load_memory(0, [1, 2, 3])
+        vm.run([(Instruction.PUSH, [Word(0)]), (Instruction.PUSH, [Word(3)])])
+        vm.run([(Instruction.MEMSUM, []), (Instruction.STORE, [Word(5)])])
+        self.assertEqual(word_view(buffer)[5], 6)
+        snapshot = vm.snapshot()
+        vm.load_memory(0, [9])
+        vm.restore(snapshot)
+        self.assertEqual(vm.dump_memory(0, 6).tolist(), [1, 2, 3, 0, 0, 6])
+        vm.reset()
+        self.assertFalse(any(buffer))
+
+    def test_invalid_buffers(self) -> None:
+        for buffer in (bytes(64), bytearray(60)):
+            with self.subTest(size=len(buffer)), self.assertRaises(ConfigurationError):
+                word_view(buffer)
+        with self.assertRaises(ConfigurationError):
+            PhiVM(self.config, memory=word_view(bytearray(64)))
+
+    def test_workers_share_one_block(self) -> None:
+        with SharedWords(MEMORY_SIZE) as shared:
+            loader = PhiVM(worker_config(0), memory=shared.words)
+            loader.load_memory(0, range(DATA_SIZE))
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                list(executor.map(sum_data, [shared.name] * 4, range(4)))
+            self.assertEqual(
+                loader.dump_memory(RESULTS, RESULTS + 4).tolist(),
+                [4950, 4951, 4952, 4953],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from typing import Iterator
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import DivisionByZeroError, InvalidInstructionError
+from src.pvm.instructions import Instruction
+from src.pvm.stream import ProgramRunner, StreamRunner, run_stream
+from src.pvm.types import InstOperands, Program, Word
+from src.pvm.vm import PhiVM
+
+
+def counter(limit: int) -> Iterator[tuple[Instruction, InstOperands]]:
+    yield Instruction.PUSH, [Word(0)]
+    for _ in range(limit):
+        yield Instruction.PUSH_ADD, [Word(1)]
+
+
+class TestStreamRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+
+    def test_runs_stream_to_its_end(self) -> None:
+        runner = StreamRunner(self.vm, counter(10_000))
+        self.assertEqual(runner.run(), 10_001)
+        self.assertTrue(runner.done)
+        self.assertEqual(self.vm.stack_view()[0], 10_000)
+
+    def test_pauses_and_resumes_with_fuel(self) -> None:
+        runner = StreamRunner(self.vm, counter(9))
+        self.assertEqual(runner.run(fuel=4), 4)
+        self.assertFalse(runner.done)
+        self.assertEqual(self.vm.stack_view()[0], 3)
+        self.assertEqual(runner.run(fuel=4), 4)
+        self.assertEqual(runner.run(fuel=4), 2)
+        self.assertTrue(runner.done)
+        self.assertEqual(runner.executed, 10)
+        self.assertEqual(self.vm.stack_view()[0], 9)
+
+    def test_run_stream_resumes_on_same_iterator(self) -> None:
+        stream = counter(5)
+        self.assertEqual(run_stream(self.vm, stream, fuel=3), 3)
+        self.assertEqual(run_stream(self.vm, stream), 3)
+        self.assertEqual(self.vm.stack_view()[0], 5)
+
+    def test_error_consumes_faulting_instruction(self) -> None:
+        stream = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH_DIV, [Word(0)]),
+            (Instruction.PUSH_ADD, [Word(2)]),
+        ]
+        runner = StreamRunner(self.vm, stream)
+        with self.assertRaises(DivisionByZeroError):
+            runner.run()
+        self.assertEqual(runner.executed, 1)
+        self.assertEqual(runner.run(), 1)
+        self.assertEqual(self.vm.stack_view()[0], 3)
+
+    def test_push_truncates_on_a_narrow_vm(self) -> None:
+        vm = PhiVM(
+            Configuration(
+                memory_size=Word(2048),
+                stack_start=Word(1024),
+                stack_size=Word(512),
+                word_bits=8,
+            )
+        )
+        stream = [(Instruction.PUSH, [Word(300)]), (Instruction.PUSH_ADD, [Word(1)])]
+        self.assertEqual(StreamRunner(vm, stream).run(), 2)
+        self.assertEqual(vm.stack_view()[0], 45)
+
+    def test_invalid_operands_are_rejected(self) -> None:
+        runner = StreamRunner(self.vm, [(Instruction.ADD, [Word(1)])])
+        with self.assertRaises(InvalidInstructionError):
+            runner.run()
+        with self.assertRaises(ValueError):
+            runner.run(fuel=-1)
+
+
+class TestProgramRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+        self.vm = PhiVM(self.config)
+        self.countdown: Program = [
+            (Instruction.PUSH, [Word(9)]),
+            (Instruction.PUSH_SUB, [Word(1)]),
+            (Instruction.PUSH_ADD, [Word(0)]),
+            (Instruction.JNS, [Word(1)]),
+        ]
+
+    def test_slices_match_a_whole_run(self) -> None:
+        expected = PhiVM(self.config)
+        expected.run(self.countdown)
+        for fuel in (1, 2, 3, 5, 100):
+            with self.subTest(fuel=fuel):
+                self.vm.reset()
+                runner = ProgramRunner(self.vm, self.countdown)
+                slices = []
+                while not runner.done:
+                    slices.append(runner.run(fuel))
+                self.assertEqual(runner.executed, expected.executed)
+                self.assertTrue(all(executed <= fuel for executed in slices[:-1]))
+                self.assertEqual(self.vm.stack_pointer, 1025)
+                self.assertEqual(self.vm.memory[1024], -1)
+                self.assertEqual(self.vm.sign_flag, 1)
+
+    def test_endless_loop_runs_in_slices(self) -> None:
+        runner = ProgramRunner(self.vm, [(Instruction.JMP, [Word(0)])])
+        for _ in range(3):
+            self.assertEqual(runner.run(fuel=1000), 1000)
+        self.assertFalse(runner.done)
+        self.assertEqual(runner.executed, 3000)
+
+    def test_fault_in_a_resumed_block(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.PUSH_DIV, [Word(0)]),
+            (Instruction.JMP, [Word(0)]),
+        ]
+        runner = ProgramRunner(self.vm, program)
+        runner.run(fuel=1)
+        with self.assertRaises(DivisionByZeroError):
+            runner.run()
+        self.assertEqual(runner.executed, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
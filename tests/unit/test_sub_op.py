@@ -4,7 +4,7 @@ import numpy as np
 
 from src.pvm.configuration import Configuration
 from src.pvm.instructions import Instruction
-from src.pvm.types import Word
+from src.pvm.types import Program, Word
 from src.pvm.vm import PhiVM
 
 
@@ -16,7 +16,7 @@ class TestSubOperation(unittest.TestCase):
 
     def test_sub_basic(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(10)]),
             (Instruction.PUSH, [Word(5)]),
             (Instruction.SUB, []),
@@ -27,7 +27,7 @@ class TestSubOperation(unittest.TestCase):
 
     def test_sub_negative_result(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(5)]),
             (Instruction.PUSH, [Word(10)]),
             (Instruction.SUB, []),
@@ -38,7 +38,7 @@ class TestSubOperation(unittest.TestCase):
 
     def test_sub_sign_flag(self) -> None:
         vm = PhiVM(self.config)
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(5)]),
             (Instruction.PUSH, [Word(10)]),
             (Instruction.SUB, []),
@@ -49,7 +49,7 @@ class TestSubOperation(unittest.TestCase):
     def test_sub_overflow_flag(self) -> None:
         vm = PhiVM(self.config)
         min_int64 = np.iinfo(np.int64).min
-        program = [
+        program: Program = [
             (Instruction.PUSH, [Word(min_int64)]),
             (Instruction.PUSH, [Word(1)]),
             (Instruction.SUB, []),
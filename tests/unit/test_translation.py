@@ -0,0 +1,49 @@
+import unittest
+
+from src.pvm.bytecode import Bytecode, compile_program
+from src.pvm.instructions import Instruction
+from src.pvm.translation import ProgramCache, SymbolicStack
+from src.pvm.types import Word
+
+
+def constant(value: int) -> Bytecode:
+    return compile_program([(Instruction.PUSH, [Word(value)])])
+
+
+class TestSymbolicStack(unittest.TestCase):
+    def test_caller_slots_are_loaded_in_order(self) -> None:
+        loads: list[int] = []
+
+        def load(slot: int) -> str:
+            loads.append(slot)
+            return f"c{-slot}"
+
+        stack: SymbolicStack[str] = SymbolicStack(load)
+        stack.push("a")
+        self.assertEqual([stack.pop(), stack.pop(), stack.pop()], ["a", "c1", "c2"])
+        stack.push("b")
+        self.assertEqual(loads, [-1, -2])
+        self.assertEqual((stack.depth(), stack.peak, stack.loaded), (-1, 1, 2))
+        self.assertEqual(stack.written, {0: "a", -2: "b"})
+
+
+class TestProgramCache(unittest.TestCase):
+    def test_programs_are_built_once_and_evicted_oldest_first(self) -> None:
+        built: list[int] = []
+
+        def build(program: Bytecode) -> int:
+            built.append(program.immediates[0])
+            return program.immediates[0]
+
+        cache = ProgramCache(build, max_size=2)
+        self.assertEqual([cache.get(constant(v)) for v in (1, 2, 1)], [1, 2, 1])
+        cache.get(constant(3))
+        cache.get(constant(1))
+        self.assertEqual(built, [1, 2, 3, 1])
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from array import array
+
+from src.pvm.configuration import Configuration
+from src.pvm.errors import (
+    DivisionByZeroError,
+    StackOverflowError,
+    StackUnderflowError,
+)
+from src.pvm.instructions import Instruction
+from src.pvm.types import Program, Word
+from src.pvm.verifier import verify
+from src.pvm.vm import PhiVM
+
+
+class TestVerifier(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(64), stack_start=Word(16), stack_size=Word(4)
+        )
+        self.program: Program = [
+            (Instruction.PUSH, [Word(6)]),
+            (Instruction.PUSH, [Word(-3)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.MUL, []),
+            (Instruction.SUB, []),
+            (Instruction.PUSH_DIV, [Word(4)]),
+        ]
+
+    def test_depth_bounds(self) -> None:
+        verified = verify(self.program, self.config)
+        self.assertEqual(verified.required, 0)
+        self.assertEqual(verified.peak, 3)
+        verified = verify([(Instruction.ADD, [])], self.config, entry_depth=3)
+        self.assertEqual(verified.required, 2)
+        self.assertEqual(verified.peak, 0)
+
+    def test_underflow_reports_instruction_index(self) -> None:
+        program: Program = [(Instruction.PUSH, [Word(1)]), (Instruction.ADD, [])]
+        with self.assertRaisesRegex(StackUnderflowError, "instruction 1"):
+            verify(program, self.config)
+
+    def test_overflow_reports_instruction_index(self) -> None:
+        program: Program = [(Instruction.PUSH, [Word(1)])] * 5
+        with self.assertRaisesRegex(StackOverflowError, "instruction 4"):
+            verify(program, self.config)
+
+    def test_verified_run_matches_checked_run(self) -> None:
+        expected = PhiVM(self.config)
+        expected.run(self.program)
+        actual = PhiVM(self.config)
+        actual.run(verify(self.program, self.config))
+        self.assertEqual(actual.stack_pointer, expected.stack_pointer)
+        assert isinstance(actual.memory, array) and isinstance(expected.memory, array)
+        self.assertEqual(actual.memory.tolist(), expected.memory.tolist())
+        self.assertEqual(actual.sign_flag, expected.sign_flag)
+        self.assertEqual(actual.overflow_flag, expected.overflow_flag)
+
+    def test_verified_program_falls_back_when_it_does_not_fit(self) -> None:
+        verified = verify(self.program, self.config)
+        vm = PhiVM(self.config)
+        vm.run([(Instruction.PUSH, [Word(0)])] * 2)
+        with self.assertRaises(StackOverflowError):
+            vm.run(verified)
+
+    def test_division_by_zero_leaves_checked_state(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(1)]),
+            (Instruction.PUSH, [Word(0)]),
+            (Instruction.DIV, []),
+        ]
+        expected = PhiVM(self.config)
+        with self.assertRaises(DivisionByZeroError):
+            expected.run(program)
+        actual = PhiVM(self.config)
+        with self.assertRaises(DivisionByZeroError):
+            actual.run(verify(program, self.config))
+        self.assertEqual(actual.stack_pointer, expected.stack_pointer)
+
+
+if __name__ == "__main__":
+    unittest.main()
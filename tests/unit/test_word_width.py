@@ -0,0 +1,185 @@
+import itertools
+import unittest
+from array import array
+import warnings
+from typing import Callable
+
+import numpy as np
+
+from src.pvm.arithmetic import word_arithmetic
+from src.pvm.batch import BatchPhiVM
+from src.pvm.codegen import compile_to_python
+from src.pvm.configuration import Configuration
+from src.pvm.errors import ConfigurationError
+from src.pvm.instructions import Instruction
+from src.pvm.memory import WORD_TYPECODES, allocate_memory, word_view
+from src.pvm.optimizer import optimize
+from src.pvm.registers import translate
+from src.pvm.types import Program, Word
+from src.pvm.vm import PhiVM
+
+NARROW_WIDTHS = (8, 16, 32)
+
+
+def numpy_reference(
+    bits: int, operation: str, operand1: int, operand2: int
+) -> tuple[int, int]:
+    dtype = np.dtype(f"int{bits}")
+    a, b = np.array(operand1, dtype=dtype), np.array(operand2, dtype=dtype)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        result = {"add": a + b, "sub": a - b, "mul": a * b}[operation]
+    return int(result), int(result < 0)
+
+
+class TestWordWidth(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = Configuration(
+            memory_size=Word(2048), stack_start=Word(1024), stack_size=Word(512)
+        )
+
+    def narrow_vm(self, bits: int) -> PhiVM:
+        return PhiVM(
+            Configuration(
+                memory_size=Word(2048),
+                stack_start=Word(1024),
+                stack_size=Word(512),
+                word_bits=bits,
+            )
+        )
+
+    def test_arithmetic_wraps_at_the_width(self) -> None:
+        for bits in NARROW_WIDTHS:
+            arithmetic = word_arithmetic(bits)
+            edges = [0, 1, -1, 3, -3, arithmetic.max_word, arithmetic.min_word]
+            for operation, operand1, operand2 in itertools.product(
+                ("add", "sub", "mul"), edges, edges
+            ):
+                with self.subTest(
+                    bits=bits, operation=operation, a=operand1, b=operand2
+                ):
+                    result, sign, overflow = getattr(arithmetic, operation)(
+                        operand1, operand2
+                    )
+                    self.assertEqual(
+                        (result, sign),
+                        numpy_reference(bits, operation, operand1, operand2),
+                    )
+                    exact = {"add": operand1 + operand2, "sub": operand1 - operand2}
+                    if operation == "mul":
+                        self.assertEqual(overflow, int(result != operand1 * operand2))
+                    elif result == exact[operation]:
+                        self.assertEqual(overflow, 0)
+
+    def test_memory_is_packed(self) -> None:
+        memory = PhiVM(self.config).memory
+        assert isinstance(memory, array)
+        self.assertEqual(memory.itemsize, 8)
+        for bits in NARROW_WIDTHS:
+            with self.subTest(bits=bits):
+                memory = self.narrow_vm(bits).memory
+                assert isinstance(memory, array)
+                self.assertEqual(memory.itemsize, bits // 8)
+
+    def test_flags_and_wrapping_at_16_bits(self) -> None:
+        vm = self.narrow_vm(16)
+        vm.run(
+            [(Instruction.PUSH, [Word(30000)]), (Instruction.PUSH_ADD, [Word(10000)])]
+        )
+        self.assertEqual(vm.memory[vm.stack_pointer - 1], -25536)
+        self.assertEqual((vm.sign_flag, vm.overflow_flag), (1, 1))
+        vm.run([(Instruction.PUSH, [Word(-1)]), (Instruction.MUL, [])])
+        self.assertEqual(vm.memory[vm.stack_pointer - 1], 25536)
+        self.assertEqual((vm.sign_flag, vm.overflow_flag), (0, 0))
+
+    def test_immediates_are_truncated(self) -> None:
+        vm = self.narrow_vm(8)
+        vm.run(
+            [
+                (Instruction.PUSH, [Word(300)]),
+                (Instruction.PUSH, [Word(1)]),
+                (Instruction.PUSH_SUB, [Word(257)]),
+            ]
+        )
+        self.assertEqual(vm.dump_memory(1024, 1026).tolist(), [44, 0])
+
+    def test_immediates_are_truncated_in_a_buffer(self) -> None:
+        config = Configuration(
+            memory_size=Word(2048),
+            stack_start=Word(1024),
+            stack_size=Word(512),
+            word_bits=8,
+        )
+        vm = PhiVM(config, memory=word_view(bytearray(2048), WORD_TYPECODES[8]))
+        status = vm.run_status(
+            [(Instruction.PUSH, [Word(300)]), (Instruction.PUSH_ADD, [Word(-300)])]
+        )
+        self.assertTrue(status.ok)
+        self.assertEqual(vm.memory[1024], 0)
+        vm.execute_instruction(Instruction.PUSH, [Word(-129)])
+        self.assertEqual(vm.memory[1025], 127)
+
+    def test_memsum_wraps_at_the_width(self) -> None:
+        vm = self.narrow_vm(8)
+        vm.load_memory(0, [100, 100, 100])
+        vm.run(
+            [
+                (Instruction.PUSH, [Word(0)]),
+                (Instruction.PUSH, [Word(3)]),
+                (Instruction.MEMSUM, []),
+            ]
+        )
+        self.assertEqual(vm.memory[vm.stack_pointer - 1], 44)
+
+    def test_backends_and_optimizer_follow_the_width(self) -> None:
+        program: Program = [
+            (Instruction.PUSH, [Word(200)]),
+            (Instruction.PUSH, [Word(2)]),
+            (Instruction.DIV, []),
+            (Instruction.PUSH_MUL, [Word(3)]),
+        ]
+        expected = self.narrow_vm(8)
+        expected.run(program)
+        self.assertEqual(expected.memory[1024], -84)
+        runs: list[Callable[[PhiVM], None]] = [
+            lambda vm: vm.run(optimize(program, word_bits=8)),
+            compile_to_python(program),
+            translate(program),
+        ]
+        for run in runs:
+            vm = self.narrow_vm(8)
+            run(vm)
+            self.assertEqual(vm.dump_memory(1024, 1025).tolist(), [-84])
+            self.assertEqual(
+                (vm.sign_flag, vm.overflow_flag),
+                (expected.sign_flag, expected.overflow_flag),
+            )
+
+    def test_batch_lanes_use_the_width(self) -> None:
+        config = Configuration(
+            memory_size=Word(2048),
+            stack_start=Word(1024),
+            stack_size=Word(512),
+            word_bits=32,
+        )
+        batch = BatchPhiVM(config, lanes=3)
+        inputs = np.array([2**31 - 1, -(2**31), 5])
+        top = batch.run([(Instruction.PUSH_ADD, [Word(2**32 + 1)])], inputs)
+        self.assertEqual(top.dtype, np.int32)
+        self.assertEqual(top.tolist(), [-(2**31), -(2**31) + 1, 6])
+        self.assertEqual(batch.overflow_flag.tolist(), [True, False, False])
+
+    def test_invalid_width(self) -> None:
+        with self.assertRaises(ConfigurationError):
+            Configuration(
+                memory_size=Word(2048),
+                stack_start=Word(1024),
+                stack_size=Word(512),
+                word_bits=12,
+            )
+        with self.assertRaises(ConfigurationError):
+            PhiVM(self.config, memory=allocate_memory(2048, "i"))
+
+
+if __name__ == "__main__":
+    unittest.main()